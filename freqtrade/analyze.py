@@ -2,22 +2,23 @@
 Functions to analyze ticker data with indicators and produce buy and sell signals
 """
 import logging
+import time
 from datetime import timedelta
 from enum import Enum
-from typing import List, Dict
+from functools import partial
+from typing import List, Dict, Tuple
 
 import arrow
 import talib.abstract as ta
 
-from pandas import DataFrame, to_datetime
+from pandas import DataFrame, concat, to_datetime
 
 from freqtrade.exchange import get_ticker_history
 from freqtrade.vendor.qtpylib.indicators import crossed_above, crossed_below
 from freqtrade.dataframe import load_dataframe
+from freqtrade.misc import parallel_map
 from freqtrade.strategy import Strategy
-from freqtrade.ta.awesome_oscillator import awesome_oscillator
-from freqtrade.ta.heikinashi         import heikinashi
-from freqtrade.ta.linear_comb import linear_comb
+from freqtrade import indicator_cache, indicator_plan, perf
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,12 @@ class SignalType(Enum):
 def parse_ticker_dataframe(ticker: list) -> DataFrame:
     """
     Analyses the trend for the given ticker history
-    :param ticker: See exchange.get_ticker_history
+    :param ticker: See exchange.get_ticker_history,
+                   or an already parsed DataFrame from the candlestore
     :return: DataFrame
     """
+    if isinstance(ticker, DataFrame):
+        return ticker.copy()
     columns = {'C': 'close', 'V': 'volume', 'O': 'open', 'H': 'high', 'L': 'low', 'T': 'date'}
     frame = DataFrame(ticker) \
         .drop('BV', 1) \
@@ -48,72 +52,27 @@ def populate_indicators(strategy, dataframe: DataFrame) -> DataFrame:
     prepare_indicators(strategy, inds, dataframe) # possibly prepare them, before run
     return dataframe
 
-def prepare_indicators(strategy: Strategy, inds: list, dataframe: DataFrame) -> list:
-    for ind in inds:
-        args = None
-        if len(ind) == 1:
-            name = ind.pop()
-        else:
-            args = ind.pop()
-            name = ind.pop()
-            sname = ind.pop() # script name
-        #logger.info('preparing indicator: %s, args=%s' %(name,args))
-        # The ind parsing below is a real mess. But what it shows
-        # is that there is a need for some type of DSL
-        # where the oscillator and its arguments becomes
-        # in itself a small language
-        # For now the mess expresses the different types of
-        # specifying arguments in the strategy::select_indicators
-        # and also how we handle oscillators differently depending
-        # on where they come from (talib or freqtrade)
-        new = False
-        ali = None
-        # Four types of how we call indicators
-        # Either using the 'new' flag, that will run the indicator and merge the
-        # columns in the resulting dataframe. By doing that, we have no control
-        # of the column naming, and it is unfortunate since they collide (stochf and stochrsi)
-        if name == 'bbands' or name == 'ht_sine':
-            new = True
-        if name == 'macd' or name == 'stochf' or name == 'stochrsi':
-            new = True
-        # The second way, is to call the indicator, assume it will only return a series
-        # and add that series to our dataframe with an aliased name: name + first-argument
-        # example calling ta.EMA(5) becomes columnname EMA5 in the dataframe
-        if name == 'ema':
-            ali = True
-        # The third way is to call a defclass method which is for more advanced indicators
-        # or python-only indicators
-        if name == 'heikinashi':
-            dataframe[sname] = heikinashi(strategy,args).run(dataframe)
-        elif name == 'ao':
-            dataframe[sname] = awesome_oscillator(strategy,args).run(dataframe)
-        elif name == 'lin':
-            dataframe[sname] = linear_comb(strategy,args).run(dataframe)
-        else:
-          f = ta.Function(name) # getattr(ta,name.upper())
-          if new: # this is the cleaned up version
-              a = [dataframe]
-              a.extend(args or [])
-              df = f(*a) # get result of DataFrames
-              for col in df.columns: # append each column
-                  ser = df[col] # get column from new DF
-                  dataframe[sname + '_' + col] = ser # and insert it into old DF
-          elif ali:
-              a = [dataframe]
-              a.extend(args or [])
-              #dataframe[name + str(args[0])] = f(*a)
-              dataframe[sname] = f(*a)
-          else:
-              # the fourth way is to use the old way of just simply
-              # assuming the indicator function has the same name
-              # and returns a series
-              if isinstance(args,dict):
-                  dataframe[sname] = f(dataframe, **args)
-              else:
-                  a = [dataframe]
-                  a.extend(args or [])
-                  dataframe[sname] = f(*a)
+def prepare_indicators(strategy: Strategy, inds: list, dataframe: DataFrame) -> None:
+    """
+    Adds the indicators of the specs inds to the dataframe, see indicator_plan
+    """
+    key = indicator_cache.digest(dataframe) if indicator_cache.enabled() else None
+    for step in indicator_plan.plan_for(inds).steps:
+        if key:
+            # reuse the columns if this indicator has been run on these candles
+            key = indicator_cache.chain(key, step)
+            cached = indicator_cache.get(key)
+            if cached is not None:
+                indicator_cache.restore(dataframe, cached)
+                continue
+            before = set(dataframe.columns)
+        started = time.perf_counter()
+        step.run(strategy, dataframe)
+        perf.record('indicator.' + step.name, time.perf_counter() - started)
+        if key:
+            indicator_cache.put(key, dataframe, before, step.column)
 
+@perf.timed('analyze.ticker')
 def analyze_ticker(strategy, ticker_history: List[Dict]) -> DataFrame:
     """
     Parses the given ticker history and returns a populated DataFrame
@@ -126,22 +85,158 @@ def analyze_ticker(strategy, ticker_history: List[Dict]) -> DataFrame:
     dataframe = strategy.populate_sell_trend(dataframe)
     return dataframe
 
+def analyze_tickers(strategy, tickers: Dict[str, List[Dict]],
+                    workers: int = 0, backend: str = 'thread') -> Dict[str, DataFrame]:
+    """
+    Batch version of analyze_ticker(), analyzes several pairs, in parallel if asked to
+    :param tickers: dict of pair and ticker history
+    :return: dict of pair and populated DataFrame
+    """
+    pairs = list(tickers.keys())
+    frames = parallel_map(partial(analyze_ticker, strategy),
+                          [tickers[pair] for pair in pairs],
+                          workers, backend)
+    return dict(zip(pairs, frames))
+
+# Unknown lookback, used for the python indicators (heikinashi is recursive)
+DEFAULT_LOOKBACK = 50
+# Recursive indicators (ema, rsi, ...) depend on all earlier candles.
+# Their lookback is multiplied by this, to let the error of
+# starting within the history fade away
+WARMUP_FACTOR = 10
+
+
+def indicator_lookback(strategy: Strategy) -> int:
+    """
+    Longest lookback in candles of the indicators of the strategy,
+    as TA-Lib reports it for the given arguments
+    """
+    lookback = 0
+    for ind in strategy.select_indicators(None):
+        _, name, args = indicator_plan.parse(ind)
+        if name in indicator_plan.CLASSES:
+            lookback = max(lookback, DEFAULT_LOOKBACK)
+            continue
+        f = ta.Function(name)
+        if isinstance(args, dict):
+            f.set_parameters({k: v for k, v in args.items() if k in f.parameters})
+        elif args:
+            f.set_parameters(dict(zip(f.parameters, args)))
+        lookback = max(lookback, f.lookback)
+    return lookback
+
+
+class CandleBuffer():
+    """
+    Rolling buffer of the analyzed candles of one pair, for the live loop.
+    Only the candles newer than the last known 'T' are appended,
+    and the indicators are recomputed over a tail window only,
+    so the work per update does not grow with the history.
+    """
+
+    def __init__(self, strategy: Strategy, window: int = None):
+        """
+        :param window: candles to recompute before the new ones,
+                       defaults to the indicator lookback with warm-up
+        """
+        self.strategy = strategy
+        self.window = window or max(indicator_lookback(strategy) * WARMUP_FACTOR,
+                                    DEFAULT_LOOKBACK)
+        self.candles = None  # parsed candles, rows match self.analyzed
+        self.analyzed = None
+        self.last_T = None
+        self.max_len = 0
+
+    def _analyze(self, dataframe: DataFrame) -> DataFrame:
+        dataframe = populate_indicators(self.strategy, dataframe)
+        dataframe = self.strategy.populate_buy_trend(dataframe)
+        return self.strategy.populate_sell_trend(dataframe)
+
+    def reset(self, ticker_history: List[Dict]) -> DataFrame:
+        self.candles = parse_ticker_dataframe(ticker_history).reset_index(drop=True)
+        self.analyzed = self._analyze(self.candles.copy())
+        self.last_T = max(tick['T'] for tick in ticker_history)
+        self.max_len = len(self.candles)
+        return self.analyzed
+
+    def update(self, ticker_history: List[Dict]) -> DataFrame:
+        """
+        Merges the ticker history into the buffer
+        :param ticker_history: See exchange.get_ticker_history
+        :return: DataFrame with ticker data, indicator data and signals
+        """
+        if self.analyzed is None or ticker_history[0]['T'] > self.last_T:
+            # first update, or no overlap with what we have
+            return self.reset(ticker_history)
+        # the last known candle is still open, it is refetched as well
+        fresh = [tick for tick in ticker_history if tick['T'] >= self.last_T]
+        if not fresh:
+            return self.analyzed
+        fresh = parse_ticker_dataframe(fresh)
+        keep = int((self.candles['date'] < fresh['date'].iloc[0]).sum())
+        candles = concat([self.candles.iloc[:keep], fresh], ignore_index=True)
+        if len(candles) <= len(fresh) + self.window:
+            return self.reset(ticker_history)
+
+        tail = self._analyze(candles.iloc[-(len(fresh) + self.window):].copy())
+        analyzed = concat([self.analyzed.iloc[:keep], tail.iloc[-len(fresh):]],
+                          ignore_index=True)
+        # drop the oldest candles, the buffer does not grow
+        self.candles = candles.iloc[-self.max_len:].reset_index(drop=True)
+        self.analyzed = analyzed.iloc[-self.max_len:].reset_index(drop=True)
+        self.last_T = max(tick['T'] for tick in ticker_history)
+        return self.analyzed
+
+
+# pair -> CandleBuffer, used by get_signal() with incremental analysis
+_CANDLE_BUFFERS: Dict[str, CandleBuffer] = {}
+
+
+def analyze_incremental(strategy: Strategy, pair: str, ticker_history: List[Dict]) -> DataFrame:
+    """
+    analyze_ticker() through the CandleBuffer of pair
+    """
+    buf = _CANDLE_BUFFERS.get(pair)
+    if buf is None or buf.strategy is not strategy:
+        buf = _CANDLE_BUFFERS[pair] = CandleBuffer(strategy)
+    return buf.update(ticker_history)
+
+
+# pair -> seconds spent in (fetch, analysis) by the last get_signal()
+_SIGNAL_LATENCY: Dict[str, Tuple[float, float]] = {}
+
+
+def signal_latency() -> Dict[str, Tuple[float, float]]:
+    """
+    Returns the fetch and analysis time of the last get_signal() of each pair
+    """
+    return dict(_SIGNAL_LATENCY)
+
+
 def get_signal(strategy: Strategy, pair: str, signal: SignalType) -> bool:
     """
     Calculates current signal based several technical analysis indicators
     :param pair: pair in format BTC_ANT or BTC-ANT
     :return: True if pair is good for buying, False otherwise
     """
-    ticker_hist = get_ticker_history(pair)
+    start = time.time()
+    ticker_hist = get_ticker_history(pair, strategy.tick_interval())
+    fetched = time.time()
+    _SIGNAL_LATENCY[pair] = (fetched - start, 0.0)
     if not ticker_hist:
         logger.warning('Empty ticker history for pair %s', pair)
         return False
 
     try:
-        dataframe = analyze_ticker(strategy, ticker_hist)
+        if strategy.incremental_analysis() and isinstance(ticker_hist, list):
+            dataframe = analyze_incremental(strategy, pair, ticker_hist)
+        else:
+            dataframe = analyze_ticker(strategy, ticker_hist)
     except ValueError as ex:
         logger.warning('Unable to analyze ticker for pair %s: %s', pair, str(ex))
         return False
+    finally:
+        _SIGNAL_LATENCY[pair] = (fetched - start, time.time() - fetched)
 
     if dataframe.empty:
         return False
@@ -0,0 +1,135 @@
+"""
+Binary columnar candle store
+
+An alternative to the {pair}-{interval}.json files of the ticker
+data. Each pair is stored in a directory {pair}-{interval}.candles
+holding one .npy file per column:
+  date.npy                  int64, nanoseconds since epoch (UTC)
+  open/high/low/close/volume.npy   float64
+The candles are sorted by date. The columns are loaded with
+np.load(mmap_mode='r'), so there is no parsing at all.
+
+Candles of intervals without a json file of their own are derived
+from the 1 minute candles (see resample.py), and cached in the
+directory {pair}-{interval}.resampled.candles.
+"""
+import json
+import logging
+import os
+from typing import List, Dict
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+
+from freqtrade.resample import resample
+
+logger = logging.getLogger(__name__)
+
+# json ticker key -> column name, in the order of the json ticker
+COLUMNS = [('O', 'open'), ('H', 'high'), ('L', 'low'), ('C', 'close'), ('V', 'volume')]
+
+
+def json_path(datadir: str, pair: str, ticker_interval: int) -> str:
+    return os.path.join(os.path.abspath(datadir), '{}-{}.json'.format(pair, ticker_interval))
+
+
+def store_path(datadir: str, pair: str, ticker_interval: int) -> str:
+    return os.path.join(os.path.abspath(datadir), '{}-{}.candles'.format(pair, ticker_interval))
+
+
+def resampled_path(datadir: str, pair: str, ticker_interval: int) -> str:
+    return os.path.join(os.path.abspath(datadir),
+                        '{}-{}.resampled.candles'.format(pair, ticker_interval))
+
+
+def is_current(datadir: str, pair: str, ticker_interval: int) -> bool:
+    """
+    True if the store of pair exists and is not older than its json file
+    """
+    path = os.path.join(store_path(datadir, pair, ticker_interval), 'date.npy')
+    if not os.path.exists(path):
+        return False
+    jpath = json_path(datadir, pair, ticker_interval)
+    return not os.path.exists(jpath) or os.path.getmtime(path) >= os.path.getmtime(jpath)
+
+
+def write_candles(path: str, ticker: List[Dict]) -> None:
+    """
+    Writes ticker history to a store directory
+    :param ticker: See exchange.get_ticker_history
+    """
+    dates = to_datetime([tick['T'] for tick in ticker], utc=True).values.astype(np.int64)
+    _write_columns(path, dates, {col: np.array([tick[key] for tick in ticker], dtype=np.float64)
+                                 for key, col in COLUMNS})
+
+
+def write_frame(path: str, frame: DataFrame) -> None:
+    """
+    Writes parsed candles to a store directory
+    """
+    dates = frame['date'].values.astype('datetime64[ns]').astype(np.int64)
+    _write_columns(path, dates, {col: np.asarray(frame[col].values, dtype=np.float64)
+                                 for _, col in COLUMNS})
+
+
+def _write_columns(path: str, dates: np.ndarray, columns: Dict[str, np.ndarray]) -> None:
+    os.makedirs(path, exist_ok=True)
+    order = np.argsort(dates, kind='mergesort')
+    for col, values in columns.items():
+        np.save(os.path.join(path, col + '.npy'), values[order])
+    # written last, is_current() checks this file
+    np.save(os.path.join(path, 'date.npy'), dates[order])
+
+
+def read_candles(path: str) -> DataFrame:
+    """
+    Loads a store directory
+    :return: DataFrame, the same as analyze.parse_ticker_dataframe() returns
+    """
+    frame = DataFrame({col: np.load(os.path.join(path, col + '.npy'), mmap_mode='r')
+                       for _, col in COLUMNS})
+    dates = np.load(os.path.join(path, 'date.npy'), mmap_mode='r')
+    frame['date'] = to_datetime(np.asarray(dates), unit='ns', utc=True)
+    return frame
+
+
+def convert(datadir: str, ticker_interval: int, pair: str) -> str:
+    """
+    Converts the json ticker data of pair into the store
+    :return: path of the store
+    """
+    path = store_path(datadir, pair, ticker_interval)
+    logger.info('converting %s to %s', json_path(datadir, pair, ticker_interval), path)
+    with open(json_path(datadir, pair, ticker_interval)) as tickerdata:
+        write_candles(path, json.load(tickerdata))
+    return path
+
+
+def load(datadir: str, ticker_interval: int, pairs: List[str]) -> Dict[str, DataFrame]:
+    """
+    Loads the candles of pairs from the store,
+    converts the json ticker data for pairs without a current store
+    :return: dict of pair and DataFrame
+    """
+    result = {}
+    for pair in pairs:
+        if not is_current(datadir, pair, ticker_interval):
+            convert(datadir, ticker_interval, pair)
+        result[pair] = read_candles(store_path(datadir, pair, ticker_interval))
+    return result
+
+
+def load_resampled(datadir: str, ticker_interval: int, pair: str) -> DataFrame:
+    """
+    Loads the candles of ticker_interval derived from the 1 minute candles of pair,
+    resampled again only if the 1 minute candles are newer
+    """
+    source = load(datadir, 1, [pair])[pair]
+    source_file = os.path.join(store_path(datadir, pair, 1), 'date.npy')
+    path = resampled_path(datadir, pair, ticker_interval)
+    date_file = os.path.join(path, 'date.npy')
+    if not os.path.exists(date_file) or \
+       os.path.getmtime(date_file) < os.path.getmtime(source_file):
+        logger.info('resampling %s to %s minutes', pair, ticker_interval)
+        write_frame(path, resample(source, ticker_interval))
+    return read_candles(path)
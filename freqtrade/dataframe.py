@@ -3,17 +3,18 @@ Functions to work with pandas dataframes
 """
 import io
 import os
-import math
 import json
 import logging
 from datetime import timedelta
 from enum import Enum
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 #import arrow
 #import talib.abstract as ta
 from pandas import DataFrame, to_datetime
 
+from freqtrade import candlestore
+
 #from freqtrade.exchange import get_ticker_history
 #from freqtrade.vendor.qtpylib.indicators import crossed_above, crossed_below
 #from freqtrade.ta.awesome_oscillator import awesome_oscillator
@@ -21,63 +22,89 @@ from pandas import DataFrame, to_datetime
 
 logger = logging.getLogger(__name__)
 
-def load_dataframe(datadir, ticker_interval: int = 5, pairs: [List[str]] = None) -> Dict[str, List]:
+def load_dataframe(datadir, ticker_interval: int = 5, pairs: [List[str]] = None,
+                   store: bool = False) -> Dict[str, List]:
     """
     Loads ticker history data for the given parameters
     :param ticker_interval: ticker interval in minutes
     :param pairs: list of pairs
+    :param store: load DataFrames from the binary candle store, see candlestore.py
     :return: dict
     """
-    path = os.path.abspath('.') # os.path.dirname(__file__))
     result = {}
     if pairs == None:
         raise 'load_dataframe no pairs'
+    if store:
+        return candlestore.load(datadir, ticker_interval, pairs)
     for pair in pairs:
-        with open('{abspath}/{datadir}/{pair}-{ticker_interval}.json'.format(
-          abspath=path,
-          datadir=datadir,
-          pair=pair,
-          ticker_interval=ticker_interval,
-          )) as tickerdata:
+        with open(candlestore.json_path(datadir, pair, ticker_interval)) as tickerdata:
                result[pair] = json.load(tickerdata)
     return result
 
+# digits after the decimal point of exported floats, the max of pandas.
+# Prices are down to 1e-8, this keeps at least 7 significant digits.
+EXPORT_PRECISION = 15
+
+
+def _columns_json(df: DataFrame):
+    """
+    Yields (name, json array) of each column of df, sorted by index.
+    Each column is serialized in bulk by pandas, NaN as null.
+    """
+    df = df.sort_index()
+    for key in df.keys():
+        yield key, df[key].to_json(orient='values', date_format='iso', date_unit='s',
+                                   double_precision=EXPORT_PRECISION)
+
+
 def file_write_dataframe_json(df: DataFrame, h: io.TextIOWrapper):
     """
-     write a dataframe to file (via filehandle) as JSON encoded
+     write a dataframe to file (via filehandle) as JSON encoded,
+     an object of column name and list of values
     """
-    pkeys = df.keys()
-    j = 0
-    h.write('{\n')
-    z = 0
-    for key in pkeys:
-        if j > 0:
-            h.write(',')
-        j += 1
-        h.write('\n"%s":[' % key)
-        val = df[key]
-        sorted = val.sort_index()
-        k = 0
-        date = False
-        if key == 'date':
-            date = True
-        for col in sorted.index:
-            z += 1
-            if (z % 20) == 0:
-                h.write('\n')
-            if k > 0:
-                h.write(',')
-            k += 1
-            v = val[col]
-            if date:
-                h.write('"%s"' % v)
-            else:
-                if float(v):
-                    if math.isnan(v):
-                        h.write('null')
-                    else:
-                        h.write('%f' % v)
-                else:
-                    h.write('"%s"' % v)
-        h.write(']\n')
+    h.write('{')
+    for i, (key, values) in enumerate(_columns_json(df)):
+        h.write('%s\n"%s":' % (',' if i else '', key))
+        h.write(values)
     h.write('}\n')
+
+
+def file_write_dataframe_ndjson(pair: str, df: DataFrame, h: io.TextIOWrapper):
+    """
+     write a dataframe of pair as one line of newline delimited JSON:
+     {"pair": pair, "data": {column: [values]}}
+    """
+    h.write('{"pair":"%s","data":{' % pair)
+    h.write(','.join('"%s":%s' % (key, values) for key, values in _columns_json(df)))
+    h.write('}}\n')
+
+
+def load_backtest_export(filename: str) -> Tuple[int, Dict[str, DataFrame], DataFrame]:
+    """
+    Reads the backtest-result export back, json or ndjson (by file extension)
+    :return: ticker_interval, dataframe of each pair, results
+    """
+    if filename.endswith('.ndjson'):
+        pairs = {}
+        with open(filename) as h:
+            for line in h:
+                item = json.loads(line)
+                if 'pair' in item:
+                    pairs[item['pair']] = item['data']
+                elif 'results' in item:
+                    results = item['results']
+                else:
+                    ticker_interval = item['ticker_interval']
+    else:
+        with open(filename) as h:
+            export = json.load(h)
+        ticker_interval = export['ticker_interval']
+        pairs = export['pairs']
+        results = export['results']
+    dataframes = {}
+    for pair, columns in pairs.items():
+        df = DataFrame(columns)
+        if 'date' in df:
+            df['date'] = to_datetime(df['date'], utc=True)
+        dataframes[pair] = df
+    return ticker_interval, dataframes, DataFrame(results)
@@ -2,6 +2,8 @@
 """ Cryptocurrency Exchanges support """
 import enum
 import logging
+import threading
+import time
 from random import randint
 from typing import List, Dict, Any, Optional
 
@@ -9,21 +11,52 @@ import arrow
 import requests
 from cachetools import cached, TTLCache
 
-from freqtrade import OperationalException
+from freqtrade import OperationalException, perf
+from freqtrade.resample import resample_ticker
 from freqtrade.exchange.bittrex import Bittrex
 from freqtrade.exchange.testdummy import Testdummy
 from freqtrade.exchange.interface import Exchange
+from freqtrade.exchange.async_bittrex import AsyncBittrex
+from freqtrade.exchange.async_testdummy import AsyncTestdummy
+from freqtrade.exchange.async_interface import AsyncExchange, SyncAdapter
 
 logger = logging.getLogger(__name__)
 
 # Current selected exchange
 _API: Exchange = None
+# The async exchange behind _API, if exchange.use_async is set
+_ASYNC_API: Optional[AsyncExchange] = None
 _CONF: dict = {}
 
 # Holds all open sell orders for dry_run
 _DRY_RUN_OPEN_ORDERS: Dict[str, Any] = {}
 
 
+class RateLimiter():
+    """
+    Spaces out calls to at most `rate` per second.
+    Thread safe, unlike the throttling in the exchange libraries.
+    """
+
+    def __init__(self, rate: float = 0.0) -> None:
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_LIMITER = RateLimiter()
+
+
 class Exchanges(enum.Enum):
     """
     Maps supported exchange names to correspondent classes.
@@ -32,6 +65,14 @@ class Exchanges(enum.Enum):
     TESTDUMMY = Testdummy
 
 
+class AsyncExchanges(enum.Enum):
+    """
+    Maps supported exchange names to their async twins.
+    """
+    BITTREX = AsyncBittrex
+    TESTDUMMY = AsyncTestdummy
+
+
 def init(config: dict) -> None:
     """
     Initializes this module with the given config,
@@ -40,7 +81,7 @@ def init(config: dict) -> None:
     :param config: config to use
     :return: None
     """
-    global _CONF, _API
+    global _CONF, _API, _ASYNC_API, _LIMITER
 
     _CONF.update(config)
 
@@ -51,12 +92,23 @@ def init(config: dict) -> None:
 
     # Find matching class for the given exchange name
     name = exchange_config['name']
+    use_async = exchange_config.get('use_async', False)
     try:
-        exchange_class = Exchanges[name.upper()].value
+        exchange_class = (AsyncExchanges if use_async else Exchanges)[name.upper()].value
     except KeyError:
         raise OperationalException('Exchange {} is not supported'.format(name))
 
-    _API = exchange_class(exchange_config)
+    if isinstance(_API, SyncAdapter):
+        _API.close()
+    if use_async:
+        # the existing callers are synchronous
+        _ASYNC_API = exchange_class(exchange_config)
+        _API = SyncAdapter(_ASYNC_API)
+    else:
+        _ASYNC_API = None
+        _API = exchange_class(exchange_config)
+    # the async exchanges have a token bucket of their own
+    _LIMITER = RateLimiter(0 if use_async else _API.rate_limit)
 
     # Check if all pairs are available
     validate_pairs(config['exchange']['pair_whitelist'])
@@ -89,6 +141,7 @@ def validate_pairs(pairs: List[str]) -> None:
                 'Pair {} is not available at {}'.format(pair, _API.name.lower()))
 
 
+@perf.timed('exchange.buy')
 def buy(pair: str, rate: float, amount: float) -> str:
     if _CONF['dry_run']:
         global _DRY_RUN_OPEN_ORDERS
@@ -107,6 +160,7 @@ def buy(pair: str, rate: float, amount: float) -> str:
     return _API.buy(pair, rate, amount)
 
 
+@perf.timed('exchange.sell')
 def sell(pair: str, rate: float, amount: float) -> str:
     if _CONF['dry_run']:
         global _DRY_RUN_OPEN_ORDERS
@@ -125,6 +179,7 @@ def sell(pair: str, rate: float, amount: float) -> str:
     return _API.sell(pair, rate, amount)
 
 
+@perf.timed('exchange.get_balance')
 def get_balance(currency: str) -> float:
     if _CONF['dry_run']:
         return 999.9
@@ -132,6 +187,7 @@ def get_balance(currency: str) -> float:
     return _API.get_balance(currency)
 
 
+@perf.timed('exchange.get_balances')
 def get_balances():
     if _CONF['dry_run']:
         return []
@@ -139,15 +195,39 @@ def get_balances():
     return _API.get_balances()
 
 
+@perf.timed('exchange.get_ticker')
 def get_ticker(pair: str) -> dict:
     return _API.get_ticker(pair)
 
 
-@cached(TTLCache(maxsize=100, ttl=30))
+@perf.timed('exchange.get_tickers')
+def get_tickers(pairs: List[str]) -> Dict[str, dict]:
+    """
+    Tickers of all pairs, in one request if the exchange supports it
+    :return: dict of pair and ticker, see get_ticker()
+    """
+    if not pairs:
+        return {}
+    return _API.get_tickers(pairs)
+
+
+# the signals of several pairs are evaluated in threads
+@cached(TTLCache(maxsize=100, ttl=30), lock=threading.RLock())
+@perf.timed('exchange.get_ticker_history')
 def get_ticker_history(pair: str, tick_interval: Optional[int] = 5) -> List[Dict]:
+    intervals = _API.tick_intervals
+    if intervals and tick_interval not in intervals:
+        # fetch the finest interval and derive the candles from it
+        base = min(intervals)
+        if tick_interval % base:
+            raise ValueError('tick_interval {} is not a multiple of {}'.format(tick_interval, base))
+        _LIMITER.wait()
+        return resample_ticker(_API.get_ticker_history(pair, base), tick_interval)
+    _LIMITER.wait()
     return _API.get_ticker_history(pair, tick_interval)
 
 
+@perf.timed('exchange.cancel_order')
 def cancel_order(order_id: str) -> None:
     if _CONF['dry_run']:
         return
@@ -155,6 +235,7 @@ def cancel_order(order_id: str) -> None:
     return _API.cancel_order(order_id)
 
 
+@perf.timed('exchange.get_order')
 def get_order(order_id: str) -> Dict:
     if _CONF['dry_run']:
         order = _DRY_RUN_OPEN_ORDERS[order_id]
@@ -166,18 +247,46 @@ def get_order(order_id: str) -> Dict:
     return _API.get_order(order_id)
 
 
+@perf.timed('exchange.get_open_orders')
+def get_open_orders() -> Optional[Dict[str, Dict]]:
+    """
+    All open orders of the account in one request.
+    Orders missing from it are closed, see get_order() for their details.
+    :return: dict of order id and order, or None if the exchange cant list them
+    """
+    if _CONF['dry_run']:
+        return {order_id: dict(order, id=order_id)
+                for order_id, order in _DRY_RUN_OPEN_ORDERS.items()
+                if not order['closed']}
+    try:
+        orders = _API.get_open_orders()
+    except NotImplementedError:
+        return None
+    return {order['id']: order for order in orders}
+
+
 def get_pair_detail_url(pair: str) -> str:
     return _API.get_pair_detail_url(pair)
 
 
+@perf.timed('exchange.get_markets')
 def get_markets() -> List[str]:
     return _API.get_markets()
 
 
+@perf.timed('exchange.get_market_summaries')
 def get_market_summaries() -> List[Dict]:
     return _API.get_market_summaries()
 
 
+def get_async_api() -> Optional[AsyncExchange]:
+    """
+    The non-blocking exchange, for callers running in an event loop.
+    None unless exchange.use_async is set.
+    """
+    return _ASYNC_API
+
+
 def get_name() -> str:
     return _API.name
 
@@ -186,5 +295,6 @@ def get_fee() -> float:
     return _API.fee
 
 
+@perf.timed('exchange.get_wallet_health')
 def get_wallet_health() -> List[Dict]:
     return _API.get_wallet_health()
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from freqtrade.exchange.async_interface import AsyncWrapper
+from freqtrade.exchange.bittrex import Bittrex
+
+# Connections to bittrex are kept alive and shared by all calls
+POOL_SIZE = 8
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+_EXECUTOR = None
+
+
+def _pooled_dispatch(request_url: str, apisign: str) -> dict:
+    return _SESSION.get(request_url, headers={'apisign': apisign}, timeout=10).json()
+
+
+class AsyncBittrex(AsyncWrapper):
+    """
+    Non-blocking Bittrex API wrapper.
+    python-bittrex is synchronous, its requests run in a thread pool
+    over a shared connection pool, rate limited by a token bucket.
+    """
+
+    def __init__(self, config: dict) -> None:
+        global _EXECUTOR
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=POOL_SIZE)
+        super().__init__(Bittrex(config, dispatch=_pooled_dispatch), _EXECUTOR)
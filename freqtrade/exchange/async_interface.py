@@ -0,0 +1,283 @@
+"""
+Non-blocking exchange interface
+
+AsyncExchange is the asyncio twin of interface.Exchange,
+every call to the exchange API is a coroutine.
+SyncAdapter turns an AsyncExchange back into an Exchange,
+for the existing (synchronous) callers.
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import List, Dict, Optional
+
+from freqtrade.exchange.interface import Exchange
+
+
+class TokenBucket():
+    """
+    Token bucket rate limiter for coroutines.
+    Allows bursts of up to `burst` calls, refilled with `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        :param rate: tokens per second, 0 for no limit
+        :param burst: size of the bucket
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+
+    async def acquire(self) -> None:
+        if not self.rate:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncExchange(ABC):
+    """
+    Exchange API with coroutines, see interface.Exchange for the
+    description of each call
+    """
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @property
+    def fee(self) -> float:
+        pass
+
+    @property
+    def rate_limit(self) -> float:
+        return 0.0
+
+    @property
+    def tick_intervals(self) -> Optional[List[int]]:
+        return None
+
+    @abstractmethod
+    async def buy(self, pair: str, rate: float, amount: float) -> str:
+        pass
+
+    @abstractmethod
+    async def sell(self, pair: str, rate: float, amount: float) -> str:
+        pass
+
+    @abstractmethod
+    async def get_balance(self, currency: str) -> float:
+        pass
+
+    @abstractmethod
+    async def get_balances(self) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def get_ticker(self, pair: str) -> dict:
+        pass
+
+    @abstractmethod
+    async def get_ticker_history(self, pair: str, tick_interval: int) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def get_order(self, order_id: str) -> Dict:
+        pass
+
+    async def get_open_orders(self) -> List[Dict]:
+        raise NotImplementedError
+
+    async def get_tickers(self, pairs: List[str]) -> Dict[str, dict]:
+        tickers = await asyncio.gather(*[self.get_ticker(pair) for pair in pairs])
+        return dict(zip(pairs, tickers))
+
+    @abstractmethod
+    async def cancel_order(self, order_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def get_pair_detail_url(self, pair: str) -> str:
+        pass
+
+    @abstractmethod
+    async def get_markets(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    async def get_market_summaries(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    async def get_wallet_health(self) -> List[Dict]:
+        pass
+
+
+class AsyncWrapper(AsyncExchange):
+    """
+    AsyncExchange on top of a synchronous Exchange.
+    Calls are rate limited by a TokenBucket and run in executor,
+    or directly in the event loop if executor is None
+    (for exchanges that do not block, like Testdummy)
+    """
+
+    def __init__(self, exchange: Exchange, executor: Optional[Executor] = None,
+                 burst: int = 1) -> None:
+        self._exchange = exchange
+        self._executor = executor
+        self._bucket = TokenBucket(exchange.rate_limit, burst)
+
+    async def _call(self, func, *args):
+        await self._bucket.acquire()
+        if self._executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    @property
+    def name(self) -> str:
+        # persisted trades and Exchanges[] know the name of the sync exchange
+        return self._exchange.name
+
+    @property
+    def fee(self) -> float:
+        return self._exchange.fee
+
+    @property
+    def rate_limit(self) -> float:
+        return self._exchange.rate_limit
+
+    @property
+    def tick_intervals(self) -> Optional[List[int]]:
+        return self._exchange.tick_intervals
+
+    async def buy(self, pair: str, rate: float, amount: float) -> str:
+        return await self._call(self._exchange.buy, pair, rate, amount)
+
+    async def sell(self, pair: str, rate: float, amount: float) -> str:
+        return await self._call(self._exchange.sell, pair, rate, amount)
+
+    async def get_balance(self, currency: str) -> float:
+        return await self._call(self._exchange.get_balance, currency)
+
+    async def get_balances(self) -> List[dict]:
+        return await self._call(self._exchange.get_balances)
+
+    async def get_ticker(self, pair: str) -> dict:
+        return await self._call(self._exchange.get_ticker, pair)
+
+    async def get_ticker_history(self, pair: str, tick_interval: int) -> List[Dict]:
+        return await self._call(self._exchange.get_ticker_history, pair, tick_interval)
+
+    async def get_order(self, order_id: str) -> Dict:
+        return await self._call(self._exchange.get_order, order_id)
+
+    async def get_open_orders(self) -> List[Dict]:
+        return await self._call(self._exchange.get_open_orders)
+
+    async def get_tickers(self, pairs: List[str]) -> Dict[str, dict]:
+        return await self._call(self._exchange.get_tickers, pairs)
+
+    async def cancel_order(self, order_id: str) -> None:
+        return await self._call(self._exchange.cancel_order, order_id)
+
+    def get_pair_detail_url(self, pair: str) -> str:
+        return self._exchange.get_pair_detail_url(pair)
+
+    async def get_markets(self) -> List[str]:
+        return await self._call(self._exchange.get_markets)
+
+    async def get_market_summaries(self) -> List[Dict]:
+        return await self._call(self._exchange.get_market_summaries)
+
+    async def get_wallet_health(self) -> List[Dict]:
+        return await self._call(self._exchange.get_wallet_health)
+
+
+class SyncAdapter(Exchange):
+    """
+    Exchange for synchronous callers, running the coroutines of an
+    AsyncExchange in an event loop of its own thread.
+    Safe to call from several threads.
+    """
+
+    def __init__(self, exchange: AsyncExchange) -> None:
+        self.async_exchange = exchange
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @property
+    def name(self) -> str:
+        return self.async_exchange.name
+
+    @property
+    def fee(self) -> float:
+        return self.async_exchange.fee
+
+    @property
+    def rate_limit(self) -> float:
+        return self.async_exchange.rate_limit
+
+    @property
+    def tick_intervals(self) -> Optional[List[int]]:
+        return self.async_exchange.tick_intervals
+
+    def buy(self, pair: str, rate: float, amount: float) -> str:
+        return self._run(self.async_exchange.buy(pair, rate, amount))
+
+    def sell(self, pair: str, rate: float, amount: float) -> str:
+        return self._run(self.async_exchange.sell(pair, rate, amount))
+
+    def get_balance(self, currency: str) -> float:
+        return self._run(self.async_exchange.get_balance(currency))
+
+    def get_balances(self) -> List[dict]:
+        return self._run(self.async_exchange.get_balances())
+
+    def get_ticker(self, pair: str) -> dict:
+        return self._run(self.async_exchange.get_ticker(pair))
+
+    def get_ticker_history(self, pair: str, tick_interval: int) -> List[Dict]:
+        return self._run(self.async_exchange.get_ticker_history(pair, tick_interval))
+
+    def get_order(self, order_id: str) -> Dict:
+        return self._run(self.async_exchange.get_order(order_id))
+
+    def get_open_orders(self) -> List[Dict]:
+        return self._run(self.async_exchange.get_open_orders())
+
+    def get_tickers(self, pairs: List[str]) -> Dict[str, dict]:
+        return self._run(self.async_exchange.get_tickers(pairs))
+
+    def cancel_order(self, order_id: str) -> None:
+        return self._run(self.async_exchange.cancel_order(order_id))
+
+    def get_pair_detail_url(self, pair: str) -> str:
+        return self.async_exchange.get_pair_detail_url(pair)
+
+    def get_markets(self) -> List[str]:
+        return self._run(self.async_exchange.get_markets())
+
+    def get_market_summaries(self) -> List[Dict]:
+        return self._run(self.async_exchange.get_market_summaries())
+
+    def get_wallet_health(self) -> List[Dict]:
+        return self._run(self.async_exchange.get_wallet_health())
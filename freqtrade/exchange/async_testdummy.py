@@ -0,0 +1,27 @@
+import asyncio
+
+from freqtrade.exchange.async_interface import AsyncWrapper
+from freqtrade.exchange.testdummy import Testdummy
+
+
+class AsyncTestdummy(AsyncWrapper):
+    """
+    Async twin of the Testdummy exchange, for testing offline.
+    The optional config 'latency' (seconds) simulates the network.
+    """
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(Testdummy(config))
+        self._latency = config.get('latency', 0)
+
+    async def _call(self, func, *args):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return await super()._call(func, *args)
+
+    # testing helpers of Testdummy
+    def get_events(self):
+        return self._exchange.get_events()
+
+    def execute_orders(self, filter):
+        self._exchange.execute_orders(filter)
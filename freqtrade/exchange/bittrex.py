@@ -1,7 +1,7 @@
 import logging
 from typing import List, Dict
 
-from bittrex.bittrex import Bittrex as _Bittrex, API_V2_0, API_V1_1
+from bittrex.bittrex import Bittrex as _Bittrex, API_V2_0, API_V1_1, using_requests
 from requests.exceptions import ContentDecodingError
 
 from freqtrade import OperationalException
@@ -20,21 +20,30 @@ class Bittrex(Exchange):
     # Base URL and API endpoints
     BASE_URL: str = 'https://www.bittrex.com'
     PAIR_DETAIL_METHOD: str = BASE_URL + '/Market/Index'
+    CALLS_PER_SECOND: float = 1
+    # minutes -> interval name of the v2 api
+    TICK_INTERVALS = {1: 'oneMin', 5: 'fiveMin'}
 
-    def __init__(self, config: dict) -> None:
+    def __init__(self, config: dict, dispatch=using_requests) -> None:
+        """
+        :param dispatch: function(request_url, apisign) doing the HTTP request,
+                         see python-bittrex
+        """
         global _API, _API_V2
         exg = dict()
 
         _API = _Bittrex(
             api_key=config['key'],
             api_secret=config['secret'],
-            calls_per_second=1,
+            calls_per_second=self.CALLS_PER_SECOND,
+            dispatch=dispatch,
             api_version=API_V1_1,
         )
         _API_V2 = _Bittrex(
             api_key    = config['key'],
             api_secret = config['secret'],
-            calls_per_second=1,
+            calls_per_second=self.CALLS_PER_SECOND,
+            dispatch=dispatch,
             api_version=API_V2_0,
         )
         exg['API']    = _API
@@ -55,6 +64,14 @@ class Bittrex(Exchange):
         # See https://bittrex.com/fees
         return 0.0025
 
+    @property
+    def rate_limit(self) -> float:
+        return self.CALLS_PER_SECOND
+
+    @property
+    def tick_intervals(self) -> List[int]:
+        return list(self.TICK_INTERVALS)
+
     def buy(self, pair: str, rate: float, amount: float) -> str:
         data = _API.buy_limit(pair.replace('_', '-'), amount, rate)
         if not data['success']:
@@ -115,11 +132,8 @@ class Bittrex(Exchange):
         }
 
     def get_ticker_history(self, pair: str, tick_interval: int) -> List[Dict]:
-        if tick_interval == 1:
-            interval = 'oneMin'
-        elif tick_interval == 5:
-            interval = 'fiveMin'
-        else:
+        interval = self.TICK_INTERVALS.get(tick_interval)
+        if interval is None:
             raise ValueError('Cannot parse tick_interval: {}'.format(tick_interval))
 
         data = _API_V2.get_candles(pair.replace('_', '-'), interval)
@@ -164,6 +178,43 @@ class Bittrex(Exchange):
             'closed': data['Closed'],
         }
 
+    def get_open_orders(self) -> List[Dict]:
+        data = _API.get_open_orders()
+        if not data['success']:
+            Bittrex._validate_response(data)
+            raise OperationalException('{message}'.format(message=data['message']))
+        return [{
+            'id': order['OrderUuid'],
+            'type': order['OrderType'],
+            'pair': order['Exchange'].replace('-', '_'),
+            'opened': order['Opened'],
+            'rate': order['PricePerUnit'],
+            'amount': order['Quantity'],
+            'remaining': order['QuantityRemaining'],
+            'closed': order['Closed'],
+        } for order in data['result']]
+
+    def get_tickers(self, pairs: List[str]) -> Dict[str, dict]:
+        # one request for all markets
+        summaries = {summary['MarketName'].replace('-', '_'): summary
+                     for summary in self.get_market_summaries()}
+        result = {}
+        for pair in pairs:
+            summary = summaries.get(pair)
+            if not summary \
+                    or not summary.get('Bid') \
+                    or not summary.get('Ask') \
+                    or not summary.get('Last'):
+                raise ContentDecodingError('{message} params=({pair})'.format(
+                    message='Got invalid response from bittrex',
+                    pair=pair))
+            result[pair] = {
+                'bid': float(summary['Bid']),
+                'ask': float(summary['Ask']),
+                'last': float(summary['Last']),
+            }
+        return result
+
     def cancel_order(self, order_id: str) -> None:
         data = _API.cancel(order_id)
         if not data['success']:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 class Exchange(ABC):
@@ -18,6 +18,23 @@ class Exchange(ABC):
         :return: percentage in float
         """
 
+    @property
+    def rate_limit(self) -> float:
+        """
+        Maximum number of API calls per second
+        :return: calls per second, 0 for no limit
+        """
+        return 0.0
+
+    @property
+    def tick_intervals(self) -> Optional[List[int]]:
+        """
+        Ticker intervals get_ticker_history() supports, the others are
+        resampled from the finest one by exchange.get_ticker_history()
+        :return: list of minutes, None if any interval is supported
+        """
+        return None
+
     @abstractmethod
     def buy(self, pair: str, rate: float, amount: float) -> str:
         """
@@ -109,6 +126,22 @@ class Exchange(ABC):
         }
         """
 
+    def get_open_orders(self) -> List[Dict]:
+        """
+        Get all open orders of the account in one request.
+        Raises NotImplementedError if the exchange cant list them.
+        :return: list of orders, same format as get_order()
+        """
+        raise NotImplementedError
+
+    def get_tickers(self, pairs: List[str]) -> Dict[str, dict]:
+        """
+        Gets the tickers of several pairs, in one request if the exchange can.
+        :param pairs: list of pairs, format: BTC_ETC
+        :return: dict of pair and ticker, same format as get_ticker()
+        """
+        return {pair: self.get_ticker(pair) for pair in pairs}
+
     @abstractmethod
     def cancel_order(self, order_id: str) -> None:
         """
@@ -6,11 +6,15 @@ from requests.exceptions import ContentDecodingError
 from freqtrade import OperationalException
 
 from freqtrade.exchange.interface import Exchange
+from freqtrade.fill import fill_order, parse_fill_model
 
 class Testdummy(Exchange):
     """
     Dummy exchange for testing,
     dont trade live with this.
+    With config 'fill_model' (see fill.py), buy orders are filled by the
+    fill model on a candle made from the ticker, and can stay open in
+    part or not fill at all, until cancelled.
     """
     def __init__(self, config):
         self.conf = config
@@ -20,6 +24,8 @@ class Testdummy(Exchange):
         self._pairs = dict() # what pairs we are currenty holding
         self._events = [] # log all actions
         self._auto_execute = True # immediately execute orders
+        self._fill_model = parse_fill_model(config.get('fill_model'))
+        self._filled = dict() # uuid -> amount filled, with a fill model
 
     # Test parameters
 
@@ -68,6 +74,9 @@ class Testdummy(Exchange):
                 amount=amount))
         else:
             uuid = self._make_uuid()
+            if self._fill_model:
+                rate, self._filled[uuid] = fill_order(self._fill_model,
+                                                      self._candle(pair), rate, amount)
             self._pairs[uuid] = [pair, rate, amount, 'LIMIT_BUY']
             self._open_orders[uuid] = [pair, rate, amount, 'LIMIT_BUY']
             # FIX: log event
@@ -84,10 +93,18 @@ class Testdummy(Exchange):
             [pair2, rate2, amount2, order_type] = rec
             if pair2 == pair and order_type == 'LIMIT_BUY':
                 rec[3] = 'LIMIT_SELL'
+                self._filled.pop(uuid, None) # sells fill at once
                 self._open_orders[uuid] = [pair, rate, amount, 'LIMIT_SELL']
                 return uuid
         raise OperationalException('No such pair to sell, params=({pair}, {rate}, {amount})')
 
+    def _candle(self, pair: str) -> Dict[str, float]:
+        # the ticker as a candle, for the fill model
+        ticker = self.get_ticker(pair)
+        rates = ticker.values()
+        return {'high': max(rates), 'low': min(rates), 'close': ticker['last'],
+                'volume': self.conf.get('volume', random.random() * 1000)}
+
     def get_balance(self, currency: str) -> float:
         return random.random() * 1000
 
@@ -136,6 +153,7 @@ class Testdummy(Exchange):
                 order_id=order_id))
 
         # data :: [pair, rate, amount, uuid]
+        remaining = data[2] - self._filled.get(order_id, data[2])
         return {
             'id': order_id,
             'type': data[3], # LIMIT_BUY or LIMIT_SELL
@@ -143,14 +161,23 @@ class Testdummy(Exchange):
             'opened': '', # date opened
             'rate': data[1],
             'amount': data[2],
-            'remaining': 0,
-            'closed': 'true'
+            'remaining': remaining,
+            'closed': 'true' if remaining <= 0 else None
         }
 
+    def get_open_orders(self) -> List[Dict]:
+        # orders are executed at once, see get_order(),
+        # unless the fill model left them open
+        return [self.get_order(uuid) for uuid, filled in self._filled.items()
+                if filled < self._pairs[uuid][2]]
+
     def cancel_order(self, order_id: str) -> None:
-        raise OperationalException('{message} params=({order_id})'.format(
-                message='cant cancel order',
-                order_id=order_id))
+        if order_id not in self._filled:
+            raise OperationalException('{message} params=({order_id})'.format(
+                    message='cant cancel order',
+                    order_id=order_id))
+        # closed with what has been filled
+        self._pairs[order_id][2] = self._filled[order_id]
 
     def get_pair_detail_url(self, pair: str) -> str:
         return None
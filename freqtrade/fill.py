@@ -0,0 +1,181 @@
+"""
+Fill simulation of the orders of a backtest
+
+Without it the backtest buys and sells at the close of the candle,
+always, for the whole stake. Live, the bot buys with a limit order at
+Strategy.get_target_bid() and sells at the bid, and a limit order can
+fill in part or not at all.
+
+A fill model is a list of stages, given as a spec like
+    spread:0.5,limit:3,volume:0.1
+Each stage works on the arrays of all candles of a pair at once and
+refines the columns, what a buy or a sell placed on the candle gets:
+    buy_rate    rate the buy is filled at
+    buy_filled  part of the stake that is filled, 0 if not filled
+    buy_delay   candles until the buy is filled, 0 for the same candle
+    sell_rate   rate the sell is filled at
+Stages (FILL_MODELS):
+    spread:R   the spread is R * (high - low), around the close. The buy
+               is priced like get_target_bid(), the sell at the bid
+    limit:N    the buy is a limit order, when it is below the ask it only
+               fills if the low of one of the next N candles reaches it
+    volume:P   at most P of the volume of the candle is filled
+A limit order that fills a few candles later opens the trade on the
+candle it fills on, the backtests don't step the trade before that.
+fill_order() runs the same stages for one order of the Testdummy exchange.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from freqtrade import OperationalException
+
+logger = logging.getLogger(__name__)
+
+# columns added by simulate()
+FILL_COLUMNS = ['buy_rate', 'buy_filled', 'buy_delay', 'sell_rate']
+
+
+class FillModel():
+    """A stage of the fill simulation"""
+
+    name = ''
+    default = 0.0
+
+    def __init__(self, param: Optional[float] = None) -> None:
+        self.param = self.default if param is None else param
+
+    def quote(self, candles: Dict[str, np.ndarray], fills: Dict[str, np.ndarray]) -> None:
+        """Sets the ask and bid of the candles, in fills"""
+        pass
+
+    def fill(self, candles: Dict[str, np.ndarray], fills: Dict[str, np.ndarray]) -> None:
+        """Refines buy_filled, knowing the rate and amount of the buys"""
+        pass
+
+    def __repr__(self):
+        return '{}:{:g}'.format(self.name, self.param)
+
+
+class SpreadFill(FillModel):
+    """Pays the spread, estimated from the range of the candle"""
+
+    name = 'spread'
+    default = 0.5
+
+    def quote(self, candles, fills):
+        close = candles['close']
+        half = self.param * (candles['high'] - candles['low']) / 2
+        fills['ask'] = np.minimum(close + half, candles['high'])
+        fills['bid'] = np.maximum(close - half, candles['low'])
+
+
+class LimitExpiry(FillModel):
+    """Buy limit orders below the ask wait for the price, then expire"""
+
+    name = 'limit'
+    default = 3
+
+    def fill(self, candles, fills):
+        rate = fills['buy_rate']
+        low = candles['low']
+        # marketable, filled at once, otherwise -1 until the low reaches it
+        delay = np.where(rate >= fills['ask'], 0, -1)
+        for k in range(1, int(self.param) + 1):
+            reached = np.zeros(len(rate), dtype=bool)
+            reached[:-k] = low[k:] <= rate[:-k]
+            delay = np.where((delay < 0) & reached, k, delay)
+        fills['buy_filled'] = np.where(delay >= 0, fills['buy_filled'], 0.0)
+        fills['buy_delay'] = np.maximum(delay, fills['buy_delay'])
+
+
+class VolumeFill(FillModel):
+    """Partial fills, the order can only take part of the volume"""
+
+    name = 'volume'
+    default = 0.1
+
+    def fill(self, candles, fills):
+        part = self.param * candles['volume'] / fills['amount']
+        fills['buy_filled'] = np.minimum(fills['buy_filled'], part)
+
+
+# name -> stage
+FILL_MODELS = {model.name: model for model in [SpreadFill, LimitExpiry, VolumeFill]}
+
+
+def parse_fill_model(spec: Optional[str]) -> Optional[List[FillModel]]:
+    """
+    :param spec: e.g. 'spread:0.5,limit:3', None or '' for no fill model
+    :return: the stages, in the order of spec
+    """
+    if not spec:
+        return None
+    models = []
+    for stage in spec.split(','):
+        name, _, param = stage.strip().partition(':')
+        if name not in FILL_MODELS:
+            raise OperationalException('unknown fill model {}, one of {}'.format(
+                name, list(FILL_MODELS)))
+        try:
+            models.append(FILL_MODELS[name](float(param) if param else None))
+        except ValueError:
+            raise OperationalException('bad parameter of fill model {}'.format(stage))
+    return models
+
+
+def fill_arrays(models: List[FillModel], candles: Dict[str, np.ndarray],
+                ask_last_balance: float = 0.0, stake: float = 1.0,
+                limit: Optional[np.ndarray] = None,
+                amount: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Runs the stages on the candle arrays
+    :param ask_last_balance: prices the buys like Strategy.get_target_bid()
+    :param stake: of each buy, in stake currency
+    :param limit: the rates of the buys, instead of get_target_bid()
+    :param amount: the amounts of the buys, instead of stake / rate
+    :return: FILL_COLUMNS arrays
+    """
+    close = candles['close']
+    fills = {'ask': close, 'bid': close, 'buy_filled': np.ones(len(close)),
+             'buy_delay': np.zeros(len(close), dtype=np.int64)}
+    for model in models:
+        model.quote(candles, fills)
+    ask = fills['ask']
+    if limit is None:
+        # get_target_bid() with last = close, the ask is never below it
+        fills['buy_rate'] = ask + ask_last_balance * (close - ask)
+    else:
+        # a limit above the ask is filled at the ask
+        fills['buy_rate'] = np.minimum(limit, ask)
+    fills['amount'] = stake / fills['buy_rate'] if amount is None else amount
+    for model in models:
+        model.fill(candles, fills)
+    fills['sell_rate'] = fills['bid']
+    return {col: fills[col] for col in FILL_COLUMNS}
+
+
+def fill_order(models: List[FillModel], candle: Dict[str, float], rate: float,
+               amount: float) -> Tuple[float, float]:
+    """
+    fill_arrays() for a single buy order at the limit rate, on one candle
+    (used by the Testdummy exchange)
+    :return: rate it is filled at, amount filled
+    """
+    candles = {col: np.array([value], dtype=np.float64) for col, value in candle.items()}
+    fills = fill_arrays(models, candles, limit=np.array([rate]), amount=np.array([amount]))
+    return float(fills['buy_rate'][0]), amount * float(fills['buy_filled'][0])
+
+
+def simulate(strategy, models: List[FillModel], df: DataFrame) -> DataFrame:
+    """
+    Adds FILL_COLUMNS to a populated dataframe
+    """
+    candles = {col: np.asarray(df[col].values, dtype=np.float64)
+               for col in ['open', 'high', 'low', 'close', 'volume']}
+    fills = fill_arrays(models, candles, strategy._ask_last_balance, strategy.stake_amount())
+    for col, values in fills.items():
+        df[col] = values
+    return df
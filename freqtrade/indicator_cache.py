@@ -0,0 +1,140 @@
+"""
+Memoization of indicator columns
+
+Used by analyze.prepare_indicators() to avoid recalculating the
+same indicators over the same candles, as happens in every
+hyperopt epoch.
+
+The key of an indicator is a digest chained over the candle data
+(date and OHLCV columns) and the specs (name, script name, args)
+of all indicators up to and including it, in the order of the
+compiled indicator_plan. Chaining makes indicators that
+read columns of earlier indicators (like 'lin') safe to cache.
+As the candle data is part of the key, so are pair and interval.
+"""
+import hashlib
+import logging
+import threading
+from typing import Optional, Dict, Set
+
+import numpy as np
+from cachetools import LRUCache
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+# columns that identify the candle data
+_CANDLE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# Current cache, None if caching is disabled
+_CACHE: Optional[LRUCache] = None
+_STATS = {'hits': 0, 'misses': 0, 'evictions': 0}
+# pairs can be preprocessed in threads
+_LOCK = threading.Lock()
+
+
+class _IndicatorLRU(LRUCache):
+    """LRUCache bounded by the number of bytes of the cached columns"""
+
+    def popitem(self):
+        _STATS['evictions'] += 1
+        return super().popitem()
+
+
+def _columns_size(columns: Dict[str, np.ndarray]) -> int:
+    return sum(values.nbytes for values in columns.values())
+
+
+def init(max_bytes: int) -> None:
+    """
+    Enables the cache
+    :param max_bytes: memory bound of the cached columns, 0 disables the cache
+    :return: None
+    """
+    global _CACHE
+    _CACHE = _IndicatorLRU(maxsize=max_bytes, getsizeof=_columns_size) if max_bytes else None
+    reset_stats()
+
+
+def enabled() -> bool:
+    return _CACHE is not None
+
+
+def reset_stats() -> None:
+    for key in _STATS:
+        _STATS[key] = 0
+
+
+def stats() -> Dict[str, int]:
+    """
+    Returns hit/miss/eviction counters and the current size in bytes
+    """
+    result = dict(_STATS)
+    result['bytes'] = int(_CACHE.currsize) if _CACHE is not None else 0
+    return result
+
+
+def log_stats() -> None:
+    if not enabled():
+        return
+    st = stats()
+    total = st['hits'] + st['misses']
+    logger.info('indicator cache: %d hits, %d misses (%.1f%% hit rate), '
+                '%d evictions, %.1f MB in use',
+                st['hits'], st['misses'],
+                100.0 * st['hits'] / total if total else 0.0,
+                st['evictions'], st['bytes'] / 2**20)
+
+
+def digest(dataframe: DataFrame) -> str:
+    """
+    Identity of the candle data in the dataframe
+    """
+    h = hashlib.sha1()
+    for col in _CANDLE_COLUMNS:
+        if col in dataframe.columns:
+            h.update(np.ascontiguousarray(dataframe[col].values).tobytes())
+    return h.hexdigest()
+
+
+def chain(prev: str, step) -> str:
+    """
+    Key for the indicator step (see indicator_plan.Step),
+    computed on the data identified by prev
+    """
+    return hashlib.sha1((prev + repr(step)).encode()).hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Returns the cached columns for key, or None
+    """
+    with _LOCK:
+        columns = _CACHE.get(key)
+        if columns is None:
+            _STATS['misses'] += 1
+        else:
+            _STATS['hits'] += 1
+    return columns
+
+
+def restore(dataframe: DataFrame, columns: Dict[str, np.ndarray]) -> None:
+    """
+    Inserts cached columns into the dataframe
+    """
+    for col, values in columns.items():
+        dataframe[col] = values.copy()
+
+
+def put(key: str, dataframe: DataFrame, before: Set[str], sname: Optional[str] = None) -> None:
+    """
+    Caches the columns an indicator added to the dataframe
+    :param before: column names before the indicator was run
+    :param sname: column name of the indicator, cached even if it replaced a column
+    """
+    columns = {col: dataframe[col].values.copy() for col in dataframe.columns
+               if col not in before or col == sname}
+    if _columns_size(columns) > _CACHE.maxsize:
+        return
+    with _LOCK:
+        _CACHE[key] = columns
@@ -0,0 +1,265 @@
+"""
+Compiled indicator specs of a strategy
+
+Strategy.select_indicators() returns a list of specs:
+    [column, name, args]  e.g. ['ema5', 'ema', [5]]
+                               ['rsi', 'rsi', {'price': 'close', 'timeperiod': 14}]
+    [name, args]          column is the name
+    [name]                column is the name, default args
+name is a TA-Lib function or one of CLASSES. args is a list of
+positional TA-Lib parameters, a dict of TA-Lib parameters and input
+names, or the args of the class indicator.
+
+compile_plan() turns the list into a Plan, once:
+  - functions with several outputs (bbands, macd, stochf, ...) add
+    a column per output, named column_output
+  - specs that compute the same name and args run once, the columns
+    of the others are copies
+  - steps are ordered so the columns an indicator reads (TA-Lib input
+    names, the input of lin) are computed before it
+  - two different specs writing the same column raise OperationalException
+plan_for() caches the plans by spec, they are reused for every pair.
+
+TA-Lib functions are looked up once in a registry (talib_function()),
+and each step binds its input columns and parameters at compile time.
+Running a step calls the plain talib function on the numpy arrays of
+the columns, not the abstract API on the whole DataFrame.
+"""
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import talib
+import talib.abstract as ta
+from cachetools import LRUCache
+from pandas import DataFrame
+
+from freqtrade import OperationalException
+from freqtrade.ta.awesome_oscillator import awesome_oscillator
+from freqtrade.ta.heikinashi import heikinashi
+from freqtrade.ta.linear_comb import linear_comb
+
+logger = logging.getLogger(__name__)
+
+# indicators implemented in freqtrade.ta, name -> class
+CLASSES = {'heikinashi': heikinashi, 'ao': awesome_oscillator, 'lin': linear_comb}
+
+# columns of the candle data
+CANDLE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+_PLANS = LRUCache(maxsize=64)
+_LOCK = threading.Lock()
+
+
+def _canonical(args) -> str:
+    return json.dumps(args, sort_keys=True, default=repr)
+
+
+class TalibFunction():
+    """A TA-Lib function, with its inputs, parameters and outputs"""
+
+    __slots__ = ['name', 'func', 'input_names', 'parameters', 'output_names']
+
+    def __init__(self, name: str) -> None:
+        f = ta.Function(name)
+        self.name = name
+        # the plain function of talib, stateless unlike the abstract Function
+        self.func = getattr(talib, f.info['name'])
+        self.input_names = dict(f.input_names)  # e.g. 'price': 'close', 'prices': [..]
+        self.parameters = dict(f.parameters)  # with their defaults
+        self.output_names = list(f.output_names)
+
+    def bind(self, args) -> Tuple[List[str], Dict]:
+        """
+        Binds args as the abstract API does: a list are the parameters in
+        order, a dict sets parameters and input names by name
+        :return: the input columns and all parameters
+        """
+        inputs = dict(self.input_names)
+        params = dict(self.parameters)
+        if isinstance(args, dict):
+            for key, value in args.items():
+                if key in inputs:
+                    inputs[key] = value
+                elif key in params:
+                    params[key] = value
+                else:
+                    logger.warning('%s has no parameter or input %s, ignored', self.name, key)
+        elif args:
+            if len(args) > len(params):
+                raise OperationalException('{} takes the parameters {}, not {}'.format(
+                    self.name, list(params), args))
+            params.update(zip(self.parameters, args))
+        columns = []
+        for value in inputs.values():
+            columns.extend(value if isinstance(value, (list, tuple)) else [value])
+        return columns, params
+
+
+# name -> TalibFunction
+_FUNCTIONS: Dict[str, TalibFunction] = {}
+
+
+def talib_function(name: str) -> TalibFunction:
+    """
+    The TA-Lib function name, from the registry
+    """
+    function = _FUNCTIONS.get(name)
+    if function is None:
+        function = TalibFunction(name)
+        with _LOCK:
+            _FUNCTIONS[name] = function
+    return function
+
+
+class Step():
+    """One computation of the plan, adding its outputs to the dataframe"""
+
+    __slots__ = ['column', 'name', 'args', 'key', 'inputs', 'outputs', 'aliases', 'multi',
+                 'func', 'params']
+
+    def __init__(self, column: str, name: str, args) -> None:
+        self.column = column
+        self.name = name
+        self.args = args
+        self.aliases: List[str] = []  # columns of duplicate specs
+        self.multi = False
+        if name in CLASSES:
+            self.key = '{}({})'.format(name, _canonical(args))
+            self.inputs = list(args['input']) if name == 'lin' else []
+            self.outputs = [column]
+            return
+        function = talib_function(name)
+        self.func = function.func
+        self.inputs, self.params = function.bind(args)
+        # by the bound values, ['ema', [5]] is ['ema', {'timeperiod': 5}]
+        self.key = '{}({})'.format(name, _canonical([self.inputs, self.params]))
+        self.multi = len(function.output_names) > 1
+        self.outputs = self._columns(column, function.output_names)
+
+    def _columns(self, column: str, output_names: List[str]) -> List[str]:
+        if self.multi:
+            return [column + '_' + out for out in output_names]
+        return [column]
+
+    def columns(self) -> List[str]:
+        """All columns the step writes, its own and those of the aliases"""
+        return self.outputs + [col for alias in self.aliases for col in self.alias_columns(alias)]
+
+    def alias_columns(self, alias: str) -> List[str]:
+        if self.multi:
+            return [alias + col[len(self.column):] for col in self.outputs]
+        return [alias]
+
+    def run(self, strategy, dataframe: DataFrame) -> None:
+        if self.name in CLASSES:
+            dataframe[self.column] = CLASSES[self.name](strategy, self.args).run(dataframe)
+        else:
+            arrays = [np.asarray(dataframe[col].values, dtype=np.float64) for col in self.inputs]
+            result = self.func(*arrays, **self.params)
+            if self.multi:
+                for col, values in zip(self.outputs, result):
+                    dataframe[col] = values
+            else:
+                dataframe[self.column] = result
+        for alias in self.aliases:
+            for col, src in zip(self.alias_columns(alias), self.outputs):
+                dataframe[col] = dataframe[src]
+
+    def __repr__(self):
+        return 'Step({}={}{})'.format(self.column, self.key,
+                                      ', aliases={}'.format(self.aliases) if self.aliases else '')
+
+
+class Plan():
+    """The steps of the indicator specs of a strategy, in execution order"""
+
+    def __init__(self, steps: List[Step]) -> None:
+        self.steps = steps
+
+    def columns(self) -> List[str]:
+        return [col for step in self.steps for col in step.columns()]
+
+    def run(self, strategy, dataframe: DataFrame) -> DataFrame:
+        for step in self.steps:
+            step.run(strategy, dataframe)
+        return dataframe
+
+
+def parse(ind: list) -> Tuple[str, str, Optional[object]]:
+    """
+    :return: column, name and args of an indicator spec
+    """
+    if len(ind) == 1:
+        return ind[0], ind[0], None
+    if len(ind) == 2:
+        return ind[0], ind[0], ind[1]
+    if len(ind) == 3:
+        return ind[0], ind[1], ind[2]
+    raise OperationalException('indicator spec {} is not [column, name, args], '
+                               '[name, args] or [name]'.format(ind))
+
+
+def compile_plan(inds: List[list]) -> Plan:
+    """
+    Compiles the indicator specs of Strategy.select_indicators()
+    """
+    steps: List[Step] = []
+    by_key: Dict[str, Step] = {}
+    writer: Dict[str, Step] = {}  # column -> step writing it
+    for ind in inds:
+        column, name, args = parse(ind)
+        step = Step(column, name, args)
+        same = by_key.get(step.key)
+        if same is not None:
+            if column == same.column or column in same.aliases:
+                continue
+            same.aliases.append(column)
+            new_columns = same.alias_columns(column)
+            step = same
+        else:
+            by_key[step.key] = step
+            steps.append(step)
+            new_columns = step.outputs
+        for col in new_columns:
+            if col in writer or col in CANDLE_COLUMNS:
+                raise OperationalException('indicator column {} of {} is already written by '
+                                           '{}'.format(col, ind, writer.get(col, 'the candles')))
+            writer[col] = step
+
+    # order by dependency, keeping the order of the specs otherwise
+    ordered: List[Step] = []
+    state: Dict[int, str] = {}
+
+    def visit(step: Step) -> None:
+        if state.get(id(step)) == 'done':
+            return
+        if state.get(id(step)) == 'visiting':
+            raise OperationalException('indicators depend on each other: {}'.format(step))
+        state[id(step)] = 'visiting'
+        for col in step.inputs:
+            if col in writer and writer[col] is not step:
+                visit(writer[col])
+        state[id(step)] = 'done'
+        ordered.append(step)
+
+    for step in steps:
+        visit(step)
+    return Plan(ordered)
+
+
+def plan_for(inds: List[list]) -> Plan:
+    """
+    The compiled plan of inds, compiled on first use
+    """
+    key = _canonical(inds)
+    with _LOCK:
+        plan = _PLANS.get(key)
+    if plan is None:
+        plan = compile_plan(inds)
+        logger.debug('compiled indicator plan: %s', plan.steps)
+        with _LOCK:
+            _PLANS[key] = plan
+    return plan
@@ -11,11 +11,11 @@ from typing import Dict, Optional, List
 import requests
 from cachetools import cached, TTLCache
 
-from freqtrade import __version__, exchange, persistence, rpc, DependencyException, \
+from freqtrade import __version__, exchange, persistence, rpc, perf, DependencyException, \
     OperationalException
-from freqtrade.analyze import get_signal, SignalType
+from freqtrade.analyze import get_signal, SignalType, signal_latency
 from freqtrade.misc import State, get_state, update_state, parse_args, throttle, \
-    load_config
+    load_config, parallel_map
 from freqtrade.persistence import Trade
 from freqtrade.trade import handle_trade, calc_profit
 from freqtrade.strategy import Strategy
@@ -41,6 +41,7 @@ def event_log(dst, what, msg):
         logger.info('####### not logging %s,  %s ######' %(what, msg))
 
 
+@perf.timed('process.whitelist')
 def refresh_whitelist(strategy: Strategy, whitelist: Optional[List[str]] = None) -> None:
     """
     Check wallet health and remove pair from whitelist if necessary
@@ -65,6 +66,7 @@ def refresh_whitelist(strategy: Strategy, whitelist: Optional[List[str]] = None)
     return sanitized_whitelist
 
 
+@perf.timed('process')
 def _process(strategy, dynamic_whitelist: Optional[int] = 0) -> bool:
     """
     Queries the persistence layer for open trades and handles them,
@@ -74,50 +76,58 @@ def _process(strategy, dynamic_whitelist: Optional[int] = 0) -> bool:
     """
     state_changed = False
     try:
-        # Refresh whitelist based on wallet maintenance
-        sanitized_whitelist = refresh_whitelist(strategy,
-            gen_pair_whitelist(strategy.stake_currency(), topn = dynamic_whitelist) if dynamic_whitelist else None
-        )
-        if strategy.whitelist() != sanitized_whitelist:
-            logger.debug('Using refreshed pair whitelist: %s ...', sanitized_whitelist)
-            strategy.set_whitelist(sanitized_whitelist)
-        # Query trades from persistence layer
-        trades = Trade.query.filter(Trade.is_open.is_(True)).all()
-        if len(trades) < strategy.max_open_trades():
-            try:
-                # Create entity and execute trade
-                state_changed = create_trade(strategy, strategy.stake_amount())
-                if not state_changed:
-                    logger.info(
-                        'Checked all whitelisted currencies. '
-                        'Found no suitable entry positions for buying. Will keep looking ...'
-                    )
-            except DependencyException as e:
-                logger.warning('Unable to create trade: %s', e)
-
-        for trade in trades:
-            # Get order details for actual price per unit
-            if trade.open_order_id:
-                # Update trade with order values
-                logger.info('Got open order for %s', trade)
-                trade.update(exchange.get_order(trade.open_order_id))
-
-            if trade.is_open and trade.open_order_id is None:
-                # Check if we can sell our current pair
-                trade_state = handle_trade(strategy, trade)
-                if trade_state:
-                    logger.info('    sell has triggered')
-                    current_rate = exchange.get_ticker(trade.pair)['bid']
-                    msg = execute_sell(trade, current_rate)
-                    Trade.session.flush()
-                    event_log(EVENT_RPC, 'execute_sell', msg)
-                state_changed = trade_state or state_changed
-
-            # FIX: do we really need to call flush here, even
-            # though we do it in buy/sell?
-            # Make a test that exposes that by remarking this
-            # flush
-            Trade.session.flush()
+        # queries don't flush the stats written behind, end_cycle() does
+        with persistence.write_behind():
+            # Refresh whitelist based on wallet maintenance
+            sanitized_whitelist = refresh_whitelist(strategy,
+                gen_pair_whitelist(strategy.stake_currency(), topn = dynamic_whitelist) if dynamic_whitelist else None
+            )
+            if strategy.whitelist() != sanitized_whitelist:
+                logger.debug('Using refreshed pair whitelist: %s ...', sanitized_whitelist)
+                strategy.set_whitelist(sanitized_whitelist)
+            # Query trades from persistence layer
+            trades = Trade.query.filter(Trade.is_open.is_(True)).all()
+            if len(trades) < strategy.max_open_trades():
+                try:
+                    # Create entity and execute trade
+                    state_changed = create_trade(strategy, strategy.stake_amount())
+                    if not state_changed:
+                        logger.info(
+                            'Checked all whitelisted currencies. '
+                            'Found no suitable entry positions for buying. Will keep looking ...'
+                        )
+                except DependencyException as e:
+                    logger.warning('Unable to create trade: %s', e)
+
+            # One request for the open orders of all trades,
+            # only the orders missing from it need a get_order()
+            open_orders = exchange.get_open_orders() \
+                if any(trade.open_order_id for trade in trades) else {}
+            for trade in trades:
+                # Get order details for actual price per unit
+                if trade.open_order_id and \
+                        (open_orders is None or trade.open_order_id not in open_orders):
+                    # Update trade with order values
+                    logger.info('Got open order for %s', trade)
+                    trade.update(exchange.get_order(trade.open_order_id))
+
+            # and one request for the rates of all trades
+            tickers = exchange.get_tickers(
+                [trade.pair for trade in trades if trade.is_open and trade.open_order_id is None])
+            for trade in trades:
+                if trade.is_open and trade.open_order_id is None:
+                    # Check if we can sell our current pair
+                    current_rate = tickers[trade.pair]['bid']
+                    trade_state = handle_trade(strategy, trade, current_rate)
+                    if trade_state:
+                        logger.info('    sell has triggered')
+                        msg = execute_sell(trade, current_rate)
+                        Trade.session.flush()
+                        event_log(EVENT_RPC, 'execute_sell', msg)
+                    state_changed = trade_state or state_changed
+
+            # the stats of all trades, written behind in one transaction
+            persistence.end_cycle()
     except (requests.exceptions.RequestException, json.JSONDecodeError) as error:
         logger.warning(
             'Got %s in _process(), retrying in 30 seconds...',
@@ -133,6 +143,7 @@ def _process(strategy, dynamic_whitelist: Optional[int] = 0) -> bool:
         update_state(State.STOPPED)
     return state_changed
 
+@perf.timed('process.execute_sell')
 def execute_sell(trade: Trade, limit: float) -> None:
     """
     Executes a limit sell for the given trade and limit
@@ -155,6 +166,31 @@ def execute_sell(trade: Trade, limit: float) -> None:
     # FIX: the caller should also be responsible for calc_profit
     return msg
 
+@perf.timed('process.scan_signals')
+def scan_signals(strategy: Strategy, pairs: List[str], signal: SignalType) -> List[str]:
+    """
+    Evaluates the signal of all pairs, concurrently in
+    internals.signal_workers threads (default 4).
+    The ticker history fetches are rate limited by the exchange module.
+    :return: the pairs that signal, in the order of pairs
+    """
+    workers = _CONF.get('internals', {}).get('signal_workers', 4)
+    start = time.time()
+    results = parallel_map(lambda pair: get_signal(strategy, pair, signal), pairs, workers)
+    latency = signal_latency()
+    for pair in pairs:
+        if pair in latency:
+            logger.debug('%s signal of %s: fetch %.3fs, analysis %.3fs',
+                         signal.value, pair, *latency[pair])
+    timed = [latency[pair] for pair in pairs if pair in latency]
+    logger.info('Scanned %d pairs for %s signals in %.2fs (slowest fetch %.2fs, analysis %.2fs)',
+                len(pairs), signal.value, time.time() - start,
+                max([t[0] for t in timed], default=0.0),
+                max([t[1] for t in timed], default=0.0))
+    return [pair for pair, result in zip(pairs, results) if result]
+
+
+@perf.timed('process.create_trade')
 def create_trade(strategy: Strategy, stake_amount: float) -> bool:
     """
     Checks the implemented trading indicator(s) for a randomly picked pair,
@@ -186,12 +222,10 @@ def create_trade(strategy: Strategy, stake_amount: float) -> bool:
 
     # Pick pair based on StochRSI buy signals
     # FIX: whould we scramble whitelist before picking first feasible pair?
-    for _pair in whitelist:
-        if get_signal(strategy,_pair, SignalType.BUY):
-            pair = _pair
-            break
-    else:
+    signalled = scan_signals(strategy, whitelist, SignalType.BUY)
+    if not signalled:
         return False
+    pair = signalled[0]
 
     # Calculate amount
     buy_limit = strategy.get_target_bid(exchange.get_ticker(pair))
@@ -352,6 +386,7 @@ def main() -> None:
                     strategy=strategy,
                     dynamic_whitelist=args.dynamic_whitelist,
                 )
+                perf.log_stats(_CONF['internals'].get('perf_log_secs', 0))
             old_state = new_state
     except KeyboardInterrupt:
         logger.info('Got SIGINT, aborting ...')
@@ -1,11 +1,10 @@
-import sys
 import argparse
 import enum
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import Any, Callable, List, Dict
-from pandas import DataFrame
 
 from jsonschema import validate, Draft4Validator
 from jsonschema.exceptions import best_match, ValidationError
@@ -29,21 +28,6 @@ class State(enum.Enum):
 # Current application state
 _STATE = State.STOPPED
 
-def printdf(df: DataFrame) -> None:
-  for pair, pair_data in df.items():
-      pkeys = pair_data.keys()
-      for key in pkeys:
-         sys.stdout.write(str(key + ',  '))
-      sys.stdout.write('\n')
-      val = pair_data[pkeys[0]].values
-      rows, = val.shape
-      for i in range(rows):
-        sys.stdout.write('')
-        for j in range(len(pkeys)):
-          v = pair_data[pkeys[j]].values
-          sys.stdout.write(str(v[i]) + ', ')
-        sys.stdout.write('\n')
-
 @synchronized
 def update_state(state: State) -> None:
     """
@@ -101,6 +85,63 @@ def throttle(func: Callable[..., Any], min_secs: float, *args, **kwargs) -> Any:
     time.sleep(duration)
     return result
 
+def parallel_map(func: Callable[..., Any], items: List, workers: int = 0,
+                 backend: str = 'thread') -> List:
+    """
+    Maps func over items, optionally in a pool of workers.
+    The result is in the same order as items.
+    :param workers: size of the pool, 0 or 1 runs in the calling thread
+    :param backend: 'thread' or 'process', func and items must be
+                    picklable for the process backend
+    :return: list of results
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    if backend == 'thread':
+        executor = ThreadPoolExecutor
+    elif backend == 'process':
+        executor = ProcessPoolExecutor
+    else:
+        raise ValueError('Unknown parallel backend: {}'.format(backend))
+    with executor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def preprocess_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--preprocess-workers',
+        help='analyze pairs in parallel with N workers (default: 0, no parallelism)',
+        dest='preprocess_workers',
+        default=0,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--preprocess-backend',
+        help='run the preprocess workers as threads or processes (default: thread)',
+        choices=['thread', 'process'],
+        default='thread',
+        dest='preprocess_backend',
+    )
+
+
+def candle_store_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--candle-store',
+        help='load the backtest data from the binary candle store, '
+             'json files are converted on first use',
+        action='store_true',
+        dest='candle_store',
+    )
+    parser.add_argument(
+        '--resample',
+        help='derive the candles of --ticker-interval from the 1 minute data, '
+             'cached in the candle store',
+        action='store_true',
+        dest='resample',
+    )
+
+
 def parse_args_common(args: List[str], descr: str):
     parser = argparse.ArgumentParser(
         description=descr
@@ -188,7 +229,7 @@ def parse_args(args: List[str], description = None):
 
 def build_subcommands(parser: argparse.ArgumentParser) -> None:
     """ Builds and attaches all subcommands """
-    from freqtrade.optimize import backtesting, hyperopt
+    from freqtrade.optimize import backtesting, hyperopt, train_lincomb, walkforward
 
     subparsers = parser.add_subparsers(dest='subparser')
 
@@ -200,6 +241,16 @@ def build_subcommands(parser: argparse.ArgumentParser) -> None:
     hyperopt_cmd.set_defaults(func=hyperopt.start)
     hyperopt_options(hyperopt_cmd)
 
+    walkforward_cmd = subparsers.add_parser(
+        'walk-forward', help='hyperopt rolling train windows, backtest the following test windows')
+    walkforward_cmd.set_defaults(func=walkforward.start)
+    walkforward_options(walkforward_cmd)
+
+    train_cmd = subparsers.add_parser('train-lincomb',
+                                      help='train the weights of the lin indicator')
+    train_cmd.set_defaults(func=train_lincomb.start)
+    train_lincomb_options(train_cmd)
+
 
 def backtesting_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
@@ -218,10 +269,37 @@ def backtesting_options(parser: argparse.ArgumentParser) -> None:
     )
     parser.add_argument(
         '--realistic-simulation',
-        help='uses max_open_trades from strategy to simulate real world limitations',
+        help='walk all pairs on one clock, with at most max_open_trades '
+             'of the strategy open and a shared wallet',
         action='store_true',
         dest='realistic_simulation',
     )
+    parser.add_argument(
+        '--capital',
+        help='starting wallet of --realistic-simulation, in stake currency '
+             '(default: stake_amount * max_open_trades)',
+        type=float,
+        default=None,
+        dest='capital',
+        metavar='FLOAT',
+    )
+    parser.add_argument(
+        '--fill-model',
+        help='simulate the fills of the orders instead of filling at the close, '
+             'stages spread[:R], limit[:N], volume[:P], e.g. spread:0.5,limit:3,volume:0.1 '
+             '(see freqtrade/fill.py)',
+        type=str,
+        default=None,
+        dest='fill_model',
+        metavar='SPEC',
+    )
+    parser.add_argument(
+        '--engine',
+        help='backtest engine, loop or vector (default: loop)',
+        choices=['loop', 'vector'],
+        default='loop',
+        dest='engine',
+    )
     parser.add_argument(
         '--export',
         help='--export=trades,result',
@@ -229,6 +307,36 @@ def backtesting_options(parser: argparse.ArgumentParser) -> None:
         default=None,
         dest='export',
     )
+    parser.add_argument(
+        '--export-format',
+        help='format of the result export, json or ndjson (one line per pair) '
+             '(default: json)',
+        choices=['json', 'ndjson'],
+        default='json',
+        dest='export_format',
+    )
+    parser.add_argument(
+        '--report',
+        help='report of the analyzed data: none, summary, head (first and last '
+             '--report-rows rows) or full (all rows to --report-file) (default: summary)',
+        choices=['none', 'summary', 'head', 'full'],
+        default='summary',
+        dest='report',
+    )
+    parser.add_argument(
+        '--report-rows',
+        help='rows at each end of each pair for --report=head (default: 5)',
+        default=5,
+        type=int,
+        dest='report_rows',
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--report-file',
+        help='csv file for --report=full (default: backtest-data.csv)',
+        default='backtest-data.csv',
+        dest='report_file',
+    )
     parser.add_argument(
         '--timeperiod',
         help='Use the last N ticks of data.',
@@ -236,6 +344,49 @@ def backtesting_options(parser: argparse.ArgumentParser) -> None:
         type=int,
         dest='timeperiod',
     )
+    preprocess_options(parser)
+    candle_store_options(parser)
+
+def train_lincomb_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-i', '--ticker-interval',
+        help='specify ticker interval in minutes (default: 5)',
+        dest='ticker_interval',
+        default=5,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--timeperiod',
+        help='Use the last N ticks of data.',
+        default=None,
+        type=int,
+        dest='timeperiod',
+    )
+    parser.add_argument(
+        '--horizon',
+        help='fit the forward return this many candles ahead (default: 1)',
+        default=1,
+        type=int,
+        dest='horizon',
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--ridge',
+        help='L2 regularization of the weights (default: 0)',
+        default=0.0,
+        type=float,
+        dest='ridge',
+        metavar='FLOAT',
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='weights file (default: w.npy, read by the lin indicator)',
+        default='w.npy',
+        dest='output',
+    )
+    candle_store_options(parser)
+
 
 def hyperopt_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
@@ -254,12 +405,66 @@ def hyperopt_options(parser: argparse.ArgumentParser) -> None:
         type=int,
         metavar='INT',
     )
+    parser.add_argument(
+        '--engine',
+        help='backtest engine, loop or vector (default: loop)',
+        choices=['loop', 'vector'],
+        default='loop',
+        dest='engine',
+    )
+    parser.add_argument(
+        '--indicator-cache',
+        help='memory bound in MB for indicators reused across epochs, 0 disables (default: 512)',
+        dest='indicator_cache_mb',
+        default=512,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        help='parallelize evaluations with N local processes (default: 1)',
+        dest='workers',
+        default=1,
+        type=int,
+        metavar='INT',
+    )
     parser.add_argument(
         '--use-mongodb',
         help='parallelize evaluations with mongodb (requires mongod in PATH)',
         dest='mongodb',
         action='store_true',
     )
+    parser.add_argument(
+        '--random-state',
+        help='seed of the search, for reproducible runs',
+        dest='random_state',
+        default=None,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--trials-db',
+        help='checkpoint the evaluated epochs to this sqlite file, and serve '
+             'repeated ones from it',
+        dest='trials_db',
+        default=None,
+        metavar='PATH',
+    )
+    parser.add_argument(
+        '--resume',
+        help='continue from the epochs in --trials-db (default: hyperopt_trials.sqlite) '
+             'of the same strategy, space and data, -e is the total',
+        dest='resume',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--prune',
+        help='backtest the pairs one by one and stop epochs early that are '
+             'estimated not to beat the best loss so far. The estimate can be '
+             'wrong, the search can take another path than without --prune',
+        dest='prune',
+        action='store_true',
+    )
     parser.add_argument(
         '--timeperiod',
         help='Use the last N ticks of data.',
@@ -267,6 +472,75 @@ def hyperopt_options(parser: argparse.ArgumentParser) -> None:
         type=int,
         dest='timeperiod',
     )
+    preprocess_options(parser)
+    candle_store_options(parser)
+
+
+def walkforward_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-e', '--epochs',
+        help='number of epochs per train window (default: 100)',
+        dest='epochs',
+        default=100,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '-tt', '--target_trades',
+        help='number of trades per train window (default: 100)',
+        dest='target_trades',
+        default=100,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--train',
+        help='candles of a train window (default: 2000)',
+        dest='train',
+        default=2000,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--test',
+        help='candles of a test window (default: 500)',
+        dest='test',
+        default=500,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--step',
+        help='candles between the windows (default: --test)',
+        dest='step',
+        default=None,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '--engine',
+        help='backtest engine, loop or vector (default: loop)',
+        choices=['loop', 'vector'],
+        default='loop',
+        dest='engine',
+    )
+    parser.add_argument(
+        '--indicator-cache',
+        help='memory bound in MB for indicators reused across epochs, 0 disables (default: 512)',
+        dest='indicator_cache_mb',
+        default=512,
+        type=int,
+        metavar='INT',
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        help='run the windows in N local processes (default: 1)',
+        dest='workers',
+        default=1,
+        type=int,
+        metavar='INT',
+    )
+    candle_store_options(parser)
 
 
 # Required json-schema for user specified config
@@ -278,7 +552,8 @@ CONF_SCHEMA = {
         'experimental': {
             'type': 'object',
             'properties': {
-                'use_sell_signal': {'type': 'boolean'}
+                'use_sell_signal': {'type': 'boolean'},
+                'incremental_analysis': {'type': 'boolean'}
             }
         },
         'telegram': {
@@ -294,7 +569,10 @@ CONF_SCHEMA = {
         'internals': {
             'type': 'object',
             'properties': {
-                'process_throttle_secs': {'type': 'number'}
+                'process_throttle_secs': {'type': 'number'},
+                'signal_workers': {'type': 'integer', 'minimum': 0},
+                'perf_log_secs': {'type': 'number'},
+                'max_unflushed_cycles': {'type': 'integer', 'minimum': 0}
             }
         }
     },
@@ -305,6 +583,7 @@ CONF_SCHEMA = {
                 'name': {'type': 'string'},
                 'key': {'type': 'string'},
                 'secret': {'type': 'string'},
+                'use_async': {'type': 'boolean'},
                 'pair_whitelist': {
                     'type': 'array',
                     'items': {
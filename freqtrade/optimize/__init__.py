@@ -2,12 +2,15 @@
 
 import json
 import os
+from functools import partial
 from typing import Optional, List, Dict
 
 from pandas import DataFrame
 
 from freqtrade.analyze import populate_indicators, parse_ticker_dataframe
 from freqtrade.strategy import Strategy
+from freqtrade.misc import parallel_map
+from freqtrade import candlestore
 
 
 def trim_tickerlist(dl, num):
@@ -17,30 +20,44 @@ def trim_tickerlist(dl, num):
     return new
 
 
-def load_data(datadir: str, ticker_interval: int = 5, pairs: Optional[List[str]] = None) -> Dict[str, List]:
+def load_data(datadir: str, ticker_interval: int = 5, pairs: Optional[List[str]] = None,
+              store: bool = False, resample: bool = False) -> Dict:
     """
     Loads ticker history data for the given parameters
     :param ticker_interval: ticker interval in minutes
     :param pairs: list of pairs
+    :param store: load parsed DataFrames from the binary candle store
+                  instead of ticker lists from json, see candlestore.py
+    :param resample: derive the candles of ticker_interval from the
+                     1 minute data, see candlestore.load_resampled()
     :return: dict
     """
-    path = os.path.abspath(".") #os.path.dirname(__file__))
     result = {}
     for pair in pairs:
-        print('loading pair', pair)
-        with open('{abspath}/{datadir}/{pair}-{ticker_interval}.json'.format(
-            abspath=path,
-            datadir=datadir,
-            pair=pair,
-            ticker_interval=ticker_interval,
-        )) as tickerdata:
-            result[pair] = json.load(tickerdata)
+        if resample and ticker_interval != 1:
+            result[pair] = candlestore.load_resampled(datadir, ticker_interval, pair)
+        elif store:
+            result[pair] = candlestore.load(datadir, ticker_interval, [pair])[pair]
+        else:
+            print('loading pair', pair)
+            with open(candlestore.json_path(datadir, pair, ticker_interval)) as tickerdata:
+                result[pair] = json.load(tickerdata)
     return result
 
 
-def preprocess(strategy: Strategy, tickerdata: Dict[str, List]) -> Dict[str, DataFrame]:
-    """Creates a dataframe and populates indicators for given ticker data"""
-    processed = {}
-    for pair, pair_data in tickerdata.items():
-        processed[pair] = populate_indicators(strategy, parse_ticker_dataframe(pair_data))
-    return processed
+def _preprocess_pair(strategy: Strategy, pair_data: List) -> DataFrame:
+    return populate_indicators(strategy, parse_ticker_dataframe(pair_data))
+
+
+def preprocess(strategy: Strategy, tickerdata: Dict[str, List],
+               workers: int = 0, backend: str = 'thread') -> Dict[str, DataFrame]:
+    """
+    Creates a dataframe and populates indicators for given ticker data
+    :param workers: number of pairs to process in parallel, see misc.parallel_map()
+    :param backend: 'thread' or 'process'
+    """
+    pairs = list(tickerdata.keys())
+    frames = parallel_map(partial(_preprocess_pair, strategy),
+                          [tickerdata[pair] for pair in pairs],
+                          workers, backend)
+    return dict(zip(pairs, frames))
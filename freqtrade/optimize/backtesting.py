@@ -13,12 +13,15 @@ from tabulate import tabulate
 from freqtrade import exchange
 from freqtrade.exchange import Bittrex
 from freqtrade.trade import min_roi_reached
-from freqtrade.misc import printdf
+from freqtrade.report import write_report
 from freqtrade.optimize import load_data, preprocess
-from freqtrade.persistence import Trade
+from freqtrade.optimize.portfolio import backtest_portfolio
+from freqtrade.optimize.vector import backtest_vector, supports_strategy
+from freqtrade.simtrade import SimTrade
 from freqtrade.strategy import Strategy
 from freqtrade.trade import calc_profit
-from freqtrade.dataframe import file_write_dataframe_json
+from freqtrade.dataframe import file_write_dataframe_json, file_write_dataframe_ndjson
+from freqtrade.fill import parse_fill_model, simulate
 import freqtrade.misc as misc
 from freqtrade import optimize
 
@@ -32,21 +35,29 @@ def zero_nan(num):
         return num
 
 def backtest_export_json(args, config, prepdata, results):
-    tickint = str(args.ticker_interval)
-    h = open('backtest-result.json', 'w')
-    h.write('{"ticker_interval": %s,\n' % tickint)
-    h.write('"pairs":{\n')
-    i = 0
-    for pair, pair_data in prepdata.items():
-        if i > 0:
-            h.write(',')
-        i += 1
-        h.write('"%s":' % pair)
-        file_write_dataframe_json(pair_data, h)
-    h.write('},\n"results":\n')
-    h.write(results.to_json())
-    h.write('}\n')
-    h.close()
+    """
+    Exports the analyzed dataframes and results, to backtest-result.json
+    or with --export-format=ndjson one line per pair to backtest-result.ndjson.
+    Pairs are streamed to the file one at a time.
+    Read it back with dataframe.load_backtest_export()
+    """
+    ndjson = getattr(args, 'export_format', 'json') == 'ndjson'
+    filename = 'backtest-result.ndjson' if ndjson else 'backtest-result.json'
+    with open(filename, 'w') as h:
+        if ndjson:
+            h.write('{"ticker_interval": %d}\n' % args.ticker_interval)
+            for pair, pair_data in prepdata.items():
+                file_write_dataframe_ndjson(pair, pair_data, h)
+            h.write('{"results": %s}\n' % results.to_json())
+            return
+        h.write('{"ticker_interval": %d,\n' % args.ticker_interval)
+        h.write('"pairs":{\n')
+        for i, (pair, pair_data) in enumerate(prepdata.items()):
+            h.write('%s"%s":' % (',' if i else '', pair))
+            file_write_dataframe_json(pair_data, h)
+        h.write('},\n"results":\n')
+        h.write(results.to_json())
+        h.write('}\n')
 
 def get_timeframe(data: Dict[str, Dict]) -> Tuple[arrow.Arrow, arrow.Arrow]:
     """
@@ -56,6 +67,8 @@ def get_timeframe(data: Dict[str, Dict]) -> Tuple[arrow.Arrow, arrow.Arrow]:
     """
     min_date, max_date = None, None
     for values in data.values():
+        if isinstance(values, DataFrame): # from the candlestore
+            values = [{'T': values['date'].min()}, {'T': values['date'].max()}]
         sorted_values = sorted(values, key=lambda d: arrow.get(d['T']))
         if not min_date or sorted_values[0]['T'] < min_date:
             min_date = sorted_values[0]['T']
@@ -135,8 +148,28 @@ def backtest_report_cost_average(prepdata):
 def backtest(args) -> DataFrame:
     strategy = args['strategy']
     processed = args['processed']
-    realistic = args.get('realistic', True)
+    realistic = args.get('realistic', False)
     record = args.get('record', False)
+    fill_model = args.get('fill_model')
+    if isinstance(fill_model, str):
+        fill_model = parse_fill_model(fill_model)
+        args = dict(args, fill_model=fill_model)
+
+    if realistic:
+        if args.get('engine') == 'vector':
+            logger.warning('the vector engine runs each pair on its own, '
+                           'using the portfolio engine for --realistic-simulation')
+        return backtest_portfolio(args)
+
+    if args.get('engine') == 'vector':
+        if fill_model:
+            logger.warning('the vector engine fills at the close, '
+                           'using the loop engine for --fill-model')
+        elif supports_strategy(strategy):
+            return backtest_vector(args)
+        else:
+            logger.warning('strategy %s overrides the per-frame exit logic, '
+                           'using the loop engine', strategy.name())
 
     records = []
     trades = []
@@ -145,35 +178,42 @@ def backtest(args) -> DataFrame:
         pair_data['buy'], pair_data['sell'] = 0, 0
         ticker = strategy.populate_sell_trend(strategy.populate_buy_trend(pair_data))
         df = ticker
+        if fill_model:
+            simulate(strategy, fill_model, df)
         # for each buy point
         lock_pair_until = None
-        trade = Trade(open_rate=0,
-                      open_date='',
-                      amount = strategy.stake_amount(),
-                      fee = strategy.fee() * 2
-                     )
+        # one record per pair, reused for each trade
+        trade = SimTrade(pair=pair,
+                         amount=strategy.stake_amount(),
+                         fee=strategy.fee() * 2)
         tr = None
-        # FIX: reintroduce max_open_trades count and realistic flag
-        # strategy.max_open_trades
-        for row in df.itertuples():
-            if row.buy == 1 and tr == None:
-                tr = (row.date, row.close, row.Index)
-                trade.stat_max_rate = row.close
-                trade.stat_min_rate = row.close
-                trade.stat_stoploss_glide_rate = row.close
-                trade.open_rate = row.close
-                trade.open_date = row.date
-                trade.amount = strategy.stake_amount(), # FIX: adjust amount towards buy_limit, just as we do in exchange trading
-                trade.fee = strategy.fee() * 2
+        # a buy waiting for its fill: (candle it fills on, rate, part filled)
+        pending = None
+        # no max_open_trades here, see optimize/portfolio.py
+        for pos, row in enumerate(df.itertuples()):
+            if fill_model:
+                buy_rate, filled, delay, rate = \
+                    row.buy_rate, row.buy_filled, row.buy_delay, row.sell_rate
+            else:
+                buy_rate, filled, delay, rate = row.close, 1.0, 0, row.close
+            if row.buy == 1 and tr == None and pending == None and filled > 0:
+                pending = (pos + delay, buy_rate, filled)
+            if pending and pending[0] == pos:
+                _, open_rate, open_filled = pending
+                pending = None
+                tr = (row.date, open_rate, row.Index, open_filled)
+                trade.open(open_rate, row.date, strategy.fee() * 2,
+                           strategy.stake_amount() * open_filled)
                 #logger.info('*** BUY %s date=%s, close=%s, amount=%s, fee=%s' %
                 #             (pair, row.date, row.close, trade.amount, trade.fee))
             if tr: # currently holding a trade
-                strategy.step_frame(trade, row.close, row.date)
-                trade.update_stats(row.close)
+                strategy.step_frame(trade, rate, row.date)
+                trade.update_stats(rate)
                 #logger.info('update trade, buy_rate=%f, now_rate=%f, max=%f', trade.open_rate, row.close, trade.stat_max_rate)
-                if min_roi_reached(strategy, trade, row.close, row.date) or row.sell == 1:
-                    (o_date, o_close, o_index) = tr
-                    current_profit = calc_profit(trade, row.close)
+                if min_roi_reached(strategy, trade, rate, row.date) or row.sell == 1:
+                    (o_date, o_close, o_index, o_filled) = tr
+                    # relative to the stake, a partial fill earns part of the profit
+                    current_profit = calc_profit(trade, rate) * o_filled
                     trades.append((pair, o_date, row.date, current_profit, row.Index - o_index))
                     reason = 'min_roi/stoploss'
                     if row.sell == 1:
@@ -238,7 +278,8 @@ def start(args):
             data[pair] = exchange.get_ticker_history(pair, args.ticker_interval)
     else:
         logger.info('Using local backtesting data, pairs: %s' % pairs)
-        data = load_data(args.datadir, args.ticker_interval, pairs)
+        data = load_data(args.datadir, args.ticker_interval, pairs, args.candle_store,
+                         args.resample)
 
     amount   = strategy.stake_amount()
     currency = strategy.stake_currency()
@@ -249,11 +290,6 @@ def start(args):
     min_date, max_date = get_timeframe(data)
     logger.info('Measuring data from %s up to %s ...', min_date.isoformat(), max_date.isoformat())
 
-    # --realistic-simulation shouldn't effect concurrently
-    # open trades, because that is part of a strategy
-    # (back-off strategy, etc)
-    # but we should simulate slippage
-
     # Monkey patch config
     from freqtrade import main
     main._CONF = config # FIX: remove this
@@ -266,14 +302,17 @@ def start(args):
     timeperiod=args.timeperiod
     if timeperiod:
         data = optimize.trim_tickerlist(data, timeperiod)
-    prepdata = preprocess(strategy, data)
+    prepdata = preprocess(strategy, data, args.preprocess_workers, args.preprocess_backend)
     results = backtest({'strategy': strategy,
                         'processed': prepdata,
                         'realistic': args.realistic_simulation,
-                        'record': record
+                        'capital': args.capital,
+                        'fill_model': args.fill_model,
+                        'record': record,
+                        'engine': args.engine
                        })
 
-    printdf(prepdata)
+    write_report(prepdata, args.report, args.report_rows, args.report_file)
     logger.info(
         '\n====================== BACKTESTING REPORT ======================================\n%s',
         generate_text_table(data, results, args.ticker_interval)
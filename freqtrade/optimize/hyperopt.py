@@ -5,17 +5,23 @@ import json
 import logging
 import sys
 import math
+import time
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 from math import exp
 from operator import itemgetter
+from typing import Dict, List, Optional
 
 from hyperopt import fmin, tpe, hp, Trials, STATUS_OK, space_eval, STATUS_FAIL
+from hyperopt import base
 from hyperopt.mongoexp import MongoTrials
-from pandas import DataFrame
+import numpy as np
+from pandas import DataFrame, concat
 
-from freqtrade import exchange, optimize
+from freqtrade import exchange, optimize, indicator_cache
 from freqtrade.exchange import Bittrex
 from freqtrade.optimize.backtesting import backtest
+from freqtrade.optimize.trialstore import DEFAULT_PATH, StoredTrials, TrialStore, trials_key
 from freqtrade.vendor.qtpylib.indicators import crossed_above
 from freqtrade.strategy import Strategy
 
@@ -52,43 +58,89 @@ def log_results(results):
         print('.', end='')
         sys.stdout.flush()
 
-def optimizer(params, args):
+def trade_count_loss(trade_count: int, target_trades: int) -> float:
+    # expresses a loss as a distance from target number of trades, to resulting number of trades
+    # The exp returns a parabolic that is 1 if trade_count - target_trades = 0
+    # And less than 1 down to zero if trade_count differs from target_trades (0.1 = 500 diff)
+    return 1 - 0.35 * exp(-(trade_count - target_trades) ** 2 / 10 ** 5.2)
+
+
+def total_profit_loss(total_profit: float) -> float:
+    # FIX: a very large profit is capped by the max, why not take the log instead?
+    return max(0, 1 - total_profit / 10000)  # max profit 10000
+
+
+def score(results: DataFrame, target_trades: int) -> dict:
+    """
+    Loss of the trades of a backtest, lower is better
+    :return: dict with loss, status and the parts of the loss
+    """
     status = STATUS_OK
+    total_profit = results.profit.sum() * 1000
+    if math.isnan(total_profit):
+        status = STATUS_FAIL
+        total_profit = 0
+    trade_count = len(results.index)
+    trade_loss = trade_count_loss(trade_count, target_trades)
+    profit_loss = total_profit_loss(total_profit)
+    #loss = -total_profit
+    return {'loss': trade_loss + profit_loss,
+            'status': status,
+            'total_profit': total_profit,
+            'trade_count': trade_count,
+            'trade_loss': trade_loss,
+            'profit_loss': profit_loss}
+
+
+def optimizer(params, args):
     strategy = args['strategy']
 
+    store = args.get('store')
+    if store:
+        stored = store.lookup(params)
+        if stored:
+            # evaluated before, in this or an earlier run
+            args['current_tries'] += 1
+            if args.get('pruner') and stored['status'] == STATUS_OK:
+                args['pruner'].finished(stored['loss'])
+            return stored
+
     from freqtrade.optimize import backtesting
     strategy.set_hyper_params(params)
 
-    # This is very costly, to for each iteration recalculate
-    # the indicators. Caching might be possible, and
-    # also check if the params hasn't change, dont recalc.
+    # Recalculating the indicators for each iteration is very costly,
+    # analyze.prepare_indicators reuses the ones found in the
+    # indicator_cache, only the buy/sell trends are always recalculated
     dfs = args['dfs'] # Get the dataframes
     timeperiod = args['timeperiod']
     if timeperiod:
         dfs = optimize.trim_tickerlist(dfs, timeperiod)
-    prepdata = optimize.preprocess(strategy, dfs)
-    results = backtest({'strategy': strategy,
-                        'processed': prepdata,
-                       })
+    pruner = args.get('pruner')
+    if pruner:
+        results, pruned = pruner.evaluate(strategy, dfs, args.get('engine'))
+        if pruned:
+            args['current_tries'] += 1
+            return pruned
+    else:
+        prepdata = optimize.preprocess(strategy, dfs,
+                                       args.get('preprocess_workers', 0),
+                                       args.get('preprocess_backend', 'thread'))
+        results = backtest({'strategy': strategy,
+                            'processed': prepdata,
+                            'engine': args.get('engine'),
+                           })
 
     result = format_results(results)
 
-    total_profit = results.profit.sum() * 1000
-    if math.isnan(total_profit):
-        status = STATUS_FAIL
-        total_profit = 0
-    trade_count = len(results.index)
-    target_trades = args['target_trades']
-    # expresses a loss as a distance from target number of trades, to resulting number of trades
-    # The exp returns a parabolic that is 1 if trade_count - target_trades = 0
-    # And less than 1 down to zero if trade_count differs from target_trades (0.1 = 500 diff)
-    trade_loss = 1 - 0.35 * exp(-(trade_count - target_trades) ** 2 / 10 ** 5.2)
-
-    # FIX: a very large profit is capped by the max, why not take the log instead?
-    profit_loss = max(0, 1 - total_profit / 10000)  # max profit 10000
-    loss = trade_loss + profit_loss
-
-    #loss = -total_profit
+    scored = score(results, args['target_trades'])
+    if pruner and scored['status'] == STATUS_OK:
+        pruner.finished(scored['loss'])
+    status = scored['status']
+    loss = scored['loss']
+    total_profit = scored['total_profit']
+    trade_count = scored['trade_count']
+    trade_loss = scored['trade_loss']
+    profit_loss = scored['profit_loss']
 
     print(result, '#', total_profit, '#', trade_count, '#', trade_loss, '#', profit_loss)
 
@@ -113,7 +165,8 @@ def optimizer(params, args):
     return {
         'loss': loss,
         'status': status,
-        'result': result
+        'result': result,
+        'candles': sum(len(df) for df in dfs.values())
     }
 
 
@@ -126,6 +179,277 @@ def format_results(results: DataFrame):
                 results.duration.mean() * 5,
             )
 
+class Pruner():
+    """
+    Staged evaluation of the epochs, for --prune
+
+    The pairs are backtested one at a time, the largest first. After each
+    pair the loss of the epoch is bounded from below, assuming every pair
+    still to go does as well as it did in any epoch so far: its highest
+    profit, and the number of trades in its range that comes closest to
+    target_trades. If even that can't beat the best loss, the epoch is
+    stopped with STATUS_FAIL, and the estimate as its loss.
+    The estimate is not a true bound, a pair could do better than it
+    ever did, see recheck_pruned(). The first `warmup` epochs are not
+    pruned, to learn the pairs.
+    """
+
+    def __init__(self, target_trades: int, warmup: int = 10) -> None:
+        self.target_trades = target_trades
+        self.warmup = warmup
+        self.best = math.inf
+        self.finished_epochs = 0
+        self.pruned_epochs = 0
+        # pair -> [highest profit, fewest trades, most trades]
+        self.pairs: Dict[str, List] = {}
+
+    def finished(self, loss: float) -> None:
+        """An epoch has been evaluated on all pairs"""
+        self.finished_epochs += 1
+        self.best = min(self.best, loss)
+
+    def _learn(self, pair: str, results: DataFrame) -> None:
+        profit = results.profit.sum()
+        count = len(results.index)
+        known = self.pairs.get(pair)
+        if known is None:
+            self.pairs[pair] = [profit, count, count]
+        else:
+            known[0] = max(known[0], profit)
+            known[1] = min(known[1], count)
+            known[2] = max(known[2], count)
+
+    def bound(self, profit: float, count: int, pairs: List[str]) -> float:
+        """
+        Estimated lowest loss the epoch can reach, after profit and
+        count trades, with pairs to go
+        """
+        if any(pair not in self.pairs for pair in pairs):
+            return -math.inf
+        profit += sum(self.pairs[pair][0] for pair in pairs)
+        fewest = count + sum(self.pairs[pair][1] for pair in pairs)
+        most = count + sum(self.pairs[pair][2] for pair in pairs)
+        closest = min(max(self.target_trades, fewest), most)
+        return trade_count_loss(closest, self.target_trades) + total_profit_loss(profit * 1000)
+
+    def evaluate(self, strategy: Strategy, dfs: Dict, engine: Optional[str]):
+        """
+        Backtests the pairs of dfs in stages
+        :return: trades of all pairs and None, or None and the
+                 result of the pruned epoch for hyperopt
+        """
+        order = sorted(dfs, key=lambda pair: len(dfs[pair]), reverse=True)
+        parts = []
+        profit = 0.0
+        count = 0
+        candles = 0
+        for i, pair in enumerate(order):
+            prepdata = optimize.preprocess(strategy, {pair: dfs[pair]})
+            results = backtest({'strategy': strategy,
+                                'processed': prepdata,
+                                'engine': engine,
+                               })
+            self._learn(pair, results)
+            parts.append(results)
+            profit += results.profit.sum()
+            count += len(results.index)
+            candles += len(dfs[pair])
+            if i + 1 == len(order) or self.finished_epochs < self.warmup:
+                continue
+            bound = self.bound(profit, count, order[i + 1:])
+            if bound > self.best:
+                self.pruned_epochs += 1
+                logger.info('pruned epoch after %d of %d pairs, estimated loss %.4f, best %.4f',
+                            i + 1, len(order), bound, self.best)
+                return None, {'loss': bound,
+                              'status': STATUS_FAIL,
+                              'result': 'pruned after {} of {} pairs, {} trades, '
+                                        'total profit {:.3f}'.format(i + 1, len(order),
+                                                                     count, profit),
+                              'pruned': True,
+                              'candles': candles}
+        return concat(parts, ignore_index=True), None
+
+
+def log_pruning(trials_results: List[dict]) -> None:
+    """
+    How many epochs --prune stopped early, and the candles it saved
+    """
+    total = max(r.get('candles', 0) for r in trials_results)
+    pruned = [r for r in trials_results if r.get('pruned')]
+    done = sum(r.get('candles', total) for r in trials_results)
+    logger.info('pruned %d of %d epochs, backtested %d of %d candles (%.0f%% saved)',
+                len(pruned), len(trials_results), done, total * len(trials_results),
+                100 - 100.0 * done / max(total * len(trials_results), 1))
+
+
+# pruned epochs with an estimated loss this close to the best loss are
+# evaluated in full at the end, see recheck_pruned(). On the testdata
+# the full loss of a pruned epoch was never below its estimate, and at
+# least 0.008 above the best
+PRUNE_MARGIN = 0.005
+
+
+def recheck_pruned(trials: Trials, space, evaluate, margin: float = PRUNE_MARGIN,
+                   store: Optional[TrialStore] = None) -> int:
+    """
+    The estimate of the Pruner can be wrong, a pruned epoch could have
+    won. The pruned epochs estimated within margin of the best loss are
+    evaluated in full, their results replace the pruned ones in trials
+    :param evaluate: params -> result of optimizer(), without pruning
+    :return: number of epochs evaluated again
+    """
+    ok = [r['loss'] for r in trials.results if r['status'] == STATUS_OK]
+    pruned = [trial for trial in trials.trials if trial['result'].get('pruned')]
+    if not ok or not pruned:
+        return 0
+    best = min(ok)
+    again = [trial for trial in pruned if trial['result']['loss'] <= best + margin]
+    logger.info('best loss %.4f, smallest estimated loss of the pruned epochs %.4f, '
+                'evaluating %d of them in full',
+                best, min(trial['result']['loss'] for trial in pruned), len(again))
+    for trial in again:
+        params = space_eval(space, base.spec_from_misc(trial['misc']))
+        result = evaluate(params)
+        trial['result'] = result
+        if store:
+            store.replace(params, result)
+        if result['status'] == STATUS_OK and result['loss'] < best:
+            logger.info('pruned epoch %d is better after all, loss %.4f', trial['tid'],
+                        result['loss'])
+    trials.refresh()
+    return len(again)
+
+
+# Arguments to optimizer() in a worker process of the --workers mode,
+# set up once per process by _init_worker()
+_WORKER_ARGS = None
+
+
+def optimizer_args(options: dict, strategy: Strategy) -> dict:
+    """
+    Loads the ticker data and returns the args used by optimizer()
+    :param options: plain dict with epochs, target_trades, datadir, candle_store, timeperiod,
+                    engine, preprocess_workers, preprocess_backend and resample
+    """
+    # load raw tick data from disk
+    dfs = optimize.load_data(options['datadir'],
+                             strategy.tick_interval(),
+                             strategy.backtest_pairs(),
+                             options['candle_store'],
+                             options.get('resample', False))
+    pruner = Pruner(options['target_trades']) if options.get('prune') else None
+    return {'epochs': options['epochs'],
+            'target_trades': options['target_trades'],
+            'current_tries': 0,
+            'strategy': strategy,
+            'dfs': dfs,
+            'timeperiod': options['timeperiod'],
+            'engine': options['engine'],
+            'preprocess_workers': options['preprocess_workers'],
+            'preprocess_backend': options['preprocess_backend'],
+            'pruner': pruner
+           }
+
+
+def trials_store(options: dict, strategy: Strategy, path: str) -> TrialStore:
+    """
+    The store of the trials of strategy, on the candles of options,
+    see trialstore.py
+    """
+    dfs = optimize.load_data(options['datadir'],
+                             strategy.tick_interval(),
+                             strategy.backtest_pairs(),
+                             options['candle_store'],
+                             options.get('resample', False))
+    if options['timeperiod']:
+        dfs = optimize.trim_tickerlist(dfs, options['timeperiod'])
+    key = trials_key(strategy, strategy.strategy_space(), dfs,
+                     {'target_trades': options['target_trades'],
+                      'engine': options['engine']})
+    return TrialStore(path, key)
+
+
+def _init_worker(options: dict) -> None:
+    """
+    Initializer of the worker processes. Doesn't rely on any state
+    of the parent, so it works the same for fork and spawn. Each
+    worker loads the strategy and ticker data once, and keeps its
+    own indicator cache.
+    """
+    global _WORKER_ARGS
+    logging.basicConfig(
+        level=options['loglevel'],
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+    main._CONF = {}
+    strategy = Strategy().load(options['strategy'])
+    indicator_cache.init(options['indicator_cache_mb'] * 2**20)
+    _WORKER_ARGS = optimizer_args(options, strategy)
+
+
+def _worker_optimizer(params, best_loss=None):
+    # with --prune, the best loss of all workers so far
+    pruner = _WORKER_ARGS.get('pruner')
+    if pruner and best_loss is not None:
+        pruner.best = min(pruner.best, best_loss)
+    return optimizer(params, _WORKER_ARGS)
+
+
+def run_parallel(space, trials: Trials, epochs: int, workers: int, options: dict,
+                 store: Optional[TrialStore] = None, seed: Optional[int] = None) -> dict:
+    """
+    Like fmin(), but evaluates the epochs in a pool of worker processes.
+    TPE is asked for one batch of points (one per worker) at a time,
+    the points of a batch see each other as pending trials.
+    Points found in store are not sent to the workers.
+    :return: best point found, in the same format as fmin() returns
+    """
+    domain = base.Domain(lambda params: None, space)
+    rstate = np.random.RandomState(seed)
+    done = len(trials.trials)
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(options,)) as pool:
+        while done < epochs:
+            suggested = []
+            for _ in range(min(workers, epochs - done)):
+                new_ids = trials.new_trial_ids(1)
+                trials.refresh()
+                docs = tpe.suggest(new_ids, domain, trials, rstate.randint(2**31 - 1))
+                trials.insert_trial_docs(docs)
+                suggested.extend(docs)
+                trials.refresh()
+            # insert_trial_docs() copies the docs, update the ones in trials
+            tids = {doc['tid'] for doc in suggested}
+            batch = [doc for doc in trials.trials if doc['tid'] in tids]
+            ok = [loss for loss, status in zip(trials.losses(), trials.statuses())
+                  if status == STATUS_OK and loss is not None]
+            best_loss = min(ok) if ok else None
+            futures = []
+            for doc in batch:
+                params = space_eval(space, base.spec_from_misc(doc['misc']))
+                doc['state'] = base.JOB_STATE_RUNNING
+                stored = store.lookup(params) if store else None
+                futures.append(stored or pool.submit(_worker_optimizer, params, best_loss))
+            for doc, future in zip(batch, futures):
+                if isinstance(future, dict):
+                    doc['result'] = future
+                else:
+                    try:
+                        doc['result'] = future.result()
+                    except Exception as error:
+                        # one failing epoch doesn't stop the others
+                        logger.exception('epoch %d failed', doc['tid'])
+                        doc['result'] = {'loss': math.inf,
+                                         'status': STATUS_FAIL,
+                                         'result': 'failed: {}'.format(error)}
+                doc['state'] = base.JOB_STATE_DONE
+            trials.refresh()
+            done += len(batch)
+    return trials.argmin
+
+
 def start(args):
 
     global SPACE
@@ -135,41 +459,85 @@ def start(args):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     )
 
+    logger.info('loading strategy, file: %s' % args.strategy)
+    strategy = Strategy().load(args.strategy)
+    logger.info('loaded strategy %s' % strategy.name())
+
+    options = {'epochs': args.epochs,
+               'target_trades': args.target_trades,
+               'datadir': args.datadir,
+               'candle_store': args.candle_store,
+               'resample': args.resample,
+               'timeperiod': args.timeperiod,
+               'engine': args.engine,
+               'preprocess_workers': args.preprocess_workers,
+               'preprocess_backend': args.preprocess_backend,
+               'strategy': args.strategy,
+               'indicator_cache_mb': args.indicator_cache_mb,
+               'prune': args.prune,
+               'loglevel': args.loglevel
+              }
+
+    store = None
+    trials_db = args.trials_db or (DEFAULT_PATH if args.resume else None)
     if args.mongodb:
         logger.info('Using mongodb ...')
         logger.info('Start scripts/start-mongodb.sh and start-hyperopt-worker.sh manually!')
 
         db_name = 'freqtrade_hyperopt'
         trials = MongoTrials('mongo://127.0.0.1:1234/{}/jobs'.format(db_name), exp_key='exp1')
+    elif trials_db:
+        store = trials_store(options, strategy, trials_db)
+        trials = StoredTrials(store, strategy.strategy_space(), args.resume)
     else:
         trials = Trials()
-
-    logger.info('loading strategy, file: %s' % args.strategy)
-    strategy = Strategy().load(args.strategy)
-    logger.info('loaded strategy %s' % strategy.name())
-
-    # load raw tick data from disk
-    dfs = optimize.load_data(args.datadir,
-                             strategy.tick_interval(),
-                             strategy.backtest_pairs())
-    # preprocess it by adding INDicators/OSCillators and
-    # also BUY/SELL trigger-vectors
-
-    optargs = {'epochs': args.epochs,
-               'target_trades': args.target_trades,
-               'current_tries': 0,
-               'strategy': strategy,
-               'dfs': dfs,
-               'timeperiod': args.timeperiod
-              }
-    fun = lambda params: optimizer(params, optargs)
-
-    best = fmin(fn=fun, space=strategy.strategy_space(), algo=tpe.suggest, max_evals=args.epochs, trials=trials)
+    # the served epochs of the store count in -e, but aren't in trials
+    served_before = trials.resumed_served if store else 0
+    resumed = len(trials.trials) + served_before if store else 0
+    rstate = np.random.default_rng(args.random_state) if args.random_state is not None else None
+
+    started = time.time()
+    if args.workers > 1 and not args.mongodb:
+        logger.info('Using %d worker processes ...', args.workers)
+        best = run_parallel(strategy.strategy_space(), trials, args.epochs - served_before,
+                            args.workers, options, store, args.random_state)
+    else:
+        indicator_cache.init(args.indicator_cache_mb * 2**20)
+        # preprocess it by adding INDicators/OSCillators and
+        # also BUY/SELL trigger-vectors
+        optargs = optimizer_args(options, strategy)
+        optargs['store'] = store
+        optargs['current_tries'] = resumed
+        fun = lambda params: optimizer(params, optargs)
+
+        best = fmin(fn=fun, space=strategy.strategy_space(), algo=tpe.suggest,
+                    max_evals=args.epochs - served_before, trials=trials, rstate=rstate)
+    minutes = (time.time() - started) / 60
+    # backtested in this run: neither resumed nor served from the store
+    epochs = len(trials.trials) - (resumed - served_before) - (store.served if store else 0)
+    epochs = max(epochs, 0)
+    logger.info('%d epochs in %.1f minutes (%.1f epochs/min)',
+                epochs, minutes, epochs / max(minutes, 1e-6))
+    if store:
+        logger.info('%d epochs served from the trials store %s', store.served, store.path)
+
+    if args.prune and not args.mongodb:
+        log_pruning(trials.results)
+        if args.workers > 1:
+            indicator_cache.init(args.indicator_cache_mb * 2**20)
+            optargs = optimizer_args(options, strategy)
+        full = dict(optargs, pruner=None, store=None)
+        if recheck_pruned(trials, strategy.strategy_space(),
+                          lambda params: optimizer(params, full), store=store):
+            best = trials.argmin
 
     # Improve best parameter logging display
     if best:
         best = space_eval(strategy.strategy_space(), best)
         logger.info('SPACE Best parameters:\n%s', json.dumps(best, indent=4))
 
-    results = sorted(trials.results, key=itemgetter('loss'))
+    # the losses of failed (and pruned) epochs aren't comparable
+    results = sorted([r for r in trials.results if r['status'] == STATUS_OK] or trials.results,
+                     key=itemgetter('loss'))
     logger.info('Best Result:\n%s', results[0]['result'])
+    indicator_cache.log_stats()
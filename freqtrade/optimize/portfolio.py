@@ -0,0 +1,217 @@
+# pragma pylint: disable=missing-docstring
+"""
+Portfolio backtest engine (--realistic-simulation)
+
+backtesting.backtest() runs every pair on its own, as if there was an
+unlimited number of trade slots and unlimited money. Here all pairs
+are walked on one clock, like the bot does live:
+  - at most strategy.max_open_trades() trades are open at a time
+  - the trades share one wallet, a trade takes stake_amount from it
+    and gives back stake_amount * (1 + profit) when it is closed.
+    A buy signal is skipped when the wallet has less than stake_amount
+  - a pair with an open trade is locked, it can not be bought again
+    until the trade is closed
+At each candle time the open trades are handled first (in the order
+of the pairs), then the buy signals, the same order as main._process().
+With a fill model (see fill.py) the trades are bought and sold at its
+rates, a partly filled buy takes that part of the stake. A limit buy
+that fills later takes the slot and stake at the signal, the trade is
+opened and stepped from the candle it fills on.
+
+The clock is a heap of (time, pair) events. A pair holding a trade
+has an event on each of its candles, a pair without a trade only on
+its next buy signal. That is O(candles log pairs) for the candles of
+the open trades, plus the buy signals, the candles in between are
+never visited.
+"""
+import heapq
+import logging
+from typing import List, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from freqtrade.fill import simulate
+from freqtrade.simtrade import SimTrade
+from freqtrade.trade import calc_profit, min_roi_reached
+import freqtrade.misc as misc
+
+logger = logging.getLogger(__name__)
+
+
+class PairCursor():
+    """Signals of a populated pair and the trade it holds"""
+
+    __slots__ = ['pair', 'order', 'close', 'buy_rate', 'buy_filled', 'buy_delay', 'sell_rate',
+                 'dates', 'times', 'index', 'sell', 'entries', 'trade', 'entry', 'filled']
+
+    def __init__(self, pair: str, order: int, df: DataFrame, fills: bool = False) -> None:
+        self.pair = pair
+        self.order = order  # ties at the same time are handled in the order of the pairs
+        self.close = df['close'].values.tolist()
+        if fills:
+            self.buy_rate = df['buy_rate'].values.tolist()
+            self.buy_filled = df['buy_filled'].values.tolist()
+            self.buy_delay = df['buy_delay'].values.tolist()
+            self.sell_rate = df['sell_rate'].values.tolist()
+        else:
+            self.buy_rate = self.sell_rate = self.close
+            self.buy_filled = None
+            self.buy_delay = None
+        self.dates = df['date'].tolist()
+        self.times = df['date'].values.astype('datetime64[ns]').astype(np.int64)
+        self.index = df.index.values
+        self.sell = df['sell'].values == 1
+        self.entries = np.flatnonzero(df['buy'].values == 1)
+        self.trade = SimTrade(pair=pair)
+        self.entry: Optional[int] = None  # candle the open trade was (or will be) filled at
+        self.filled = 1.0  # part of the stake of the open trade
+
+    def fill(self, i: int) -> float:
+        return 1.0 if self.buy_filled is None else self.buy_filled[i]
+
+    def delay(self, i: int) -> int:
+        return 0 if self.buy_delay is None else self.buy_delay[i]
+
+    def next_buy(self, start: int) -> Optional[int]:
+        """First buy signal at or after candle start"""
+        pos = np.searchsorted(self.entries, start)
+        return int(self.entries[pos]) if pos < len(self.entries) else None
+
+
+class Wallet():
+    """Stake currency shared by the trades"""
+
+    def __init__(self, capital: float) -> None:
+        self.capital = capital
+        self.free = capital
+        self.open_trades = 0
+
+    def can_buy(self, stake: float) -> bool:
+        # 0.03 - 0.01 - 0.01 is a bit less than 0.01 in floating point
+        return self.free >= stake * (1 - 1e-9)
+
+    def buy(self, stake: float) -> None:
+        self.free -= stake
+        self.open_trades += 1
+
+    def sell(self, value: float) -> None:
+        self.free += value
+        self.open_trades -= 1
+
+
+def backtest_portfolio(args) -> DataFrame:
+    """
+    Portfolio version of backtesting.backtest(), takes the same args and
+    :param args['capital']: starting wallet, default stake_amount * max_open_trades
+    :return: DataFrame with the same columns as backtesting.backtest(),
+             the trades in the order they were closed
+    """
+    strategy = args['strategy']
+    processed = args['processed']
+    record = args.get('record', False)
+    fill_model = args.get('fill_model')
+
+    stake = strategy.stake_amount()
+    max_open = strategy.max_open_trades()
+    fee = strategy.fee() * 2
+    wallet = Wallet(args.get('capital') or stake * max_open)
+
+    events: List = []
+    cursors: List[PairCursor] = []
+    for pair, pair_data in processed.items():
+        pair_data['buy'], pair_data['sell'] = 0, 0
+        df = strategy.populate_sell_trend(strategy.populate_buy_trend(pair_data))
+        if fill_model:
+            simulate(strategy, fill_model, df)
+        cursor = PairCursor(pair, len(cursors), df, bool(fill_model))
+        cursors.append(cursor)
+        first = cursor.next_buy(0)
+        if first is not None:
+            events.append((cursor.times[first], cursor.order, first))
+    heapq.heapify(events)
+
+    trades = []
+    records = []
+    skipped = 0
+    unfilled = 0
+
+    def close_trade(cursor: PairCursor, i: int) -> None:
+        # relative to the stake, a partial fill earns part of the profit
+        profit = calc_profit(cursor.trade, cursor.sell_rate[i]) * cursor.filled
+        entry = cursor.entry
+        trades.append((cursor.pair, cursor.dates[entry], cursor.dates[i], profit,
+                       int(cursor.index[i] - cursor.index[entry])))
+        if record:
+            records.append((cursor.pair,
+                            profit,
+                            cursor.dates[entry].strftime('%s'),
+                            cursor.dates[i].strftime('%s'),
+                            int(cursor.index[entry]),
+                            int(cursor.index[i]),
+                           ))
+        wallet.sell(stake * (cursor.filled + profit))
+        cursor.entry = None
+
+    def step(cursor: PairCursor, i: int) -> None:
+        # the per-candle update of backtesting.backtest()
+        rate = cursor.sell_rate[i]
+        date = cursor.dates[i]
+        strategy.step_frame(cursor.trade, rate, date)
+        cursor.trade.update_stats(rate)
+        if min_roi_reached(strategy, cursor.trade, rate, date) or cursor.sell[i]:
+            close_trade(cursor, i)
+
+    def schedule(cursor: PairCursor, i: int) -> None:
+        if cursor.entry is not None:
+            # a buy waiting for its fill is next seen on the candle it fills on
+            nxt: Optional[int] = max(i + 1, cursor.entry)
+            nxt = nxt if nxt < len(cursor.close) else None
+        else:
+            nxt = cursor.next_buy(i + 1)
+        if nxt is not None:
+            heapq.heappush(events, (cursor.times[nxt], cursor.order, nxt))
+
+    while events:
+        time = events[0][0]
+        batch = []
+        while events and events[0][0] == time:
+            _, order, i = heapq.heappop(events)
+            batch.append((cursors[order], i))
+        holding = [cursor.entry is not None for cursor, _ in batch]
+        # sells first, they free slots and stake for the buys
+        for (cursor, i), held in zip(batch, holding):
+            if held:
+                step(cursor, i)
+                schedule(cursor, i)
+        for (cursor, i), held in zip(batch, holding):
+            if held:
+                continue
+            filled = cursor.fill(i)
+            if filled <= 0:
+                unfilled += 1
+            elif wallet.open_trades < max_open and wallet.can_buy(stake):
+                entry = i + cursor.delay(i)
+                cursor.trade.open(cursor.buy_rate[i], cursor.dates[entry], fee, stake * filled)
+                cursor.entry = entry
+                cursor.filled = filled
+                wallet.buy(stake * filled)
+                if entry == i:
+                    step(cursor, i)
+            else:
+                skipped += 1
+            schedule(cursor, i)
+
+    open_value = sum(stake * c.filled * (1 + calc_profit(c.trade, c.sell_rate[-1]))
+                     for c in cursors if c.entry is not None)
+    logger.info('portfolio: %d trades, %d buy signals skipped (max_open_trades=%d), '
+                '%d not filled, wallet %.8f -> %.8f (%d trades still open)',
+                len(trades), skipped, max_open, unfilled, wallet.capital,
+                wallet.free + open_value, wallet.open_trades)
+
+    if record:
+        logger.info('Dumping backtest trades')
+        misc.file_dump_json('backtest-trades.json', records)
+
+    labels = ['currency', 'date_b', 'date_s', 'profit', 'duration']
+    return DataFrame.from_records(trades, columns=labels)
@@ -0,0 +1,143 @@
+# pragma pylint: disable=missing-docstring
+
+"""
+Offline training of the weights of the 'lin' indicator (ta/linear_comb.py)
+
+The weights are fitted by least squares, so that for each candle
+
+    feature_vector(input)[t] . w  ~  close[t + horizon] / close[t] - 1
+
+The pairs are loaded and analyzed one at a time. Between pairs only the
+normal equations (F'F and F'y) are kept, memory is bounded by the
+largest pair and the solve is closed-form.
+"""
+import logging
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from freqtrade import misc, optimize, OperationalException
+from freqtrade.strategy import Strategy
+from freqtrade.ta import linear_comb
+
+logger = logging.getLogger(__name__)
+
+
+class NormalEquations():
+    """Sums of F'F, F'y and y'y, added to a batch of rows at a time"""
+
+    def __init__(self, size: int) -> None:
+        self.ftf = np.zeros((size, size))
+        self.fty = np.zeros(size)
+        self.yty = 0.0
+        self.rows = 0
+
+    def add(self, features: np.ndarray, target: np.ndarray) -> int:
+        """
+        Adds the rows where features and target are all finite
+        :return: number of rows added
+        """
+        keep = np.isfinite(features).all(axis=1) & np.isfinite(target)
+        f = features[keep]
+        y = target[keep]
+        self.ftf += f.T @ f
+        self.fty += f.T @ y
+        self.yty += y @ y
+        self.rows += len(y)
+        return len(y)
+
+    def solve(self, ridge: float = 0.0) -> np.ndarray:
+        """
+        :param ridge: L2 penalty per row, added to the diagonal of F'F
+        :return: the weights
+        """
+        if not self.rows:
+            raise OperationalException('no candles to train on')
+        a = self.ftf + ridge * self.rows * np.eye(len(self.fty))
+        # lstsq, not solve: features can be collinear (F'F singular)
+        return np.linalg.lstsq(a, self.fty, rcond=None)[0]
+
+    def mse(self, weights: np.ndarray) -> float:
+        """Mean squared error of weights over the added rows"""
+        sse = self.yty - 2 * weights @ self.fty + weights @ self.ftf @ weights
+        return max(sse, 0.0) / self.rows
+
+
+def lin_args(strategy: Strategy) -> Dict:
+    """
+    The args of the 'lin' indicator of strategy
+    """
+    for ind in strategy.select_indicators(None):
+        if len(ind) > 1 and ind[-2] == 'lin':
+            return ind[-1]
+    raise OperationalException('strategy {} has no lin indicator'.format(strategy.name()))
+
+
+def forward_return(close: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    close[t + horizon] / close[t] - 1, NaN for the last horizon candles
+    """
+    ret = np.full(len(close), np.nan)
+    if horizon < len(close):
+        ret[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    return ret
+
+
+def pair_features(args: Dict, df: DataFrame) -> np.ndarray:
+    """
+    Features of each candle of an analyzed pair, as used by the 'lin' indicator
+    """
+    input = np.column_stack([df[x].values for x in args['input']]) * args['scale']
+    features = linear_comb.feature_vector(input)
+    # the temporal features of the first two candles look outside the data
+    features[:2] = np.nan
+    return features
+
+
+def train(strategy: Strategy, pairs: List[str], load: Callable,
+          horizon: int = 1, ridge: float = 0.0) -> Tuple[np.ndarray, NormalEquations]:
+    """
+    Fits the weights of the lin indicator of strategy over pairs
+    :param load: returns the ticker data of a pair, see optimize.load_data()
+    :param horizon: candles ahead of the forward return
+    :param ridge: see NormalEquations.solve()
+    :return: weights, and the normal equations (rows, mse)
+    """
+    args = lin_args(strategy)
+    equations = NormalEquations(len(args['input']) * 4)
+    for pair in pairs:
+        df = optimize.preprocess(strategy, {pair: load(pair)})[pair]
+        rows = equations.add(pair_features(args, df),
+                             forward_return(df['close'].values, horizon))
+        logger.info('%s: %d candles', pair, rows)
+    return equations.solve(ridge), equations
+
+
+def start(args):
+    # Initialize logger
+    logging.basicConfig(
+        level=args.loglevel,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+
+    logger.info('Using config: %s ...', args.config)
+    config = misc.load_config(args.config)
+    strategy = Strategy().load(args.strategy)
+    pairs = config['exchange']['pair_whitelist']
+    if pairs == []: # if there was an empty pairs_whitelist in config
+        pairs = strategy.backtest_pairs()
+
+    def load(pair):
+        data = optimize.load_data(args.datadir, args.ticker_interval, [pair], args.candle_store,
+                                  args.resample)
+        if args.timeperiod:
+            data = optimize.trim_tickerlist(data, args.timeperiod)
+        return data[pair]
+
+    weights, equations = train(strategy, pairs, load, args.horizon, args.ridge)
+    np.save(args.output, weights)
+    logger.info('trained on %d candles of %d pairs, mse %.3e (predicting 0: %.3e)',
+                equations.rows, len(pairs), equations.mse(weights),
+                equations.yty / equations.rows)
+    logger.info('wrote weights to %s', args.output)
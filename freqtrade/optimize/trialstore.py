@@ -0,0 +1,211 @@
+# pragma pylint: disable=missing-docstring
+"""
+Local, persistent store of the hyperopt trials
+
+Without --use-mongodb the trials only live in memory. With --trials-db
+(or --resume) every evaluated point is written to a sqlite database as
+soon as hyperopt has its loss, under a key: the hash of the strategy
+source, the search space, the candles (pairs, interval, first and last
+date) and the loss settings. Then
+  - an interrupted run can be continued with --resume, TPE starts from
+    the points stored under the key, -e is the total number of epochs
+  - a point that was evaluated before under the key is not backtested
+    again, its result is served from the store. Served epochs are stored
+    too, flagged, so that they count in -e of a resumed run, but TPE
+    only sees each evaluated point once
+"""
+import hashlib
+import inspect
+import json
+import logging
+from typing import Dict, List, Optional
+
+from hyperopt import Trials, base, pyll, space_eval
+from pandas import DataFrame, Timestamp
+from sqlalchemy import Boolean, Column, Float, Integer, String, create_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm.session import sessionmaker
+
+from freqtrade.strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+_DECL_BASE = declarative_base()
+
+# default of --trials-db, when only --resume is given
+DEFAULT_PATH = 'hyperopt_trials.sqlite'
+
+
+class StoredTrial(_DECL_BASE):
+    __tablename__ = 'trials'
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String, nullable=False, index=True)
+    params = Column(String, nullable=False, index=True)  # json of the point
+    vals = Column(String, nullable=False)  # json of the hyperopt vals, for TPE
+    loss = Column(Float, nullable=True)
+    status = Column(String, nullable=False)
+    pruned = Column(Boolean, nullable=False, default=False)
+    served = Column(Boolean, nullable=False, default=False)  # a repeat of an earlier trial
+    result = Column(String, nullable=False)  # json of the result of optimizer()
+
+
+def _edges(ticks) -> List[str]:
+    # number, first and last date of the candles of a pair
+    if isinstance(ticks, DataFrame):
+        dates = [ticks['date'].iloc[0], ticks['date'].iloc[-1]]
+    else:
+        dates = [ticks[0]['T'], ticks[-1]['T']]
+    dates = [Timestamp(date) for date in dates]
+    dates = [date.tz_convert(None) if date.tzinfo else date for date in dates]
+    return [len(ticks)] + [date.isoformat() for date in dates]
+
+
+def _source(cls: type) -> List[str]:
+    # the source of cls and of the classes it inherits from,
+    # a change to the base Strategy changes the loss too
+    sources = []
+    for klass in cls.__mro__:
+        if klass is object:
+            break
+        try:
+            sources.append(inspect.getsource(klass))
+        except (OSError, TypeError):
+            sources.append(klass.__qualname__)
+    return sources
+
+
+def trials_key(strategy: Strategy, space, dfs: Dict, settings: dict) -> str:
+    """
+    Hash of what the loss of a point depends on
+    :param dfs: candles of the backtest pairs, as hyperopt sees them
+    :param settings: the options that change the loss, like target_trades
+    """
+    key = {'strategy': _source(type(strategy)),
+           'space': str(pyll.as_apply(space)),
+           'interval': strategy.tick_interval(),
+           'candles': {pair: _edges(ticks) for pair, ticks in dfs.items() if len(ticks)},
+           'settings': settings}
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def _plain(result: dict) -> dict:
+    # the json-able part of a result, without the trades
+    return {name: value for name, value in result.items()
+            if isinstance(value, (str, int, float, bool, type(None)))}
+
+
+def _params_json(params: dict) -> str:
+    return json.dumps(params, sort_keys=True, default=float)
+
+
+class TrialStore():
+    """
+    The stored trials of one key
+    """
+
+    def __init__(self, path: str, key: str) -> None:
+        self.path = path
+        self.key = key
+        engine = create_engine('sqlite:///{}'.format(path))
+        _DECL_BASE.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        self.served = 0  # lookups found in the store
+
+    def history(self) -> List[StoredTrial]:
+        """The trials stored under the key, oldest first"""
+        return self.session.query(StoredTrial) \
+            .filter(StoredTrial.key == self.key) \
+            .order_by(StoredTrial.id).all()
+
+    def lookup(self, params: dict) -> Optional[dict]:
+        """
+        The result of a point evaluated before, None if it wasn't.
+        Pruned trials depend on the best loss at the time, they aren't served.
+        """
+        trial = self.session.query(StoredTrial) \
+            .filter(StoredTrial.key == self.key,
+                    StoredTrial.params == _params_json(params),
+                    StoredTrial.pruned.is_(False),
+                    StoredTrial.served.is_(False)) \
+            .first()
+        if trial is None:
+            return None
+        self.served += 1
+        # marked, so that StoredTrials stores it as served
+        return dict(json.loads(trial.result), stored=True)
+
+    def save(self, params: dict, vals: dict, result: dict) -> None:
+        """Checkpoints an evaluated (or served) point, committed at once"""
+        result = _plain(result)
+        served = bool(result.pop('stored', False))
+        self.session.add(StoredTrial(key=self.key,
+                                     params=_params_json(params),
+                                     vals=json.dumps(vals, default=float),
+                                     loss=result.get('loss'),
+                                     status=result['status'],
+                                     pruned=bool(result.get('pruned')),
+                                     served=served,
+                                     result=json.dumps(result)))
+        self.session.commit()
+
+    def replace(self, params: dict, result: dict) -> None:
+        """Replaces the pruned result of a point by its full result"""
+        result = _plain(result)
+        for trial in self.session.query(StoredTrial) \
+                .filter(StoredTrial.key == self.key,
+                        StoredTrial.params == _params_json(params),
+                        StoredTrial.pruned.is_(True)):
+            trial.loss = result.get('loss')
+            trial.status = result['status']
+            trial.pruned = False
+            trial.result = json.dumps(result)
+        self.session.commit()
+
+
+class StoredTrials(Trials):
+    """
+    Trials that write each finished trial to a TrialStore. With resume
+    they start with the trials of the store, so that TPE continues from
+    them. The served ones are left out, they repeat a trial and are
+    only counted, in `resumed_served`.
+    """
+
+    def __init__(self, store: TrialStore, space, resume: bool = False) -> None:
+        self.store = store
+        self.space = space
+        self._stored = set()  # tids in the store
+        self.resumed_served = 0
+        super().__init__()
+        if resume:
+            self._load()
+
+    def _load(self) -> None:
+        history = self.store.history()
+        for trial in history:
+            if trial.served:
+                self.resumed_served += 1
+                continue
+            tid = self.new_trial_ids(1)[0]
+            vals = json.loads(trial.vals)
+            misc = {'tid': tid,
+                    'cmd': ('domain_attachment', 'FMinIter_Domain'),
+                    'workdir': None,
+                    'idxs': {label: [tid] if val else [] for label, val in vals.items()},
+                    'vals': vals}
+            doc = self.new_trial_docs([tid], [None], [json.loads(trial.result)], [misc])[0]
+            doc['state'] = base.JOB_STATE_DONE
+            self._stored.add(tid)
+            self.insert_trial_docs([doc])
+        self.refresh()
+        logger.info('resuming from %d trials in %s (%d of them served from earlier ones)',
+                    len(history), self.store.path, self.resumed_served)
+
+    def refresh(self) -> None:
+        super().refresh()
+        for trial in self._trials:
+            if trial['state'] == base.JOB_STATE_DONE and trial['tid'] not in self._stored:
+                self._stored.add(trial['tid'])
+                vals = trial['misc']['vals']
+                params = space_eval(self.space, base.spec_from_misc(trial['misc']))
+                self.store.save(params, vals, trial['result'])
@@ -0,0 +1,155 @@
+# pragma pylint: disable=missing-docstring
+"""
+Vectorized backtest engine
+
+Produces the same trades as the itertuples loop in
+optimize.backtesting.backtest(), but works on whole numpy arrays
+per pair instead of calling into the strategy and the trade
+object for every candle.
+
+Only the stoploss/step_frame logic of the default Strategy can be
+expressed as array operations. Strategies that override any of
+those methods are run through the loop engine instead.
+"""
+import logging
+
+import numpy as np
+from pandas import DataFrame
+from scipy.signal import lfilter
+
+from freqtrade.strategy import Strategy
+from freqtrade.trade import profit_ratio
+import freqtrade.misc as misc
+
+logger = logging.getLogger(__name__)
+
+# first window (in candles) that is searched for an exit, doubled
+# until an exit is found or the data runs out
+_EXIT_WINDOW = 64
+
+
+def supports_strategy(strategy) -> bool:
+    """
+    True if the exit logic of the strategy can be vectorized,
+    ie it doesn't override the per-frame trade logic
+    """
+    cls = type(strategy)
+    return cls.stoploss is Strategy.stoploss and \
+        cls.step_frame is Strategy.step_frame
+
+
+def glide_trajectory(close: np.ndarray, ema: float) -> np.ndarray:
+    """
+    Gliding stoploss rates for a trade opened at close[0],
+    the same recurrence as Strategy.step_frame, ie:
+      glide[k] = (1 - ema) * glide[k-1] + ema * max(close[0..k])
+    with glide[-1] = close[0]
+    """
+    target = np.maximum.accumulate(close)
+    zi = [(1 - ema) * close[0]]
+    glide, _ = lfilter([ema], [1, -(1 - ema)], target, zi=zi)
+    return glide
+
+
+def exit_mask(strategy, close: np.ndarray, minutes: np.ndarray, sell: np.ndarray,
+              fee: float) -> np.ndarray:
+    """
+    Boolean array telling on which candles a trade opened at close[0]
+    would be exited, either by min_roi_reached() or the sell signal
+    :param minutes: minutes since the trade was opened, per candle
+    """
+    open_rate = close[0]
+    profit = profit_ratio(open_rate, close, fee)
+    time_diff = minutes / strategy.tick_interval()
+
+    mask = sell == 1
+    for duration, threshold in strategy.minimal_roi().items():
+        mask |= (time_diff > float(duration)) & (profit > threshold)
+    mask |= profit < strategy._stoploss
+    glide = glide_trajectory(close, strategy._stoploss_glide_ema)
+    mask |= (close / glide - 1) < strategy._stoploss_glide
+    return mask
+
+
+def find_exit(strategy, close, dates, sell, entry, fee):
+    """
+    Index of the candle where a trade entered at candle entry is exited,
+    or None if the trade is still open at the end of the data
+    """
+    rows = len(close)
+    window = _EXIT_WINDOW
+    while True:
+        end = min(rows, entry + window)
+        minutes = (dates[entry:end] - dates[entry]) / 60e9
+        mask = exit_mask(strategy, close[entry:end], minutes, sell[entry:end], fee)
+        hits = np.flatnonzero(mask)
+        if len(hits):
+            return entry + hits[0]
+        if end == rows:
+            return None
+        window *= 2
+
+
+def backtest_pair(strategy, pair, df: DataFrame, record=None) -> list:
+    """
+    Runs the vectorized backtest for a single, populated, pair
+    :return: list of trade tuples, see backtesting.backtest()
+    """
+    close = df['close'].values.astype(np.float64)
+    dates = df['date'].values.astype('datetime64[ns]').astype(np.int64)
+    buy = df['buy'].values
+    sell = df['sell'].values
+    index = df.index.values
+    fee = strategy.fee() * 2
+
+    entries = np.flatnonzero(buy == 1)
+    trades = []
+    cursor = 0
+    while True:
+        pos = np.searchsorted(entries, cursor)
+        if pos == len(entries):
+            break
+        entry = entries[pos]
+        exit_ = find_exit(strategy, close, dates, sell, entry, fee)
+        if exit_ is None:
+            break
+        o_date = df['date'].iat[entry]
+        s_date = df['date'].iat[exit_]
+        profit = float(profit_ratio(close[entry], close[exit_], fee))
+        duration = int(index[exit_] - index[entry])
+        trades.append((pair, o_date, s_date, profit, duration))
+        if record is not None:
+            record.append((pair,
+                           profit,
+                           o_date.strftime('%s'),
+                           s_date.strftime('%s'),
+                           int(index[entry]),
+                           int(index[exit_]),
+                          ))
+        # a new trade can be opened at the earliest on the next candle
+        cursor = exit_ + 1
+    return trades
+
+
+def backtest_vector(args) -> DataFrame:
+    """
+    Vectorized version of backtesting.backtest(), takes the same args
+    :return: DataFrame with the same columns as backtesting.backtest()
+    """
+    strategy = args['strategy']
+    processed = args['processed']
+    record = args.get('record', False)
+
+    records = [] if record else None
+    trades = []
+    for pair, pair_data in processed.items():
+        pair_data['buy'], pair_data['sell'] = 0, 0
+        df = strategy.populate_sell_trend(strategy.populate_buy_trend(pair_data))
+        trades.extend(backtest_pair(strategy, pair, df, records))
+
+    if record:
+        logger.info('Dumping backtest trades')
+        misc.file_dump_json('backtest-trades.json', records)
+
+    labels = ['currency', 'date_b', 'date_s', 'profit', 'duration']
+    return DataFrame.from_records(trades, columns=labels)
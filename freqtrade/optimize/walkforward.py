@@ -0,0 +1,213 @@
+# pragma pylint: disable=missing-docstring
+"""
+Walk-forward optimization
+
+hyperopt fits the parameters on all of the data, its best result is
+in-sample. Here the candles are split in rolling windows of
+    train [s, s + train)  test [s + train, s + train + test)
+with s moving by step candles. Each train window is hyperopted, and
+the best parameters are backtested on the test window that follows,
+which they have not seen. The trades of all test windows together are
+the out-of-sample result.
+
+The windows are run in a pool of worker processes (--workers), each
+loads the candles once. The indicators are computed on all of the
+candles, once per indicator spec (the indicator params of an epoch),
+and kept in _FRAMES. A window is a zero-copy view of the rows of
+those frames, only the buy/sell columns are new. The indicators only
+look back, so the rows of a window are the same as if they had been
+computed on the candles up to the window.
+"""
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+from cachetools import LRUCache
+from hyperopt import fmin, tpe, space_eval, Trials
+from pandas import DataFrame, Timedelta, Timestamp, concat
+from tabulate import tabulate
+
+from freqtrade import indicator_cache, optimize
+from freqtrade.analyze import parse_ticker_dataframe
+from freqtrade.optimize import hyperopt
+from freqtrade.optimize.backtesting import backtest, generate_text_table
+from freqtrade.strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+# indicator spec -> analyzed frames of all pairs
+_FRAMES = LRUCache(maxsize=8)
+
+# strategy, candles and options of this process, see setup()
+_STATE = None
+
+
+def windows(first: Timestamp, last: Timestamp, interval: int,
+            train: int, test: int, step: int) -> List[Tuple[Timestamp, Timestamp, Timestamp]]:
+    """
+    The rolling windows between the candles first and last
+    :param interval: minutes per candle
+    :param train, test, step: in candles
+    :return: list of (train start, test start, test end), the end is excluded
+    """
+    candle = Timedelta(minutes=interval)
+    total = int((last - first) / candle) + 1
+    result = []
+    start = 0
+    while start + train + test <= total:
+        result.append((first + start * candle,
+                       first + (start + train) * candle,
+                       first + (start + train + test) * candle))
+        start += step
+    return result
+
+
+def view(frame: DataFrame, begin: Timestamp, end: Timestamp) -> DataFrame:
+    """
+    The rows of frame with begin <= date < end, sharing the data of frame
+    """
+    dates = frame['date'].values.view(np.int64)
+    a, b = np.searchsorted(dates, [begin.value, end.value])
+    # a new frame on the same blocks, not a "copy of a slice",
+    # so that the backtest can add its columns to it
+    return DataFrame(frame.iloc[a:b], copy=False)
+
+
+def analyzed(strategy: Strategy, candles: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+    """
+    The candles of all pairs with the indicators of strategy,
+    computed once per indicator spec
+    """
+    key = json.dumps(strategy.select_indicators(None), sort_keys=True, default=repr)
+    frames = _FRAMES.get(key)
+    if frames is None:
+        frames = optimize.preprocess(strategy, candles)
+        _FRAMES[key] = frames
+    return frames
+
+
+def run_backtest(strategy: Strategy, candles: Dict[str, DataFrame],
+                 begin: Timestamp, end: Timestamp, options: dict) -> DataFrame:
+    """
+    Backtests strategy, with its current params, on the candles from begin to end
+    """
+    processed = {}
+    for pair, frame in analyzed(strategy, candles).items():
+        window = view(frame, begin, end)
+        if len(window):
+            processed[pair] = window
+    return backtest({'strategy': strategy,
+                     'processed': processed,
+                     'engine': options['engine'],
+                    })
+
+
+def setup(options: dict) -> None:
+    """
+    Loads the strategy and candles of this process, also the
+    initializer of the worker processes
+    """
+    global _STATE
+    logging.basicConfig(
+        level=options['loglevel'],
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+    strategy = Strategy().load(options['strategy'])
+    indicator_cache.init(options['indicator_cache_mb'] * 2**20)
+    data = optimize.load_data(options['datadir'], strategy.tick_interval(),
+                              strategy.backtest_pairs(), options['candle_store'],
+                              options.get('resample', False))
+    candles = {pair: parse_ticker_dataframe(ticks).reset_index(drop=True)
+               for pair, ticks in data.items()}
+    _FRAMES.clear()
+    _STATE = (strategy, candles, options)
+
+
+def run_window(window: Tuple[Timestamp, Timestamp, Timestamp]) -> dict:
+    """
+    Hyperopts the train part of window and backtests the best params on its test part
+    :return: dict with the window, params, train loss and the test trades
+    """
+    strategy, candles, options = _STATE
+    train_start, test_start, test_end = window
+    space = strategy.strategy_space()
+
+    def objective(params):
+        strategy.set_hyper_params(params)
+        results = run_backtest(strategy, candles, train_start, test_start, options)
+        scored = hyperopt.score(results, options['target_trades'])
+        return {'loss': scored['loss'],
+                'status': scored['status'],
+                'result': hyperopt.format_results(results)}
+
+    trials = Trials()
+    best = fmin(fn=objective, space=space, algo=tpe.suggest, max_evals=options['epochs'],
+                trials=trials, show_progressbar=False)
+    params = space_eval(space, best)
+    strategy.set_hyper_params(params)
+    results = run_backtest(strategy, candles, test_start, test_end, options)
+    logger.info('window %s - %s: %s', test_start, test_end, hyperopt.format_results(results))
+    return {'window': window,
+            'params': params,
+            'train_loss': min(trials.losses()),
+            'results': results}
+
+
+def aggregate(runs: List[dict]) -> Tuple[str, DataFrame]:
+    """
+    Table of the test windows and all of their trades
+    """
+    rows = []
+    for i, run in enumerate(runs):
+        results = run['results']
+        rows.append([i, run['window'][1], run['window'][2], len(results),
+                     '{:.2f}%'.format(results.profit.sum()),
+                     '{:.2f}%'.format(results.profit.mean() * 100.0 if len(results) else 0),
+                     '{:.3f}'.format(run['train_loss']),
+                     json.dumps(run['params'], sort_keys=True)])
+    table = tabulate(rows, headers=['window', 'test from', 'test to', 'trades', 'total profit',
+                                    'avg profit', 'train loss', 'params'])
+    trades = concat([run['results'] for run in runs], ignore_index=True) if runs else None
+    return table, trades
+
+
+def start(args):
+    options = {'epochs': args.epochs,
+               'target_trades': args.target_trades,
+               'datadir': args.datadir,
+               'candle_store': args.candle_store,
+               'resample': args.resample,
+               'engine': args.engine,
+               'strategy': args.strategy,
+               'indicator_cache_mb': args.indicator_cache_mb,
+               'loglevel': args.loglevel
+              }
+    setup(options)
+    strategy, candles, _ = _STATE
+    first = min(frame['date'].iloc[0] for frame in candles.values())
+    last = max(frame['date'].iloc[-1] for frame in candles.values())
+    todo = windows(first, last, strategy.tick_interval(),
+                   args.train, args.test, args.step or args.test)
+    logger.info('%d windows of %d train and %d test candles, from %s to %s',
+                len(todo), args.train, args.test, first, last)
+    if not todo:
+        logger.warning('not enough candles for a window')
+        return
+
+    if args.workers > 1:
+        logger.info('Using %d worker processes ...', args.workers)
+        with ProcessPoolExecutor(max_workers=args.workers,
+                                 initializer=setup, initargs=(options,)) as pool:
+            runs = list(pool.map(run_window, todo))
+    else:
+        runs = [run_window(window) for window in todo]
+
+    table, trades = aggregate(runs)
+    logger.info('\n====================== WALK-FORWARD WINDOWS ===================================\n%s',
+                table)
+    logger.info(
+        '\n====================== OUT-OF-SAMPLE REPORT ===================================\n%s',
+        generate_text_table(candles, trades, strategy.tick_interval())
+    )
@@ -0,0 +1,144 @@
+"""
+Timing of the stages of the trading loop
+
+Stages are timed with the timed() context manager, which also
+works as a decorator:
+
+    with perf.timed('process.whitelist'):
+        ...
+
+    @perf.timed('exchange.get_ticker')
+    def get_ticker(pair):
+        ...
+
+Each stage aggregates a histogram of its durations in memory.
+See /perf in telegram and internals.perf_log_secs for a periodic log line.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional
+
+from tabulate import tabulate
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of the histogram buckets, in milliseconds
+BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+
+
+class Stage():
+    """Counters and histogram of the durations of one stage"""
+
+    __slots__ = ['count', 'total', 'max', 'hist']
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.hist = [0] * (len(BUCKETS) + 1)
+
+    def add(self, secs: float) -> None:
+        self.count += 1
+        self.total += secs
+        self.max = max(self.max, secs)
+        self.hist[bisect.bisect_left(BUCKETS, secs * 1000)] += 1
+
+    def percentile(self, pct: float) -> float:
+        """
+        Upper bound of the bucket holding the percentile, in seconds
+        """
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.hist):
+            seen += n
+            if n and seen >= rank:
+                return BUCKETS[i] / 1000 if i < len(BUCKETS) else self.max
+        return self.max
+
+
+_STAGES: Dict[str, Stage] = {}
+_LOCK = threading.Lock()
+_LAST_LOG = time.time()
+
+
+def record(stage: str, secs: float) -> None:
+    with _LOCK:
+        if stage not in _STAGES:
+            _STAGES[stage] = Stage()
+        _STAGES[stage].add(secs)
+
+
+class timed(ContextDecorator):
+    """
+    Times the block, or every call of the decorated function, as stage
+    """
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self._local = threading.local()
+
+    def __enter__(self):
+        starts = getattr(self._local, 'starts', None)
+        if starts is None:
+            starts = self._local.starts = []
+        # a stack, decorated functions can recurse or run in threads
+        starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self._local.starts.pop())
+        return False
+
+
+def reset() -> None:
+    with _LOCK:
+        _STAGES.clear()
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """
+    Returns count, total, mean, p50, p95 and max (seconds) of each stage
+    """
+    with _LOCK:
+        return {name: {
+            'count': stage.count,
+            'total': stage.total,
+            'mean': stage.total / stage.count,
+            'p50': stage.percentile(50),
+            'p95': stage.percentile(95),
+            'max': stage.max,
+        } for name, stage in _STAGES.items()}
+
+
+def format_stats(prefix: Optional[str] = None) -> str:
+    """
+    Table of the stages, the most time consuming first
+    :param prefix: only show the stages starting with prefix
+    """
+    rows: List[list] = []
+    for name, st in sorted(stats().items(), key=lambda item: -item[1]['total']):
+        if prefix and not name.startswith(prefix):
+            continue
+        rows.append([name, st['count'], '{:.2f}'.format(st['total']),
+                     '{:.1f}'.format(st['mean'] * 1000), '{:.0f}'.format(st['p50'] * 1000),
+                     '{:.0f}'.format(st['p95'] * 1000), '{:.1f}'.format(st['max'] * 1000)])
+    return tabulate(rows, headers=['stage', 'n', 'total s', 'mean ms', 'p50', 'p95', 'max ms'],
+                    tablefmt='simple')
+
+
+def log_stats(interval: float) -> None:
+    """
+    Logs a summary line of the stages, at most every interval seconds
+    :param interval: seconds, 0 disables the log line
+    """
+    global _LAST_LOG
+    if not interval or time.time() - _LAST_LOG < interval:
+        return
+    _LAST_LOG = time.time()
+    summary = ', '.join('{} {:.0f}ms/{}'.format(name, st['mean'] * 1000, st['count'])
+                        for name, st in sorted(stats().items(),
+                                               key=lambda item: -item[1]['total'])[:8])
+    logger.info('perf (mean/calls): %s', summary or 'no data')
@@ -1,23 +1,34 @@
+import contextlib
 import logging
+import time
 from datetime import datetime
 from decimal import Decimal, getcontext
 from typing import Optional, Dict
 
 import arrow
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, create_engine
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm.scoping import scoped_session
 from sqlalchemy.orm.session import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from freqtrade import trade
+from freqtrade import trade, perf
 
 logger = logging.getLogger(__name__)
 
 _CONF = {}
 _DECL_BASE = declarative_base()
 
+# Write-behind of the trade statistics: update_stats() leaves the stat
+# columns dirty in the session and end_cycle() flushes them, at the
+# latest after this many cycles. 0 flushes on every update_stats().
+# The queries of a cycle run under write_behind(), so that they don't
+# autoflush the stats. Trades that change are flushed explicitly, with
+# the stats that are pending.
+_MAX_UNFLUSHED_CYCLES = 1
+_UNFLUSHED_CYCLES = 0
+
 
 def init(config: dict, engine: Optional[Engine] = None) -> None:
     """
@@ -28,7 +39,10 @@ def init(config: dict, engine: Optional[Engine] = None) -> None:
     :param engine: database engine for sqlalchemy (Optional)
     :return: None
     """
+    global _MAX_UNFLUSHED_CYCLES, _UNFLUSHED_CYCLES
     _CONF.update(config)
+    _MAX_UNFLUSHED_CYCLES = config.get('internals', {}).get('max_unflushed_cycles', 1)
+    _UNFLUSHED_CYCLES = 0
     if not engine:
         if _CONF.get('dry_run', False):
             # the user wants dry run to use a DB
@@ -43,12 +57,52 @@ def init(config: dict, engine: Optional[Engine] = None) -> None:
         else:
             engine = create_engine('sqlite:///tradesv3.sqlite')
 
-    session = scoped_session(sessionmaker(bind=engine, autoflush=True, autocommit=True))
+    factory = sessionmaker(bind=engine, autoflush=True, autocommit=True)
+    event.listen(factory, 'before_flush', _flush_started)
+    event.listen(factory, 'after_flush_postexec', _flush_done)
+    session = scoped_session(factory)
     Trade.session = session()
     Trade.query = session.query_property()
     _DECL_BASE.metadata.create_all(engine)
 
 
+def _flush_started(session, flush_context, instances) -> None:
+    session.info['flush_started'] = time.perf_counter()
+
+
+def _flush_done(session, flush_context) -> None:
+    started = session.info.pop('flush_started', None)
+    if started is not None:
+        perf.record('db.flush', time.perf_counter() - started)
+
+
+def write_behind():
+    """
+    Context of a trading cycle, its queries don't autoflush the
+    statistics written behind by Trade.update_stats()
+    """
+    if _MAX_UNFLUSHED_CYCLES and hasattr(Trade, 'session'):
+        return Trade.session.no_autoflush
+    return contextlib.suppress()  # does nothing
+
+
+def end_cycle() -> None:
+    """
+    Called once per trading cycle. Flushes the statistics written
+    behind by Trade.update_stats(), in one transaction, at most
+    every max_unflushed_cycles cycles.
+    :return: None
+    """
+    global _UNFLUSHED_CYCLES
+    if not _MAX_UNFLUSHED_CYCLES:
+        return
+    _UNFLUSHED_CYCLES += 1
+    if _UNFLUSHED_CYCLES >= _MAX_UNFLUSHED_CYCLES:
+        # only the changed columns of dirty trades are written
+        Trade.session.flush()
+        _UNFLUSHED_CYCLES = 0
+
+
 def cleanup() -> None:
     """
     Flushes all pending operations to disk.
@@ -106,7 +160,7 @@ class Trade(_DECL_BASE):
         elif order['type'] == 'LIMIT_SELL':
             # Set close rate and set actual profit
             self.close_rate = order['rate']
-            self.close_profit = trade.calc_profit(self)
+            self.close_profit = trade.calc_profit_exact(self)
             self.close_date = datetime.utcnow()
             self.is_open = False
             logger.info(
@@ -139,6 +193,6 @@ class Trade(_DECL_BASE):
         # need to always update due to self.stat_stoploss_glide_rate being updated in every frame
         need_update = True
 
-        if need_update:
-            if 'session' in dir(Trade):
+        if need_update and not _MAX_UNFLUSHED_CYCLES:
+            if hasattr(Trade, 'session'):
                 Trade.session.flush()
@@ -0,0 +1,76 @@
+"""
+Report of the analyzed dataframes of a backtest
+
+Verbosity levels:
+  none     nothing
+  summary  one table line per pair: rows, dates, columns with NaN
+  head     the first and last N rows of each pair
+  full     all rows of each pair, to a csv file
+Each pair is formatted by pandas and written with a single write.
+"""
+import io
+import logging
+from typing import Dict, Optional
+
+from pandas import DataFrame
+from tabulate import tabulate
+
+logger = logging.getLogger(__name__)
+
+VERBOSITY = ['none', 'summary', 'head', 'full']
+
+
+def summary(prepdata: Dict[str, DataFrame]) -> str:
+    """
+    Table of the pairs, with the number of rows, first and last date
+    and the number of columns that have NaN values
+    """
+    rows = []
+    for pair, df in prepdata.items():
+        dates = df['date'] if 'date' in df else df.index
+        rows.append([pair, len(df), len(df.columns),
+                     dates.min() if len(df) else '', dates.max() if len(df) else '',
+                     int(df.isnull().any().sum())])
+    return tabulate(rows, headers=['pair', 'rows', 'columns', 'first', 'last', 'with NaN'])
+
+
+def head_tail(pair: str, df: DataFrame, rows: int) -> str:
+    """
+    The first and last rows of df, or all of it if it is short
+    """
+    if len(df) > 2 * rows:
+        text = '{}\n...\n{}'.format(df.head(rows).to_string(),
+                                    df.tail(rows).to_string(header=False))
+    else:
+        text = df.to_string()
+    return '=== {} ({} rows)\n{}\n'.format(pair, len(df), text)
+
+
+def write_report(prepdata: Dict[str, DataFrame], verbosity: str = 'summary',
+                 rows: int = 5, filename: Optional[str] = None,
+                 out: Optional[io.TextIOBase] = None) -> None:
+    """
+    Writes the report of the analyzed pairs
+    :param prepdata: dataframe of each pair, see optimize.preprocess()
+    :param verbosity: one of VERBOSITY
+    :param rows: number of rows at each end, for head
+    :param filename: csv file for full, the pairs follow each other
+    :param out: stream for summary and head (default: the log)
+    """
+    if verbosity == 'none':
+        return
+    if verbosity == 'full':
+        filename = filename or 'backtest-data.csv'
+        with open(filename, 'w') as h:
+            for pair, df in prepdata.items():
+                h.write('# {}\n{}'.format(pair, df.to_csv(index=False)))
+        logger.info('wrote %d pairs to %s', len(prepdata), filename)
+        return
+    if verbosity == 'head':
+        text = ''.join(head_tail(pair, df, rows) for pair, df in prepdata.items())
+    else:
+        text = summary(prepdata) + '\n'
+    if out is None:
+        logger.info('\n%s', text)
+    else:
+        out.write(text)
@@ -0,0 +1,80 @@
+"""
+Candles of any interval, derived from finer ones (1 minute)
+
+A candle of `interval` minutes starts at a multiple of the interval
+since the epoch (UTC), like the candles of the exchange. It has the
+open of its first, the close of its last, the high/low of all its
+finer candles, and the sum of their volume.
+The bucket boundaries are found once over the sorted dates, each
+column is then reduced with one np.ufunc.reduceat().
+"""
+from typing import Dict, List
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+
+# column -> how the candles of a bucket are combined
+_AGGREGATE = {'open': 'first', 'high': np.maximum, 'low': np.minimum, 'close': 'last',
+              'volume': np.add, 'BV': np.add}
+
+# ticker history keys, see exchange.get_ticker_history
+_TICKER_COLUMNS = {'O': 'open', 'H': 'high', 'L': 'low', 'C': 'close', 'V': 'volume',
+                   'BV': 'BV'}
+
+
+def buckets(dates: np.ndarray, interval: int):
+    """
+    :param dates: sorted int64 nanoseconds since epoch
+    :return: index of the first candle of each bucket, and the bucket start times
+    """
+    width = interval * 60 * 10**9
+    bucket = dates // width
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    return starts, bucket[starts] * width
+
+
+def resample(frame: DataFrame, interval: int) -> DataFrame:
+    """
+    Candles of interval minutes from the candles of frame
+    :param frame: parsed candles, see analyze.parse_ticker_dataframe()
+    :param interval: minutes, a multiple of the interval of frame
+    :return: DataFrame with the columns of frame that can be combined
+    """
+    frame = frame.sort_values('date')
+    if frame.empty:
+        return frame.reset_index(drop=True)
+    starts, times = buckets(frame['date'].values.astype('datetime64[ns]').astype(np.int64),
+                            interval)
+    lasts = np.r_[starts[1:], len(frame)] - 1
+    columns = {}
+    for col in frame.columns:
+        how = _AGGREGATE.get(col)
+        if how is None:
+            continue
+        values = np.asarray(frame[col].values, dtype=np.float64)
+        if how == 'first':
+            columns[col] = values[starts]
+        elif how == 'last':
+            columns[col] = values[lasts]
+        else:
+            columns[col] = how.reduceat(values, starts)
+    result = DataFrame(columns)
+    result['date'] = to_datetime(times, unit='ns', utc=True)
+    return result
+
+
+def resample_ticker(ticker: List[Dict], interval: int) -> List[Dict]:
+    """
+    resample() for a ticker history, see exchange.get_ticker_history
+    :return: ticker history of interval minutes, 'T' as ISO 8601 string
+    """
+    if not ticker:
+        return []
+    frame = DataFrame({col: [tick[key] for tick in ticker]
+                       for key, col in _TICKER_COLUMNS.items() if key in ticker[0]})
+    frame['date'] = to_datetime([tick['T'] for tick in ticker], utc=True)
+    frame = resample(frame, interval)
+    dates = frame.pop('date').dt.strftime('%Y-%m-%dT%H:%M:%S')
+    frame = frame.rename(columns={col: key for key, col in _TICKER_COLUMNS.items()})
+    frame['T'] = dates.values
+    return frame.to_dict('records')
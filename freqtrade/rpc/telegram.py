@@ -4,6 +4,7 @@ from datetime import timedelta, date
 from typing import Callable, Any
 
 import arrow
+import numpy as np
 from pandas import DataFrame
 from sqlalchemy import and_, func, text, between
 from tabulate import tabulate
@@ -11,10 +12,10 @@ from telegram import ParseMode, Bot, Update, ReplyKeyboardMarkup
 from telegram.error import NetworkError, TelegramError
 from telegram.ext import CommandHandler, Updater
 
-from freqtrade import exchange, __version__
+from freqtrade import exchange, perf, __version__
 from freqtrade.misc import get_state, State, update_state
 from freqtrade.persistence import Trade
-from freqtrade.trade import calc_profit
+from freqtrade.trade import calc_profit, profit_ratio
 
 # Remove noisy log messages
 logging.getLogger('requests.packages.urllib3').setLevel(logging.INFO)
@@ -54,6 +55,7 @@ def init(config: dict) -> None:
         CommandHandler('count', _count),
         CommandHandler('help', _help),
         CommandHandler('version', _version),
+        CommandHandler('perf', _perf),
     ]
     for handle in handles:
         _UPDATER.dispatcher.add_handler(handle)
@@ -259,23 +261,19 @@ def _profit(bot: Bot, update: Update) -> None:
     """
     trades = Trade.query.order_by(Trade.id).all()
 
-    profit_amounts = []
-    profits = []
-    durations = []
-    for trade in trades:
-        if not trade.open_rate:
-            continue
-        if trade.close_date:
-            durations.append((trade.close_date - trade.open_date).total_seconds())
-        if trade.close_profit:
-            profit = trade.close_profit
-        else:
-            # Get current rate
-            current_rate = exchange.get_ticker(trade.pair)['bid']
-            profit = calc_profit(trade, current_rate)
-
-        profit_amounts.append(profit * trade.stake_amount)
-        profits.append(profit)
+    rated = [trade for trade in trades if trade.open_rate]
+    durations = [(trade.close_date - trade.open_date).total_seconds()
+                 for trade in rated if trade.close_date]
+    profits = np.array([trade.close_profit or 0.0 for trade in rated])
+    # the profit of open trades at the current rates, all at once
+    current = [i for i, trade in enumerate(rated) if not trade.close_profit]
+    if current:
+        tickers = exchange.get_tickers(sorted({rated[i].pair for i in current}))
+        profits[current] = profit_ratio(
+            np.array([rated[i].open_rate for i in current]),
+            np.array([tickers[rated[i].pair]['bid'] for i in current]),
+            np.array([rated[i].fee for i in current]))
+    profit_amounts = profits * np.array([trade.stake_amount for trade in rated])
 
     best_pair = Trade.session.query(Trade.pair, func.sum(Trade.close_profit).label('profit_sum')) \
         .filter(Trade.is_open.is_(False)) \
@@ -296,8 +294,8 @@ def _profit(bot: Bot, update: Update) -> None:
 *Avg. Duration:* `{avg_duration}`
 *Best Performing:* `{best_pair}: {best_rate:.2f}%`
     """.format(
-        profit_btc=round(sum(profit_amounts), 8),
-        profit=round(sum(profits) * 100, 2),
+        profit_btc=round(float(profit_amounts.sum()), 8),
+        profit=round(float(profits.sum()) * 100, 2),
         trade_count=len(trades),
         first_trade_date=arrow.get(trades[0].open_date).humanize(),
         latest_trade_date=arrow.get(trades[-1].open_date).humanize(),
@@ -481,6 +479,7 @@ def _help(bot: Bot, update: Update) -> None:
 */balance:* `Show account balance per currency`
 */help:* `This help message`
 */version:* `Show version`
+*/perf [prefix]:* `Show timings of the trading loop stages, e.g. /perf exchange`
     """
     send_msg(message, bot=bot)
 
@@ -497,6 +496,24 @@ def _version(bot: Bot, update: Update) -> None:
     send_msg('*Version:* `{}`'.format(__version__), bot=bot)
 
 
+@authorized_only
+def _perf(bot: Bot, update: Update) -> None:
+    """
+    Handler for /perf.
+    Shows the timings of the stages of the trading loop
+    :param bot: telegram bot
+    :param update: message update
+    :return: None
+    """
+    prefix = None
+    match = re.match(r'/perf\s+(\S+)', update.message.text or '')
+    if match:
+        prefix = match.group(1)
+    message = '<pre>{}</pre>'.format(perf.format_stats(prefix))
+    logger.debug(message)
+    send_msg(message, bot=bot, parse_mode=ParseMode.HTML)
+
+
 def shorten_date(date):
     """
     Trim the date so it fits on small screens
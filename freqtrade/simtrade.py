@@ -0,0 +1,80 @@
+"""
+Lightweight trade record for backtesting
+
+The strategy (stoploss, step_frame) and trade.calc_profit/min_roi_reached
+only read and write a handful of trade fields. TradeProtocol lists
+them, both persistence.Trade and SimTrade provide them.
+
+SimTrade is a plain __slots__ object, setting a field is a plain
+attribute store instead of going through the SQLAlchemy
+instrumentation of persistence.Trade, which the backtest does
+several times per candle.
+"""
+from datetime import datetime
+from typing import Optional
+
+try:
+    from typing import Protocol
+except ImportError:  # python < 3.8, the protocol is documentation only
+    Protocol = object  # type: ignore
+
+
+class TradeProtocol(Protocol):
+    """The trade fields used by strategies and the profit/ROI functions"""
+    open_rate: float
+    open_date: datetime
+    close_rate: Optional[float]
+    fee: float
+    amount: float
+    stat_min_rate: Optional[float]
+    stat_max_rate: Optional[float]
+    stat_stoploss_glide_rate: Optional[float]
+
+    def update_stats(self, current_rate: float) -> None:
+        ...
+
+
+class SimTrade():
+    """In-memory trade for backtesting, see TradeProtocol"""
+
+    __slots__ = ['pair', 'open_rate', 'open_date', 'close_rate', 'fee', 'amount',
+                 'stat_min_rate', 'stat_max_rate', 'stat_stoploss_glide_rate']
+
+    def __init__(self, pair: Optional[str] = None, open_rate: float = 0.0,
+                 open_date: Optional[datetime] = None, fee: float = 0.0,
+                 amount: float = 0.0) -> None:
+        self.pair = pair
+        self.open_rate = open_rate
+        self.open_date = open_date
+        self.close_rate = None
+        self.fee = fee
+        self.amount = amount
+        self.stat_min_rate = None
+        self.stat_max_rate = None
+        self.stat_stoploss_glide_rate = None
+
+    def open(self, open_rate: float, open_date: datetime, fee: float, amount: float) -> None:
+        """
+        Reuses the record for a new trade at open_rate
+        """
+        self.open_rate = open_rate
+        self.open_date = open_date
+        self.close_rate = None
+        self.fee = fee
+        self.amount = amount
+        self.stat_min_rate = open_rate
+        self.stat_max_rate = open_rate
+        self.stat_stoploss_glide_rate = open_rate
+
+    def update_stats(self, current_rate: float) -> None:
+        """
+        Same as persistence.Trade.update_stats(), without the session
+        """
+        if not self.stat_min_rate or current_rate < self.stat_min_rate:
+            self.stat_min_rate = current_rate
+        if not self.stat_max_rate or current_rate > self.stat_max_rate:
+            self.stat_max_rate = current_rate
+
+    def __repr__(self):
+        return 'SimTrade(pair={}, open_rate={:.8f}, open_since={})'.format(
+            self.pair, self.open_rate, self.open_date)
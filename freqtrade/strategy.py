@@ -6,6 +6,7 @@ from functools import reduce
 from hyperopt import hp
 from pandas import DataFrame
 from freqtrade.vendor.qtpylib.indicators import crossed_above, crossed_below
+from freqtrade.simtrade import TradeProtocol
 
 
 # @property descriptors doesn't get rid of the boilerplate
@@ -110,7 +111,8 @@ class Strategy():
         return self._minimal_roi
 
     # exit trade, due to stoploss, duration, ROI reached, etc
-    def stoploss(self, trade, current_rate, current_time, time_diff, current_profit):
+    def stoploss(self, trade: TradeProtocol, current_rate, current_time, time_diff,
+                 current_profit):
 
         # Exit trade du to ROI or duration timeout
 
@@ -138,7 +140,7 @@ class Strategy():
 
         return False
 
-    def step_frame(self, trade, current_rate, date):
+    def step_frame(self, trade: TradeProtocol, current_rate, date):
         #
         # update gliding stoploss
         #
@@ -247,3 +249,9 @@ class Strategy():
             self._config['exchange']['pair_whitelist'] = whitelist
             return True
         return False
+
+    def incremental_analysis(self):
+        # keep a rolling candle buffer per pair in the live loop
+        if self._config and 'experimental' in self._config:
+            return self._config['experimental'].get('incremental_analysis', False)
+        return False
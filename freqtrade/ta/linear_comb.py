@@ -1,14 +1,89 @@
+import logging
+
 import numpy as np
+from scipy.signal import lfilter
 
 from freqtrade.ta.ta import TA
 
 # to use this:
 # run: freqtrade -s strat-lincomb backtesting
 
-# this will create a weights file 'w'
+# the weights are loaded from 'w.npy' (or the older text file 'w'),
+# untrained random weights are used if there is none.
+
+# the weights are trained with: freqtrade -s strat-lincomb train-lincomb
+# (see optimize/train_lincomb.py), which writes 'w.npy'.
+# with 'save': True in the args of 'lin', the weights, input and
+# featurized input are saved to 'w.npy', 'x.npy' and 'fx.npy'
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS_FILE = 'w.npy'
+INPUT_FILE = 'x.npy'
+FEATURES_FILE = 'fx.npy'
+_LEGACY_WEIGHTS_FILE = 'w'
+
+BLEED_FACTOR = 10  # [1,inf] higher: reduce bleed on this param
+BLEED_RATE = 0.99  # [1,0] lower: more bleeding from other params
+
+# untrained weights, shared by all pairs of this process
+_UNTRAINED = {}
+
+
+def load_weights(size):
+    """
+    Loads the trained weights, or returns random ones of size
+    """
+    try:
+        return np.load(WEIGHTS_FILE)
+    except FileNotFoundError:
+        pass
+    try:
+        return np.loadtxt(_LEGACY_WEIGHTS_FILE)
+    except (FileNotFoundError, OSError):
+        pass
+    if size not in _UNTRAINED:
+        logger.info('no weights found, using untrained random weights')
+        _UNTRAINED[size] = np.random.randn(size) * 0.01
+    return _UNTRAINED[size]
+
+
+def save_training_data(weights, input, features):
+    """
+    Saves what is needed for off-line learning, in binary .npy
+    """
+    np.save(WEIGHTS_FILE, weights)
+    np.save(INPUT_FILE, np.float32(input))
+    np.save(FEATURES_FILE, np.float32(features))
+
+
+def feature_vector(input):
+    """
+    Feature expansion of input (rows of time x columns of inputs)
+    to rows x columns * 4, the vector the weights are applied to
+    """
+    rows,cols = input.shape
+    # expand the output with some non-linearity, cols * 4 columns:
+    #   linear version of the input
+    #   1-degree non-linear of input
+    #   difference to the previous column (the first to the second) + bleed
+    #   temporal difference of the previous two rows + bleed
+    #   (the first row looks at the last one, the second row is 0)
+    prev_col = np.abs(np.arange(cols) - 1)
+    i1 = np.arange(rows) - 1
+    i2 = np.maximum(i1 - 1, 0)
+    diff = input - input[:, prev_col]
+    temporal = input[i1] - input[i2]
+    # the bleed b goes from column to column within a row, starting at 0:
+    #   b' = b * br + (diff + b / bf + temporal + b / bf) / 2 * (1 - br)
+    # a first order recursive filter over the columns
+    bf = BLEED_FACTOR
+    br = BLEED_RATE
+    after = lfilter([(1 - br) / 2], [1, -(br + (1 - br) / bf)], diff + temporal, axis=1)
+    bleed = np.zeros_like(input, dtype=np.float64)
+    bleed[:, 1:] = after[:, :-1] / bf # the bleed before each column
+    return np.hstack([input, input * input / 2, diff + bleed, temporal + bleed])
 
-# this file will need to be trained using the feature-vector and input.
-# FIX: those are also saved to 'f' and 'x'
 
 class linear_comb(TA):
     def __init__(self, strategy, args):
@@ -24,12 +99,8 @@ class linear_comb(TA):
         self.input    = args['input']
         self.scale    = args['scale']
         self.stategy  = strategy # why doesn't this work?
-        try:
-            self._weights = np.loadtxt('w')
-            self.log.info('---------- loaded (hopefully) pretrained weights  -------------')
-        except FileNotFoundError:
-            self._init_weights(len(self.input) * 4)
-            np.savetxt('w', self._weights)
+        self.save     = args.get('save', False)
+        self._weights = load_weights(len(self.input) * 4)
 
     # above is mostly boilerplate, below is the linear-combination stuff
 
@@ -49,59 +120,24 @@ class linear_comb(TA):
         self.log.info('input: %s', inputnames)
         self.log.info('scale: %s', self.scale)
 
-        input = np.column_stack([df[x].tolist() for x in inputnames])
+        input = np.column_stack([df[x].values for x in inputnames])
         input = input * self.scale # apply scale which makes the gradient space easier to traverse(learn)
 
         # input is now a matrix where row is time, and column is feature
         # lincomb will feature-expand the input (do some simple non-linearity)
         # then take dotproduct of row and weights (just element-multiply and sum)
         # and put the result in df['lin]
-        z = np.float32(self._lincomb(input))
+        x = self._feature_vector(input)
+        z = np.float32(np.inner(self._weights, x))
 
         # save to disk, all relevant data that is needed for off-line learning
-        # need to load the weights from disk, where they have been pre-trained
-        w = np.float32(self._weights) # retreive the weights from the mythical place
-        x = np.float32(self._feature_vector(input))
-        np.savetxt('w', w)     # weights
-        np.savetxt('x',  np.float32(input), fmt='%2.4e') # input
-        np.savetxt('fx', np.float32(x), fmt='%2.4e')    # featurized input
-
-        rows, = z.shape
-        for i in range(rows):
-          print('lin ind: %s %s' % (df['date'][i], z[i]))
+        if self.save:
+            save_training_data(self._weights, input, x)
 
         return self.series(df, z)
 
-    # this is used to create a fresh set of weights, when we have none
-    # this set obviously needs to be trained
-    def _init_weights(self, len):
-        self._weights = np.random.randn(len) * 0.01
-        return self._weights
-
     def _lincomb(self, input):
         return np.inner(self._weights, self._feature_vector(input))
 
     def _feature_vector(self, input):
-        rows,cols = input.shape
-        ocols = cols * 4  # expand the output with some non-linearity 
-        o = np.empty([rows, ocols])
-        bf = 10 # bleed-factor, [1,inf] higher: reduce bleed on this param
-        br = 0.99 # bleed-rate [1,0] lower: more bleeding from other params
-        for i in range(rows):
-            b = 0 # bleed
-            i1 = i - 1;
-            i2 = i - 2;
-            if i1 < 0:
-                i2 = 0
-            if i2 < 0:
-                i2 = 0
-            for j in range(cols):
-                j2 = np.abs(j - 1);
-                jj = j % cols
-                o[i][j]        = input[i][jj] # linear version of the input
-                o[i][j+cols]   = (input[i][jj] * input[i][jj])/2 # 1-degree non-linear of input
-                # do some fancy non-linearization
-                o[i][j+cols*2] = input[i][jj]  - input[i][j2]  + b / bf # difference+bleed
-                o[i][j+cols*3] = input[i1][jj] - input[i2][jj] + b / bf # temporal+bleed
-                b = b * br + (o[i][j+cols*2] + o[i][j+cols*3])/2 * (1 - br) # bleed over
-        return o
+        return feature_vector(input)
@@ -3,11 +3,12 @@ import json
 from unittest.mock import MagicMock
 
 import arrow
+import numpy as np
 import pytest
 from pandas import DataFrame
 
 from freqtrade.analyze import parse_ticker_dataframe, populate_indicators, \
-    get_signal, SignalType
+    get_signal, SignalType, analyze_ticker, analyze_tickers, indicator_lookback, CandleBuffer
 from freqtrade.strategy import Strategy
 
 
@@ -68,3 +69,97 @@ def test_returns_latest_sell_signal(mocker):
         return_value=DataFrame([{'sell': 0, 'date': arrow.utcnow()}])
     )
     assert not get_signal(strategy, 'BTC-ETH', SignalType.SELL)
+
+
+def test_analyze_tickers():
+    strategy = Strategy()
+    tickers = {}
+    for pair in ['BTC_ETH', 'BTC_LTC']:
+        with open('freqtrade/tests/testdata/{}-5.json'.format(pair)) as data_file:
+            tickers[pair] = json.load(data_file)
+    result = analyze_tickers(strategy, tickers, workers=2)
+    assert list(result.keys()) == ['BTC_ETH', 'BTC_LTC']
+    for pair, dataframe in result.items():
+        assert dataframe.equals(analyze_ticker(strategy, tickers[pair]))
+        assert 'buy' in dataframe.columns
+
+
+def test_indicator_lookback():
+    strategy = Strategy()
+    assert indicator_lookback(strategy) == 14  # rsi
+    strategy.select_indicators = lambda _: [['ha', 'heikinashi', None], ['macd']]
+    assert indicator_lookback(strategy) == 50
+
+
+def test_candle_buffer():
+    strategy = Strategy()
+    with open('freqtrade/tests/testdata/BTC_ETH-5.json') as data_file:
+        ticker_history = json.load(data_file)
+    buf = CandleBuffer(strategy)
+    assert buf.window == 140
+    buf.update(ticker_history[:1000])
+    for end in range(1001, 1400, 7):
+        dataframe = buf.update(ticker_history[end - 1000:end])
+    full = analyze_ticker(strategy, ticker_history[end - 1000:end])
+    assert len(dataframe) == 1000
+    assert dataframe['date'].tolist() == full['date'].tolist()
+    assert dataframe['close'].equals(full['close'])
+    assert dataframe['buy'].fillna(0).equals(full['buy'].fillna(0))
+    assert np.allclose(dataframe['rsi'].values[-300:], full['rsi'].values[-300:], rtol=1e-3)
+
+    # the open candle changed, nothing new
+    changed = [dict(tick) for tick in ticker_history[end - 1000:end]]
+    changed[-1]['C'] = 1.0
+    dataframe = buf.update(changed)
+    assert len(dataframe) == 1000
+    assert dataframe['close'].iloc[-1] == 1.0
+    assert dataframe['close'].iloc[-2] == full['close'].iloc[-2]
+
+
+def test_get_signal_incremental(mocker):
+    strategy = Strategy({'experimental': {'incremental_analysis': True}})
+    mocker.patch('freqtrade.analyze.get_ticker_history', return_value=[{'T': 'x'}])
+    incremental = mocker.patch(
+        'freqtrade.analyze.analyze_incremental',
+        return_value=DataFrame([{'buy': 1, 'date': arrow.utcnow()}])
+    )
+    assert get_signal(strategy, 'BTC-ETH', SignalType.BUY)
+    assert incremental.call_count == 1
+
+
+def _feature_vector_loop(input):
+    # the row by row version _feature_vector() replaced
+    rows, cols = input.shape
+    o = np.empty([rows, cols * 4])
+    for i in range(rows):
+        b = 0
+        i1 = i - 1
+        i2 = max(i - 2, 0)
+        for j in range(cols):
+            j2 = abs(j - 1)
+            o[i][j] = input[i][j]
+            o[i][j + cols] = input[i][j] * input[i][j] / 2
+            o[i][j + cols * 2] = input[i][j] - input[i][j2] + b / 10
+            o[i][j + cols * 3] = input[i1][j] - input[i2][j] + b / 10
+            b = b * 0.99 + (o[i][j + cols * 2] + o[i][j + cols * 3]) / 2 * 0.01
+    return o
+
+
+def test_linear_comb(result, tmpdir):
+    from freqtrade.ta import linear_comb as lc
+    args = {'input': ['high', 'low', 'close'], 'scale': [10, 10, 10]}
+    with tmpdir.as_cwd():
+        ind = lc.linear_comb(Strategy(), args)
+        input = np.column_stack([result[x].values * 10 for x in args['input']])
+        assert ind._feature_vector(input) == pytest.approx(_feature_vector_loop(input), abs=1e-12)
+
+        lin = ind.run(result)
+        assert len(lin) == len(result)
+        assert not tmpdir.join(lc.WEIGHTS_FILE).exists()
+        # same untrained weights for every pair
+        assert (lc.linear_comb(Strategy(), args).run(result) == lin).all()
+
+        args['save'] = True
+        lc.linear_comb(Strategy(), args).run(result)
+        assert np.load(lc.FEATURES_FILE).shape == (len(result), 12)
+        assert (np.load(lc.WEIGHTS_FILE) == ind._weights).all()
@@ -0,0 +1,62 @@
+# pragma pylint: disable=missing-docstring,W0621
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from freqtrade import candlestore, optimize
+from freqtrade.analyze import parse_ticker_dataframe
+from freqtrade.optimize.backtesting import get_timeframe
+
+
+@pytest.fixture
+def datadir(tmpdir):
+    for pair in ['BTC_ETH', 'BTC_UNITEST']:
+        shutil.copy('freqtrade/tests/testdata/{}-1.json'.format(pair), str(tmpdir))
+    return str(tmpdir)
+
+
+def test_candlestore_load(datadir):
+    assert not candlestore.is_current(datadir, 'BTC_ETH', 1)
+    data = optimize.load_data(datadir, 1, ['BTC_ETH', 'BTC_UNITEST'], store=True)
+    assert candlestore.is_current(datadir, 'BTC_ETH', 1)
+    assert os.path.isdir(candlestore.store_path(datadir, 'BTC_ETH', 1))
+
+    for pair, frame in data.items():
+        with open(candlestore.json_path(datadir, pair, 1)) as tickerdata:
+            expected = parse_ticker_dataframe(json.load(tickerdata))
+        assert sorted(frame.columns) == sorted(expected.columns)
+        assert frame['date'].tolist() == expected['date'].tolist()
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            assert frame[col].dtype == np.float64
+            assert np.array_equal(frame[col].values, expected[col].values)
+
+
+def test_candlestore_mmap(datadir):
+    path = candlestore.convert(datadir, 1, 'BTC_ETH')
+    dates = np.load(os.path.join(path, 'date.npy'), mmap_mode='r')
+    assert isinstance(dates, np.memmap)
+    assert dates.dtype == np.int64
+    assert np.all(np.diff(dates) > 0)
+
+
+def test_candlestore_stale(datadir):
+    candlestore.convert(datadir, 1, 'BTC_ETH')
+    assert candlestore.is_current(datadir, 'BTC_ETH', 1)
+    date_file = os.path.join(candlestore.store_path(datadir, 'BTC_ETH', 1), 'date.npy')
+    json_file = candlestore.json_path(datadir, 'BTC_ETH', 1)
+    os.utime(date_file, (0, 0))
+    assert not candlestore.is_current(datadir, 'BTC_ETH', 1)
+    # without json the store is all there is
+    os.remove(json_file)
+    assert candlestore.is_current(datadir, 'BTC_ETH', 1)
+
+
+def test_candlestore_pipeline(datadir):
+    stored = optimize.load_data(datadir, 1, ['BTC_UNITEST'], store=True)
+    loaded = optimize.load_data(datadir, 1, ['BTC_UNITEST'])
+    assert get_timeframe(stored) == get_timeframe(loaded)
+    trimmed = optimize.trim_tickerlist(stored, -100)
+    assert len(trimmed['BTC_UNITEST']) == 100
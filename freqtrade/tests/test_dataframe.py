@@ -33,3 +33,25 @@ def test_dataframe_columns_exists(result):
     assert 'low'   in dataframe.columns
     assert 'close' in dataframe.columns
 
+
+@pytest.mark.parametrize('fmt', ['json', 'ndjson'])
+def test_backtest_export_roundtrip(fmt, tmpdir):
+    from unittest.mock import MagicMock
+    from freqtrade.optimize.backtesting import backtest_export_json
+    df = _load_dataframe_pair(_pairs)
+    df.loc[3, 'rsi'] = float('nan')
+    results = DataFrame({'currency': ['BTC_ETH'], 'profit_percent': [0.01]})
+    args = MagicMock(ticker_interval=5, export_format=fmt)
+    with tmpdir.as_cwd():
+        backtest_export_json(args, {}, {'BTC_ETH': df, 'BTC_X': df.head(10)}, results)
+        ticker_interval, dataframes, res = dataframe.load_backtest_export(
+            'backtest-result.' + fmt)
+    assert ticker_interval == 5
+    assert list(dataframes.keys()) == ['BTC_ETH', 'BTC_X']
+    back = dataframes['BTC_ETH']
+    assert list(back.columns) == list(df.columns)
+    assert (back['date'] == df['date']).all()
+    assert back['close'].values == pytest.approx(df['close'].values, abs=1e-14)
+    assert pandas.isnull(back.loc[3, 'rsi'])
+    assert len(dataframes['BTC_X']) == 10
+    assert res['profit_percent'][0] == 0.01
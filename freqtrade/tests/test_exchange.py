@@ -1,10 +1,14 @@
 # pragma pylint: disable=missing-docstring,C0103
+import time
 from unittest.mock import MagicMock
 
 import pytest
+from requests.exceptions import ContentDecodingError
 
 from freqtrade import OperationalException
-from freqtrade.exchange import validate_pairs
+from freqtrade.exchange import validate_pairs, RateLimiter, Bittrex, get_tickers, \
+    get_open_orders
+from freqtrade.misc import parallel_map
 
 
 def test_validate_pairs(default_conf, mocker):
@@ -36,3 +40,74 @@ def test_validate_pairs_not_available(default_conf, mocker):
 #    mocker.patch.dict('freqtrade.exchange._CONF', default_conf)
 #    with pytest.raises(OperationalException, match=r'not compatible'):
 #        validate_pairs(default_conf['exchange']['pair_whitelist'])
+
+
+def test_bittrex_batched_calls(default_conf, mocker):
+    api_mock = MagicMock()
+    api_mock.get_market_summaries = MagicMock(return_value={
+        'success': True, 'message': '',
+        'result': [{'MarketName': 'BTC-ETH', 'Bid': 0.07, 'Ask': 0.071, 'Last': 0.0705},
+                   {'MarketName': 'BTC-TKN', 'Bid': 0.01, 'Ask': 0.011, 'Last': 0.0105}]
+    })
+    api_mock.get_open_orders = MagicMock(return_value={
+        'success': True, 'message': '',
+        'result': [{'OrderUuid': 'abc', 'OrderType': 'LIMIT_BUY', 'Exchange': 'BTC-ETH',
+                    'Opened': '2017-12-01T10:00:00', 'Closed': None, 'PricePerUnit': None,
+                    'Quantity': 10.0, 'QuantityRemaining': 10.0}]
+    })
+    mocker.patch('freqtrade.exchange.bittrex._API', api_mock)
+    api = Bittrex(default_conf['exchange'])
+    mocker.patch('freqtrade.exchange.bittrex._API', api_mock)
+    mocker.patch('freqtrade.exchange._API', api)
+    mocker.patch.dict('freqtrade.exchange._CONF', dict(default_conf, dry_run=False))
+
+    tickers = get_tickers(['BTC_ETH', 'BTC_TKN'])
+    assert tickers['BTC_TKN'] == {'bid': 0.01, 'ask': 0.011, 'last': 0.0105}
+    assert api_mock.get_market_summaries.call_count == 1
+    with pytest.raises(ContentDecodingError):
+        get_tickers(['BTC_XRP'])
+
+    orders = get_open_orders()
+    assert list(orders.keys()) == ['abc']
+    assert orders['abc']['pair'] == 'BTC_ETH'
+    assert orders['abc']['remaining'] == 10.0
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(20)
+    calls = []
+
+    def call(_):
+        limiter.wait()
+        calls.append(time.time())
+
+    parallel_map(call, range(6), workers=6)
+    calls.sort()
+    # 6 calls at 20/s take at least 5 intervals
+    assert calls[-1] - calls[0] >= 5 * 0.05 - 0.01
+
+    limiter = RateLimiter()
+    start = time.time()
+    for _ in range(100):
+        limiter.wait()
+    assert time.time() - start < 0.05
+
+
+def test_get_ticker_history_resampled(default_conf, mocker):
+    from freqtrade.exchange import get_ticker_history
+    ticks = [{'O': 1.0 + i, 'H': 2.0 + i, 'L': 0.5 + i, 'C': 1.5 + i, 'V': 1.0, 'BV': 2.0,
+              'T': '2017-12-01T10:{:02d}:00'.format(i)} for i in range(30)]
+    api_mock = MagicMock()
+    api_mock.get_candles = MagicMock(return_value={'success': True, 'result': ticks})
+    mocker.patch('freqtrade.exchange._API', Bittrex(default_conf['exchange']))
+    mocker.patch('freqtrade.exchange.bittrex._API_V2', api_mock)
+
+    history = get_ticker_history('BTC_RESAMPLED', 15)
+    api_mock.get_candles.assert_called_once_with('BTC-RESAMPLED', 'oneMin')
+    assert [tick['T'] for tick in history] == ['2017-12-01T10:00:00', '2017-12-01T10:15:00']
+    assert history[1] == {'O': 16.0, 'H': 31.0, 'L': 15.5, 'C': 30.5, 'V': 15.0, 'BV': 30.0,
+                          'T': '2017-12-01T10:15:00'}
+    get_ticker_history('BTC_RESAMPLED', 5)
+    api_mock.get_candles.assert_called_with('BTC-RESAMPLED', 'fiveMin')
+    with pytest.raises(ValueError):
+        get_ticker_history('BTC_RESAMPLED', 7.5)
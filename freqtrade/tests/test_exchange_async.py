@@ -0,0 +1,114 @@
+# pragma pylint: disable=missing-docstring,C0103
+import asyncio
+import copy
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from freqtrade import exchange
+from freqtrade.exchange import async_bittrex
+from freqtrade.exchange.async_bittrex import AsyncBittrex
+from freqtrade.exchange.async_interface import TokenBucket, SyncAdapter
+from freqtrade.exchange.async_testdummy import AsyncTestdummy
+
+
+@pytest.fixture
+def async_conf():
+    return {
+        "dry_run": True,
+        "stake_currency": "BTC",
+        "exchange": {
+            "name": "testdummy",
+            "use_async": True,
+            "failrate": 0,
+            "latency": 0.05,
+            "key": "key",
+            "secret": "secret",
+            "pair_whitelist": ["BTC_ETH", "BTC_LTC", "BTC_GNO", "BTC_XRP"],
+            "test_pairs": ["BTC_ETH", "BTC_LTC", "BTC_GNO", "BTC_XRP"]
+        },
+    }
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_token_bucket():
+    bucket = TokenBucket(20, burst=2)
+
+    async def acquire(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    start = time.time()
+    run(acquire(6))
+    # the burst is free, the other 4 wait 1/20s each
+    assert time.time() - start >= 4 * 0.05 - 0.01
+
+    start = time.time()
+    run(TokenBucket(0).acquire())
+    assert time.time() - start < 0.01
+
+
+def test_async_testdummy_concurrent(async_conf):
+    api = AsyncTestdummy(async_conf['exchange'])
+    pairs = async_conf['exchange']['test_pairs']
+
+    async def tickers():
+        return await asyncio.gather(*[api.get_ticker(pair) for pair in pairs])
+
+    start = time.time()
+    result = run(tickers())
+    # 4 calls of 0.05s latency overlap
+    assert time.time() - start < 0.15
+    assert len(result) == 4
+    assert all(set(ticker.keys()) == {'bid', 'ask', 'last'} for ticker in result)
+
+    async def buy_and_get():
+        order_id = await api.buy('BTC_ETH', 0.1, 100)
+        return order_id, await api.get_order(order_id)
+
+    order_id, order = run(buy_and_get())
+    assert order['id'] == order_id
+    assert order['type'] == 'LIMIT_BUY'
+    assert api.name == 'Testdummy'
+
+
+def test_sync_adapter(async_conf):
+    api = exchange.init(async_conf)
+    assert isinstance(api, SyncAdapter)
+    assert isinstance(exchange.get_async_api(), AsyncTestdummy)
+    assert exchange.get_name() == 'Testdummy'
+    assert isinstance(exchange.get_fee(), float)
+    order_id = api.buy('BTC_ETH', 0.1, 100)
+    assert api.get_order(order_id)['pair'] == 'BTC_ETH'
+    history = api.get_ticker_history('BTC_ETH', 5)
+    assert len(history['T']) == 200
+
+    conf = copy.deepcopy(async_conf)
+    conf['exchange']['use_async'] = False
+    exchange.init(conf)
+    assert exchange.get_async_api() is None
+    assert not isinstance(exchange._API, SyncAdapter)
+
+
+def test_async_bittrex(async_conf, mocker):
+    response = MagicMock()
+    response.json = MagicMock(return_value={
+        'success': True, 'message': '',
+        'result': {'Bid': 0.00001098, 'Ask': 0.00001099, 'Last': 0.0000109}
+    })
+    get = mocker.patch.object(async_bittrex._SESSION, 'get', return_value=response)
+    api = AsyncBittrex(async_conf['exchange'])
+    api._bucket = TokenBucket(0)
+    ticker = run(api.get_ticker('BTC_ETH'))
+    assert ticker == {'bid': 0.00001098, 'ask': 0.00001099, 'last': 0.0000109}
+    assert get.call_count == 1
+    assert 'BTC-ETH' in get.call_args[0][0]
+    assert api.name == 'Bittrex'
@@ -0,0 +1,115 @@
+# pragma pylint: disable=missing-docstring,W0621
+import numpy as np
+import pytest
+
+from freqtrade import exchange, optimize, OperationalException
+from freqtrade.exchange.testdummy import Testdummy
+from freqtrade.fill import fill_arrays, parse_fill_model
+from freqtrade.optimize.backtesting import backtest
+from freqtrade.strategy import Strategy
+
+
+@pytest.fixture
+def candles():
+    return {'high': np.array([11.0, 11.0, 10.5, 10.5, 10.5]),
+            'low': np.array([9.0, 10.0, 9.95, 10.2, 9.5]),
+            'close': np.array([10.0, 10.5, 10.0, 10.4, 10.0]),
+            'volume': np.array([100.0, 100.0, 1.0, 100.0, 100.0])}
+
+
+def test_parse_fill_model():
+    assert parse_fill_model(None) is None
+    models = parse_fill_model('spread, limit:2,volume:0.05')
+    assert [repr(model) for model in models] == ['spread:0.5', 'limit:2', 'volume:0.05']
+    with pytest.raises(OperationalException, match=r'unknown fill model'):
+        parse_fill_model('spread,slippage')
+    with pytest.raises(OperationalException, match=r'bad parameter'):
+        parse_fill_model('limit:x')
+
+
+def test_fill_arrays(candles):
+    fills = fill_arrays([], candles)
+    assert (fills['buy_delay'] == 0).all()
+    assert (fills['buy_rate'] == candles['close']).all()
+    assert (fills['sell_rate'] == candles['close']).all()
+    assert (fills['buy_filled'] == 1).all()
+
+    # at the ask, and the sell at the bid
+    fills = fill_arrays(parse_fill_model('spread:0.5'), candles)
+    assert fills['buy_rate'] == pytest.approx([10.5, 10.75, 10.1375, 10.475, 10.25])
+    # never below the low
+    assert fills['sell_rate'] == pytest.approx([9.5, 10.25, 9.95, 10.325, 9.75])
+    # ask_last_balance 1 buys at the last rate, below the ask
+    fills = fill_arrays(parse_fill_model('spread:0.5,limit:1'), candles, ask_last_balance=1.0)
+    assert fills['buy_rate'].tolist() == candles['close'].tolist()
+    # filled if the low of the next candle reaches it
+    assert fills['buy_filled'].tolist() == [1, 1, 0, 1, 0]
+    fills = fill_arrays(parse_fill_model('spread:0.5,limit:2'), candles, ask_last_balance=1.0)
+    assert fills['buy_filled'].tolist() == [1, 1, 1, 1, 0]
+    # the limit orders fill on the next candles, not on the signal
+    assert fills['buy_delay'].tolist() == [1, 1, 2, 1, 0]
+
+    # a stake of 100 buys about 10, 0.1 of the volume is 10 or 0.1
+    fills = fill_arrays(parse_fill_model('volume:0.1'), candles, stake=100.0)
+    assert fills['buy_filled'] == pytest.approx([1, 1, 0.01, 1, 1])
+
+
+def test_backtest_fill_model(default_conf):
+    strategy = Strategy()
+    data = optimize.load_data('freqtrade/tests/testdata', ticker_interval=5,
+                              pairs=['BTC_ETH', 'BTC_LTC'])
+    prepdata = optimize.preprocess(strategy, data)
+    for realistic in [False, True]:
+        plain = backtest({'strategy': strategy, 'processed': prepdata, 'realistic': realistic})
+        # no spread, fills at the close
+        same = backtest({'strategy': strategy, 'processed': prepdata, 'realistic': realistic,
+                         'fill_model': 'spread:0'})
+        assert same.equals(plain)
+        # buys at the ask, sells at the bid
+        spread = backtest({'strategy': strategy, 'processed': prepdata,
+                           'realistic': realistic, 'fill_model': 'spread:1'})
+        assert spread.profit.mean() < plain.profit.mean()
+        nothing = backtest({'strategy': strategy, 'processed': prepdata,
+                            'realistic': realistic, 'fill_model': 'volume:0'})
+        assert nothing.empty
+    assert 'buy_filled' in prepdata['BTC_ETH']
+
+    # limit orders below the ask open the trade on the candle they fill on,
+    # the same in both engines
+    strategy._ask_last_balance = 1.0
+    loop = backtest({'strategy': strategy, 'processed': prepdata,
+                     'fill_model': 'spread:1,limit:3'})
+    portfolio = backtest({'strategy': strategy, 'processed': prepdata, 'realistic': True,
+                          'fill_model': 'spread:1,limit:3', 'capital': 100})
+    order = ['currency', 'date_b']
+    assert portfolio.sort_values(order).reset_index(drop=True) \
+        .equals(loop.sort_values(order).reset_index(drop=True))
+
+
+def test_testdummy_fill_model(default_conf, mocker):
+    conf = {'test_pairs': ['BTC_ETH'], 'failrate': 0, 'fill_model': 'volume:0.1',
+            'volume': 10}
+    api = Testdummy(conf)
+    uuid = api.buy('BTC_ETH', 0.01, 4)
+    order = api.get_order(uuid)
+    assert order['remaining'] == pytest.approx(3)
+    assert not order['closed']
+    assert [order['id'] for order in api.get_open_orders()] == [uuid]
+    api.cancel_order(uuid)
+    order = api.get_order(uuid)
+    assert order['closed'] and order['amount'] == pytest.approx(1)
+    assert api.get_open_orders() == []
+
+    # the open orders the bot sees
+    uuid = api.buy('BTC_ETH', 0.01, 4)
+    mocker.patch('freqtrade.exchange._API', api)
+    mocker.patch.dict('freqtrade.exchange._CONF', dict(default_conf, dry_run=False))
+    orders = exchange.get_open_orders()
+    assert list(orders) == [uuid]
+    assert orders[uuid]['remaining'] == pytest.approx(3)
+
+    # without a fill model, at once
+    del conf['fill_model']
+    api = Testdummy(conf)
+    order = api.get_order(api.buy('BTC_ETH', 0.01, 4))
+    assert order['closed'] and order['amount'] == 4 and order['rate'] == 0.01
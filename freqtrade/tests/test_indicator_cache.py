@@ -0,0 +1,52 @@
+# pragma pylint: disable=missing-docstring,W0621
+import json
+
+import pytest
+
+from freqtrade import indicator_cache
+from freqtrade.analyze import parse_ticker_dataframe, populate_indicators
+from freqtrade.strategy import Strategy
+
+
+@pytest.fixture
+def ticker_history():
+    with open('freqtrade/tests/testdata/BTC_ETH-5.json') as data_file:
+        return json.load(data_file)
+
+
+def test_indicator_cache_disabled(ticker_history):
+    indicator_cache.init(0)
+    assert not indicator_cache.enabled()
+    populate_indicators(Strategy(), parse_ticker_dataframe(ticker_history))
+    assert indicator_cache.stats()['misses'] == 0
+
+
+def test_indicator_cache_hits(ticker_history):
+    strategy = Strategy()
+    indicator_cache.init(16 * 2**20)
+    first = populate_indicators(strategy, parse_ticker_dataframe(ticker_history))
+    inds = len(strategy.select_indicators(None))
+    assert indicator_cache.stats()['misses'] == inds
+    assert indicator_cache.stats()['hits'] == 0
+
+    second = populate_indicators(strategy, parse_ticker_dataframe(ticker_history))
+    assert indicator_cache.stats()['hits'] == inds
+    assert first.columns.tolist() == second.columns.tolist()
+    assert first.equals(second)
+
+    # other candles, other key
+    populate_indicators(strategy, parse_ticker_dataframe(ticker_history[10:]))
+    assert indicator_cache.stats()['misses'] == 2 * inds
+    indicator_cache.init(0)
+
+
+def test_indicator_cache_eviction(ticker_history):
+    strategy = Strategy()
+    dataframe = parse_ticker_dataframe(ticker_history)
+    # room for about one indicator column
+    indicator_cache.init(len(dataframe) * 8 + 100)
+    populate_indicators(strategy, dataframe)
+    stats = indicator_cache.stats()
+    assert stats['evictions'] > 0
+    assert stats['bytes'] <= len(dataframe) * 8 + 100
+    indicator_cache.init(0)
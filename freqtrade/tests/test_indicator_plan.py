@@ -0,0 +1,67 @@
+# pragma pylint: disable=missing-docstring,W0621
+import json
+
+import pytest
+import talib.abstract as ta
+
+from freqtrade import indicator_plan, OperationalException
+from freqtrade.analyze import parse_ticker_dataframe, prepare_indicators
+from freqtrade.indicator_plan import compile_plan, plan_for, talib_function
+from freqtrade.strategy import Strategy
+
+
+@pytest.fixture
+def dataframe():
+    with open('freqtrade/tests/testdata/BTC_ETH-5.json') as data_file:
+        return parse_ticker_dataframe(json.load(data_file))
+
+
+def test_plan_columns():
+    plan = compile_plan([['ema5', 'ema', [5]], ['stochf'], ['rsi', [20]]])
+    assert plan.columns() == ['ema5', 'stochf_fastk', 'stochf_fastd', 'rsi']
+    with pytest.raises(OperationalException):
+        compile_plan([['ema', 'ema', [5]], ['ema', 'ema', [10]]])
+    with pytest.raises(OperationalException):
+        compile_plan([['close', 'ema', [5]]])
+    with pytest.raises(OperationalException):
+        compile_plan([['a', 'b', 'c', 'd']])
+
+
+def test_plan_dedup_and_order(dataframe, mocker):
+    inds = [['lin', 'lin', {'input': ['close', 'slow'], 'scale': [1, 1]}],
+            ['fast', 'ema', {'timeperiod': 5}],
+            ['slow', 'ema', {'timeperiod': 30}],
+            ['fast2', 'ema', {'timeperiod': 5}],
+            ['fast', 'ema', {'timeperiod': 5}]]
+    plan = compile_plan(inds)
+    # lin reads slow, which is moved before it, duplicates run once
+    assert [step.column for step in plan.steps] == ['slow', 'lin', 'fast']
+    assert plan.steps[2].aliases == ['fast2']
+    assert len(inds) == 5 and len(inds[0]) == 3  # the specs are not consumed
+
+    run = mocker.spy(indicator_plan.Step, 'run')
+    prepare_indicators(Strategy(), inds, dataframe)
+    assert run.call_count == 3
+    assert dataframe['fast'].equals(dataframe['fast2'])
+    assert 'lin' in dataframe
+
+
+def test_plan_for_cached():
+    inds = [['rsi', 'rsi', {'price': 'close', 'timeperiod': 14}]]
+    assert plan_for(inds) is plan_for([list(ind) for ind in inds])
+    assert plan_for(inds) is not plan_for([['rsi', 'rsi', {'timeperiod': 10}]])
+
+
+def test_talib_function_bind(dataframe):
+    ema = talib_function('ema')
+    assert talib_function('ema') is ema
+    assert ema.bind([5]) == (['close'], {'timeperiod': 5})
+    assert ema.bind({'price': 'open'}) == (['open'], {'timeperiod': 30})
+    assert talib_function('stochf').bind(None)[0] == ['high', 'low', 'close']
+    with pytest.raises(OperationalException):
+        ema.bind([5, 6])
+    # the same bound values compute once
+    plan = compile_plan([['ema5', 'ema', [5]], ['e5', 'ema', {'timeperiod': 5}]])
+    assert len(plan.steps) == 1
+    plan.run(None, dataframe)
+    assert (dataframe['e5'].dropna() == ta.EMA(dataframe, 5).dropna()).all()
@@ -6,10 +6,10 @@ import pytest
 import requests
 from sqlalchemy import create_engine
 
-from freqtrade import DependencyException, OperationalException
+from freqtrade import DependencyException, OperationalException, persistence
 from freqtrade.analyze import SignalType
 from freqtrade.exchange import Exchanges
-from freqtrade.main import create_trade, init, _process
+from freqtrade.main import create_trade, init, _process, scan_signals
 from freqtrade.misc import get_state, State
 from freqtrade.persistence import Trade
 from freqtrade.strategy import Strategy
@@ -102,7 +102,8 @@ def test_process_trade_handling(default_conf, ticker, limit_buy_order, health, m
                           get_ticker=ticker,
                           get_wallet_health=health,
                           buy=MagicMock(return_value='mocked_limit_buy'),
-                          get_order=MagicMock(return_value=limit_buy_order))
+                          get_order=MagicMock(return_value=limit_buy_order),
+                          get_tickers=lambda pairs: {pair: ticker() for pair in pairs})
     init(default_conf, create_engine('sqlite://'))
 
     trades = Trade.query.filter(Trade.is_open.is_(True)).all()
@@ -115,6 +116,66 @@ def test_process_trade_handling(default_conf, ticker, limit_buy_order, health, m
     assert result is False
 
 
+def test_process_stats_write_behind(default_conf, ticker, health, mocker, tmpdir):
+    conf = dict(default_conf, internals={'max_unflushed_cycles': 3})
+    strategy = setup_strategy(conf)
+    mocker.patch.dict('freqtrade.main._CONF', conf)
+    mocker.patch.multiple('freqtrade.rpc', init=MagicMock(), send_msg=MagicMock())
+    mocker.patch('freqtrade.main.get_signal', side_effect=lambda *args: False)
+    mocker.patch('freqtrade.trade.get_signal', side_effect=lambda *args: False)
+    bids = iter([0.0721, 0.0722, 0.0723, 0.0724])
+    mocker.patch.multiple('freqtrade.main.exchange',
+                          validate_pairs=MagicMock(),
+                          get_ticker=ticker,
+                          get_wallet_health=health,
+                          get_tickers=lambda pairs: {pair: {'bid': next(bids)} for pair in pairs})
+    engine = create_engine('sqlite:///{}'.format(tmpdir.join('trades.sqlite')))
+    init(conf, engine)
+    Trade.session.add(Trade(pair='BTC_ETH', stake_amount=0.001, fee=0.0025,
+                            exchange='BITTREX', open_rate=0.072, amount=0.0138))
+    Trade.session.flush()
+
+    stored = []
+    for _ in range(4):
+        _process(strategy)
+        stored.append(engine.execute('SELECT stat_max_rate FROM trades').scalar())
+    # the queries of the next cycles don't write the stats either
+    assert stored == [None, None, 0.0723, 0.0723]
+    persistence.init(default_conf, create_engine('sqlite://'))
+
+
+def test_process_batched_orders(default_conf, ticker, limit_buy_order, health, mocker):
+    strategy = setup_strategy(default_conf)
+    mocker.patch.dict('freqtrade.main._CONF', default_conf)
+    mocker.patch.multiple('freqtrade.rpc', init=MagicMock(), send_msg=MagicMock())
+    mocker.patch('freqtrade.main.get_signal', side_effect=lambda *args: True)
+    open_order = dict(limit_buy_order, id='mocked_limit_buy', closed=None)
+    get_order = MagicMock(return_value=limit_buy_order)
+    get_tickers = MagicMock(side_effect=lambda pairs: {pair: ticker() for pair in pairs})
+    mocker.patch.multiple('freqtrade.main.exchange',
+                          validate_pairs=MagicMock(),
+                          get_ticker=ticker,
+                          get_wallet_health=health,
+                          buy=MagicMock(return_value='mocked_limit_buy'),
+                          get_order=get_order,
+                          get_tickers=get_tickers,
+                          get_open_orders=MagicMock(
+                              return_value={'mocked_limit_buy': open_order}))
+    init(default_conf, create_engine('sqlite://'))
+    assert _process(strategy) is True
+    # the order is still open, no get_order() and no rate needed
+    _process(strategy)
+    assert get_order.call_count == 0
+    assert get_tickers.call_args[0][0] == []
+
+    mocker.patch('freqtrade.main.exchange.get_open_orders', MagicMock(return_value={}))
+    mocker.patch('freqtrade.main.get_signal', side_effect=lambda *args: False)
+    mocker.patch('freqtrade.trade.get_signal', side_effect=lambda *args: False)
+    _process(strategy)
+    assert get_order.call_count == 1
+    assert get_tickers.call_args[0][0] == ['BTC_ETH']
+
+
 def test_create_trade(default_conf, ticker, limit_buy_order, mocker):
     strategy = setup_strategy(default_conf)
     mocker.patch.dict('freqtrade.main._CONF', default_conf)
@@ -162,6 +223,16 @@ def test_create_trade_minimal_amount(default_conf, ticker, mocker):
     assert rate * amount >= (min_stake_amount - 0.00001)
 
 
+def test_scan_signals(default_conf, mocker):
+    strategy = setup_strategy(default_conf)
+    mocker.patch.dict('freqtrade.main._CONF', default_conf)
+    pairs = ['BTC_ETH', 'BTC_TKN', 'BTC_TRST', 'BTC_SWT', 'BTC_BCC']
+    signal = mocker.patch('freqtrade.main.get_signal',
+                          side_effect=lambda strategy, pair, signal: pair in ['BTC_SWT', 'BTC_TKN'])
+    assert scan_signals(strategy, pairs, SignalType.BUY) == ['BTC_TKN', 'BTC_SWT']
+    assert signal.call_count == len(pairs)
+
+
 def test_create_trade_no_stake_amount(default_conf, ticker, mocker):
     strategy = setup_strategy(default_conf)
     mocker.patch.dict('freqtrade.main._CONF', default_conf)
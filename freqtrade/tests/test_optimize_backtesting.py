@@ -7,6 +7,8 @@ from unittest.mock import MagicMock
 
 from freqtrade import optimize
 from freqtrade.optimize.backtesting import backtest, backtest_export_json, get_timeframe, generate_text_table, backtest_report_cost_average, minutes_to_text
+from freqtrade.optimize.vector import supports_strategy
+from freqtrade.tests.strattest import XStrategy
 
 
 from freqtrade.strategy import Strategy
@@ -189,3 +191,83 @@ def test_minutes_to_text():
     assert minutes_to_text(120) == '2h0m'
     assert minutes_to_text(23 * 60 + 59) == '23h59m'
     assert minutes_to_text(24 * 60) == '1d0h0m'
+
+def test_backtest_vector_parity(default_conf):
+    strategy = setup_strategy()
+    data = optimize.load_data('freqtrade/tests/testdata', ticker_interval=5,
+                              pairs=['BTC_ETH', 'BTC_LTC', 'BTC_XMR'])
+    data.update(load_data_test('sine'))
+    prepdata = optimize.preprocess(strategy, data)
+    loop = backtest({'strategy': strategy,
+                     'processed': prepdata,
+                    })
+    vector = backtest({'strategy': strategy,
+                       'processed': prepdata,
+                       'engine': 'vector'
+                      })
+    assert len(loop) > 0
+    assert len(loop) == len(vector)
+    for col in ['currency', 'date_b', 'date_s', 'duration']:
+        assert loop[col].tolist() == vector[col].tolist()
+    # both use the float profit kernel
+    assert vector.profit.tolist() == loop.profit.tolist()
+
+def test_backtest_vector_fallback(default_conf):
+    strategy = XStrategy()
+    data = load_data_test('sine')
+    prepdata = optimize.preprocess(strategy, data)
+    results = backtest({'strategy': strategy,
+                        'processed': prepdata,
+                        'engine': 'vector'
+                       })
+    # XStrategy overrides stoploss(), so the loop engine has been used
+    assert not supports_strategy(strategy)
+    assert len(results) > 0
+
+def test_preprocess_parallel(default_conf):
+    strategy = setup_strategy()
+    data = optimize.load_data('freqtrade/tests/testdata', ticker_interval=5,
+                              pairs=['BTC_ETH', 'BTC_LTC', 'BTC_XMR'])
+    serial = optimize.preprocess(strategy, data)
+    for backend in ['thread', 'process']:
+        parallel = optimize.preprocess(strategy, data, workers=3, backend=backend)
+        assert list(parallel.keys()) == list(serial.keys())
+        for pair in serial:
+            assert parallel[pair].equals(serial[pair])
+    with pytest.raises(ValueError, match=r'Unknown parallel backend'):
+        optimize.preprocess(strategy, data, workers=3, backend='gpu')
+
+def test_backtest_portfolio(default_conf):
+    strategy = setup_strategy()
+    data = optimize.load_data('freqtrade/tests/testdata', ticker_interval=5,
+                              pairs=['BTC_ETH', 'BTC_LTC', 'BTC_XMR', 'BTC_ZEC'])
+    prepdata = optimize.preprocess(strategy, data)
+    loop = backtest({'strategy': strategy, 'processed': prepdata})
+
+    # enough slots and money, the same trades as each pair on its own
+    strategy._max_open_trades = 100
+    results = backtest({'strategy': strategy, 'processed': prepdata, 'realistic': True})
+    key = ['currency', 'date_b']
+    assert results.sort_values(key).reset_index(drop=True).equals(
+        loop.sort_values(key).reset_index(drop=True))
+    # closed in time order
+    assert results.date_s.is_monotonic_increasing
+
+    def max_concurrent(res):
+        events = sorted([(d, 1) for d in res.date_b] + [(d, -1) for d in res.date_s])
+        count = top = 0
+        for _, delta in events:
+            count += delta
+            top = max(top, count)
+        return top
+
+    strategy._max_open_trades = 2
+    results = backtest({'strategy': strategy, 'processed': prepdata, 'realistic': True})
+    assert 0 < len(results) < len(loop)
+    assert max_concurrent(results) <= 2
+    assert max_concurrent(loop) > 2
+
+    # the wallet only has money for one trade
+    limited = backtest({'strategy': strategy, 'processed': prepdata, 'realistic': True,
+                        'capital': strategy.stake_amount() * 1.5})
+    assert max_concurrent(limited) == 1
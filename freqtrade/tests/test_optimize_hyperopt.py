@@ -1,13 +1,18 @@
 # pragma pylint: disable=missing-docstring,W0212
 
+import logging
 import random
 
+import numpy as np
 import hyperopt.pyll.stochastic
-from unittest.mock import MagicMock
+from hyperopt import Trials, fmin, tpe, space_eval
+from hyperopt.base import spec_from_misc
+from unittest.mock import MagicMock, patch
 
 from freqtrade.strategy import Strategy
 from freqtrade import optimize
-from freqtrade.optimize.hyperopt import start, optimizer
+from freqtrade.optimize import hyperopt as hyperopt_module
+from freqtrade.optimize.hyperopt import start, optimizer, Pruner, recheck_pruned
 
 def setup_strategy():
     s = Strategy()
@@ -21,9 +26,84 @@ def test_optimizer_start():
     args.mongodb = False
     args.strategy = None
     args.target_trades = 10
+    args.indicator_cache_mb = 16
+    args.workers = 1
+    args.preprocess_workers = 2
+    args.preprocess_backend = 'thread'
+    args.candle_store = False
+    args.resample = False
+    args.prune = False
+    args.trials_db = None
+    args.resume = False
+    args.random_state = None
     args.datadir = 'freqtrade/tests/testdata'
     start(args)
 
+def test_optimizer_start_workers():
+    args = MagicMock()
+    args.loglevel = logging.INFO
+    args.epochs = 4
+    args.workers = 2
+    args.mongodb = False
+    args.strategy = None
+    args.target_trades = 10
+    args.indicator_cache_mb = 16
+    args.timeperiod = -500
+    args.engine = 'vector'
+    args.preprocess_workers = 0
+    args.preprocess_backend = 'thread'
+    args.candle_store = False
+    args.resample = False
+    args.prune = True
+    args.trials_db = None
+    args.resume = False
+    args.random_state = None
+    args.datadir = 'freqtrade/tests/testdata'
+    trials = Trials()
+    with patch('freqtrade.optimize.hyperopt.Trials', MagicMock(return_value=trials)):
+        start(args)
+    assert len(trials.trials) == 4
+    assert all(t['result']['status'] == 'ok' for t in trials.trials)
+
+def failing_optimizer(params, args):
+    if params['rsi_bull'] < 25:
+        raise ValueError('broken epoch')
+    return optimizer(params, args)
+
+
+def test_run_parallel_worker_fails():
+    args = MagicMock()
+    args.loglevel = logging.INFO
+    args.epochs = 8
+    args.workers = 2
+    args.mongodb = False
+    args.strategy = None
+    args.target_trades = 10
+    args.indicator_cache_mb = 16
+    args.timeperiod = -500
+    args.engine = 'vector'
+    args.preprocess_workers = 0
+    args.preprocess_backend = 'thread'
+    args.candle_store = False
+    args.resample = False
+    args.prune = False
+    args.trials_db = None
+    args.resume = False
+    args.random_state = None
+    args.datadir = 'freqtrade/tests/testdata'
+    trials = Trials()
+    # the forked workers see the patched optimizer
+    with patch('freqtrade.optimize.hyperopt.Trials', MagicMock(return_value=trials)), \
+            patch.object(hyperopt_module, 'optimizer', failing_optimizer):
+        start(args)
+    assert len(trials.trials) == 8
+    assert all(t['state'] == hyperopt.JOB_STATE_DONE for t in trials.trials)
+    for t in trials.trials:
+        failed = t['result']['result'].startswith('failed')
+        assert failed == (t['misc']['vals']['rsi_bull_value'][0] < 25)
+        assert not failed or t['result']['status'] == 'fail'
+
+
 def test_optimizer():
     strategy = setup_strategy()
     dfs = optimize.load_data('freqtrade/tests/testdata', 1, strategy.backtest_pairs())
@@ -41,3 +121,61 @@ def test_optimizer():
     assert result['loss']
     assert result['result']
     assert result['status']
+
+def test_optimizer_prune():
+    strategy = Strategy()
+    strategy.set_backtest_pairs(['BTC_ETH', 'BTC_LTC', 'BTC_DASH', 'BTC_XMR'])
+    dfs = optimize.load_data('freqtrade/tests/testdata', 5, strategy.backtest_pairs())
+    space = strategy.strategy_space()
+    rng = np.random.RandomState(1)
+    samples = [hyperopt.pyll.stochastic.sample(space, rng=rng) for _ in range(20)]
+
+    def run(pruner):
+        optargs = {'epochs': len(samples),
+                   'target_trades': 100,
+                   'current_tries': 0,
+                   'strategy': strategy,
+                   'dfs': dfs,
+                   'timeperiod': None,
+                   'pruner': pruner
+                  }
+        return [optimizer(params, optargs) for params in samples]
+
+    plain = run(None)
+    pruner = Pruner(100, warmup=3)
+    pruned = run(pruner)
+    assert pruner.pruned_epochs > 0
+    assert all(r['status'] == 'fail' for r in pruned if r['result'].startswith('pruned'))
+    # the same winner
+    best = lambda results: min((r['loss'], i) for i, r in enumerate(results)
+                               if r['status'] == 'ok')
+    assert best(pruned) == best(plain)
+
+
+def test_recheck_pruned():
+    strategy = Strategy()
+    strategy.set_backtest_pairs(['BTC_ETH', 'BTC_LTC', 'BTC_DASH', 'BTC_XMR'])
+    dfs = optimize.load_data('freqtrade/tests/testdata', 5, strategy.backtest_pairs())
+    space = strategy.strategy_space()
+    optargs = {'epochs': 20,
+               'target_trades': 100,
+               'current_tries': 0,
+               'strategy': strategy,
+               'dfs': dfs,
+               'timeperiod': None,
+               'pruner': Pruner(100, warmup=3)
+              }
+    trials = Trials()
+    fmin(fn=lambda params: optimizer(params, optargs), space=space, algo=tpe.suggest,
+         max_evals=20, trials=trials, rstate=np.random.default_rng(1), show_progressbar=False)
+    assert any(r.get('pruned') for r in trials.results)
+
+    full = dict(optargs, pruner=None)
+    points = [space_eval(space, spec_from_misc(t['misc'])) for t in trials.trials]
+    exact = min(r['loss'] for r in (optimizer(params, full) for params in points)
+                if r['status'] == 'ok')
+    # all of the pruned epochs, the winner is that of evaluating every epoch
+    assert recheck_pruned(trials, space, lambda params: optimizer(params, full),
+                          margin=float('inf')) > 0
+    assert not any(r.get('pruned') for r in trials.results)
+    assert trials.best_trial['result']['loss'] == exact
@@ -0,0 +1,49 @@
+# pragma pylint: disable=missing-docstring
+import numpy as np
+import pytest
+
+from freqtrade import optimize, OperationalException
+from freqtrade.strategy import Strategy
+from freqtrade.optimize.train_lincomb import NormalEquations, forward_return, lin_args, train
+
+
+class LinStrategy(Strategy):
+    def select_indicators(self, some_filter):
+        return [['rsi', 'rsi', {'price': 'close', 'timeperiod': 14}],
+                ['lin', 'lin', {'input': ['close', 'rsi'], 'scale': [10, 0.01]}]]
+
+
+def test_normal_equations_batches():
+    features = np.random.randn(1000, 6)
+    target = features @ np.arange(6.0) + np.random.randn(1000) * 0.01
+    target[10] = np.nan
+    equations = NormalEquations(6)
+    for batch in range(0, 1000, 300):
+        equations.add(features[batch:batch + 300], target[batch:batch + 300])
+    assert equations.rows == 999
+    weights = equations.solve()
+    keep = np.isfinite(target)
+    expected = np.linalg.lstsq(features[keep], target[keep], rcond=None)[0]
+    assert weights == pytest.approx(expected)
+    assert equations.mse(weights) == pytest.approx(1e-4, rel=0.2)
+    # the penalty pulls the weights towards 0
+    assert np.abs(equations.solve(ridge=10)).sum() < np.abs(weights).sum()
+
+
+def test_forward_return():
+    ret = forward_return(np.array([1.0, 2.0, 4.0]), 1)
+    assert ret[:2].tolist() == [1.0, 1.0]
+    assert np.isnan(ret[2])
+    assert np.isnan(forward_return(np.array([1.0]), 3)).all()
+
+
+def test_train(tmpdir):
+    with pytest.raises(OperationalException):
+        lin_args(Strategy())
+    pairs = ['BTC_ETH', 'BTC_UNITEST']
+    data = optimize.load_data('freqtrade/tests/testdata', 1, pairs)
+    with tmpdir.as_cwd():
+        weights, equations = train(LinStrategy(), pairs, data.get, horizon=5)
+    assert weights.shape == (8,)
+    assert equations.rows > 20000
+    assert equations.mse(weights) <= equations.yty / equations.rows
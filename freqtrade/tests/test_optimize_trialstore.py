@@ -0,0 +1,121 @@
+# pragma pylint: disable=missing-docstring,W0212
+import logging
+from unittest.mock import MagicMock, patch
+
+from hyperopt import STATUS_OK, STATUS_FAIL, hp
+
+from freqtrade import optimize
+from freqtrade.optimize import hyperopt
+from freqtrade.optimize.trialstore import StoredTrial, TrialStore, trials_key
+from freqtrade.strategy import Strategy
+
+
+def hyperopt_args(trials_db, epochs, resume):
+    args = MagicMock()
+    args.loglevel = logging.INFO
+    args.epochs = epochs
+    args.workers = 1
+    args.mongodb = False
+    args.strategy = None
+    args.target_trades = 10
+    args.indicator_cache_mb = 16
+    args.timeperiod = -500
+    args.engine = 'vector'
+    args.preprocess_workers = 0
+    args.preprocess_backend = 'thread'
+    args.candle_store = False
+    args.resample = False
+    args.prune = False
+    args.trials_db = trials_db
+    args.resume = resume
+    args.random_state = 1
+    args.datadir = 'freqtrade/tests/testdata'
+    return args
+
+
+def test_trials_key():
+    strategy = Strategy()
+    space = strategy.strategy_space()
+    dfs = optimize.load_data('freqtrade/tests/testdata', 5, ['BTC_ETH', 'BTC_LTC'])
+    key = trials_key(strategy, space, dfs, {'target_trades': 10})
+    assert key == trials_key(strategy, space, dfs, {'target_trades': 10})
+    assert key != trials_key(strategy, space, dfs, {'target_trades': 20})
+    assert key != trials_key(strategy, space, optimize.trim_tickerlist(dfs, -100),
+                             {'target_trades': 10})
+    # a change to the base class changes the key of subclasses
+    class Sub(Strategy):
+        pass
+    keys = []
+    for base_source in ['before', 'after']:
+        with patch('inspect.getsource',
+                   lambda klass: base_source if klass is Strategy else 'sub'):
+            keys.append(trials_key(Sub(), space, dfs, {'target_trades': 10}))
+    assert keys[0] != keys[1]
+    # the candle store has the same candles
+    stored = optimize.load_data('freqtrade/tests/testdata', 5, ['BTC_ETH', 'BTC_LTC'], True)
+    assert key == trials_key(strategy, space, stored, {'target_trades': 10})
+
+
+def test_trial_store_lookup(tmpdir):
+    path = str(tmpdir.join('trials.sqlite'))
+    store = TrialStore(path, 'a')
+    params = {'rsi_bull': 20.0, 'rsi_bear': 70.0}
+    assert store.lookup(params) is None
+    store.save(params, {'rsi_bull_value': [20.0], 'rsi_bear_value': [70.0]},
+               {'loss': 1.5, 'status': STATUS_OK, 'result': 'Made 3 buys', 'results': object()})
+    assert store.lookup(dict(params)) == {'loss': 1.5, 'status': STATUS_OK,
+                                          'result': 'Made 3 buys', 'stored': True}
+    assert store.served == 1
+    # pruned trials are not served, nor are those of other keys
+    pruned = {'rsi_bull': 21.0, 'rsi_bear': 70.0}
+    store.save(pruned, {'rsi_bull_value': [21.0], 'rsi_bear_value': [70.0]},
+               {'loss': 2.0, 'status': STATUS_FAIL, 'result': 'pruned after 1 of 2 pairs',
+                'pruned': True})
+    assert store.lookup(pruned) is None
+    # evaluated in full after all
+    store.replace(pruned, {'loss': 1.7, 'status': STATUS_OK, 'result': 'Made 5 buys'})
+    assert store.lookup(pruned)['loss'] == 1.7
+    assert TrialStore(path, 'b').lookup(params) is None
+    assert len(TrialStore(path, 'a').history()) == 2
+
+
+def test_start_resume(tmpdir):
+    path = str(tmpdir.join('trials.sqlite'))
+    hyperopt.start(hyperopt_args(path, 3, False))
+    evaluated = MagicMock(side_effect=hyperopt.optimizer)
+    with patch('freqtrade.optimize.hyperopt.optimizer', evaluated):
+        hyperopt.start(hyperopt_args(path, 5, True))
+    # TPE continued from the 3 stored epochs
+    assert evaluated.call_count == 2
+    history = TrialStore(path, 'any').session.query(StoredTrial).all()
+    assert len(history) == 5
+    assert len({trial.key for trial in history}) == 1
+
+
+def test_start_resume_epochs_done(tmpdir, caplog):
+    path = str(tmpdir.join('trials.sqlite'))
+    hyperopt.start(hyperopt_args(path, 3, False))
+    # -e below the stored epochs, nothing left to evaluate
+    with caplog.at_level(logging.INFO, logger='freqtrade.optimize.hyperopt'):
+        hyperopt.start(hyperopt_args(path, 2, True))
+    assert any(r.message.startswith('0 epochs in ') for r in caplog.records)
+
+
+def test_start_served_once(tmpdir):
+    path = str(tmpdir.join('trials.sqlite'))
+    # 4 points, most epochs are served from the store
+    space = {'rsi_bull': hp.quniform('rsi_bull_value', 10, 11, 1),
+             'rsi_bear': hp.quniform('rsi_bear_value', 60, 61, 1)}
+    with patch.object(Strategy, 'strategy_space', MagicMock(return_value=space)):
+        hyperopt.start(hyperopt_args(path, 10, False))
+        hyperopt.start(hyperopt_args(path, 10, False))
+        history = TrialStore(path, 'any').session.query(StoredTrial).all()
+        # the repeats are stored as served, TPE sees each point once
+        assert len(history) == 20
+        params = [trial.params for trial in history if not trial.served]
+        assert 0 < len(params) <= 4
+        assert len(params) == len(set(params))
+
+        # the served epochs count in -e of a resumed run
+        hyperopt.start(hyperopt_args(path, 25, True))
+    assert TrialStore(path, 'any').session.query(StoredTrial).count() == 25
@@ -0,0 +1,71 @@
+# pragma pylint: disable=missing-docstring,W0212
+import logging
+from unittest.mock import MagicMock
+
+import numpy as np
+from pandas import Timestamp
+
+from freqtrade.optimize import walkforward
+
+
+def walkforward_options():
+    return {'epochs': 3,
+            'target_trades': 10,
+            'datadir': 'freqtrade/tests/testdata',
+            'candle_store': False,
+            'resample': False,
+            'engine': 'loop',
+            'strategy': None,
+            'indicator_cache_mb': 16,
+            'loglevel': logging.INFO
+           }
+
+
+def test_windows():
+    first = Timestamp('2017-01-01 00:00', tz='UTC')
+    last = Timestamp('2017-01-01 16:35', tz='UTC')  # 200 candles of 5 minutes
+    todo = walkforward.windows(first, last, 5, 100, 30, 30)
+    assert len(todo) == 3
+    assert todo[0] == (first, Timestamp('2017-01-01 08:20', tz='UTC'),
+                       Timestamp('2017-01-01 10:50', tz='UTC'))
+    # the test windows follow each other
+    assert [window[1] for window in todo[1:]] == [window[2] for window in todo[:-1]]
+    assert walkforward.windows(first, last, 5, 180, 30, 30) == []
+
+
+def test_run_window():
+    walkforward.setup(walkforward_options())
+    strategy, candles, options = walkforward._STATE
+    frame = candles['BTC_ETH']
+    todo = walkforward.windows(frame['date'].iloc[0], frame['date'].iloc[-1], 5, 1000, 300, 300)
+    assert len(todo) > 2
+
+    # the windows are views of the analyzed frames
+    full = walkforward.analyzed(strategy, candles)['BTC_ETH']
+    window = walkforward.view(full, todo[0][1], todo[0][2])
+    assert len(window) == 300
+    assert np.shares_memory(window['rsi'].values, full['rsi'].values)
+    window['buy'] = 1
+    assert 'buy' not in full
+
+    runs = [walkforward.run_window(window) for window in todo[:2]]
+    for run, (_, test_start, test_end) in zip(runs, todo):
+        results = run['results']
+        assert ((results.date_b >= test_start) & (results.date_s < test_end)).all()
+        assert set(run['params']) == set(strategy.strategy_space())
+    # the default strategy has no hyper params in its indicators
+    assert len(walkforward._FRAMES) == 1
+    table, trades = walkforward.aggregate(runs)
+    assert len(trades) == sum(len(run['results']) for run in runs)
+    assert 'train loss' in table
+
+
+def test_walkforward_start_workers():
+    args = MagicMock()
+    for key, value in walkforward_options().items():
+        setattr(args, key, value)
+    args.train = 1500
+    args.test = 500
+    args.step = None
+    args.workers = 2
+    walkforward.start(args)
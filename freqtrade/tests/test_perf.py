@@ -0,0 +1,65 @@
+# pragma pylint: disable=missing-docstring
+import logging
+import time
+
+from sqlalchemy import create_engine
+
+from freqtrade import perf, persistence
+from freqtrade.persistence import Trade
+
+
+def test_timed_context_and_decorator():
+    perf.reset()
+    with perf.timed('block'):
+        time.sleep(0.01)
+
+    @perf.timed('func')
+    def func(n):
+        return func(n - 1) if n else 0
+
+    func(3)
+    stats = perf.stats()
+    assert stats['block']['count'] == 1
+    assert stats['block']['total'] >= 0.01
+    assert stats['func']['count'] == 4
+    assert func.__name__ == 'func'
+    perf.reset()
+
+
+def test_histogram_percentiles():
+    perf.reset()
+    for _ in range(90):
+        perf.record('stage', 0.003)
+    for _ in range(10):
+        perf.record('stage', 0.4)
+    stats = perf.stats()['stage']
+    assert stats['p50'] == 0.005
+    assert stats['p95'] == 0.5
+    assert stats['max'] == 0.4
+    table = perf.format_stats()
+    assert 'stage' in table
+    perf.reset()
+
+
+def test_log_stats(caplog):
+    perf.reset()
+    perf.record('process', 0.25)
+    perf._LAST_LOG = 0
+    with caplog.at_level(logging.INFO, logger='freqtrade.perf'):
+        perf.log_stats(60)
+        perf.log_stats(60)
+        perf.log_stats(0)
+    lines = [r.message for r in caplog.records if r.name == 'freqtrade.perf']
+    assert len(lines) == 1
+    assert 'process 250ms/1' in lines[0]
+    perf.reset()
+
+
+def test_db_flush_timed(default_conf):
+    persistence.init(default_conf, create_engine('sqlite://'))
+    perf.reset()
+    Trade.session.add(Trade(pair='BTC_ETH', stake_amount=0.001, fee=0.0025,
+                            exchange='BITTREX', open_rate=0.01, amount=1.0))
+    Trade.session.flush()
+    assert perf.stats()['db.flush']['count'] == 1
+    perf.reset()
@@ -1,6 +1,8 @@
 # pragma pylint: disable=missing-docstring
 import pytest
+from sqlalchemy import create_engine
 
+from freqtrade import persistence
 from freqtrade.exchange import Exchanges
 from freqtrade.persistence import Trade
 
@@ -64,3 +66,46 @@ def test_update_invalid_order(limit_buy_order):
     limit_buy_order['type'] = 'invalid'
     with pytest.raises(ValueError, match=r'Unknown order type'):
         trade.update(limit_buy_order)
+
+
+def stored_max_rate(engine):
+    return engine.execute('SELECT stat_max_rate FROM trades').scalar()
+
+
+def test_update_stats_write_behind(default_conf, tmpdir):
+    engine = create_engine('sqlite:///{}'.format(tmpdir.join('trades.sqlite')))
+    conf = dict(default_conf, internals={'max_unflushed_cycles': 3})
+    persistence.init(conf, engine)
+    trade = Trade(pair='BTC_ETH', stake_amount=1.00, fee=0.1,
+                  exchange='BITTREX', open_rate=0.07, amount=10)
+    Trade.session.add(trade)
+    Trade.session.flush()
+
+    trade.update_stats(0.08)
+    persistence.end_cycle()
+    trade.update_stats(0.09)
+    persistence.end_cycle()
+    assert stored_max_rate(engine) is None
+    persistence.end_cycle()
+    assert stored_max_rate(engine) == 0.09
+
+    # not the queries of a cycle, but those outside of it autoflush
+    trade.update_stats(0.10)
+    with persistence.write_behind():
+        assert Trade.query.filter(Trade.is_open.is_(True)).count() == 1
+    assert stored_max_rate(engine) == 0.09
+    assert Trade.query.filter(Trade.stat_max_rate > 0.095).count() == 1
+    assert stored_max_rate(engine) == 0.10
+
+
+def test_update_stats_write_through(default_conf, tmpdir):
+    engine = create_engine('sqlite:///{}'.format(tmpdir.join('trades.sqlite')))
+    conf = dict(default_conf, internals={'max_unflushed_cycles': 0})
+    persistence.init(conf, engine)
+    trade = Trade(pair='BTC_ETH', stake_amount=1.00, fee=0.1,
+                  exchange='BITTREX', open_rate=0.07, amount=10)
+    Trade.session.add(trade)
+    Trade.session.flush()
+    trade.update_stats(0.08)
+    assert stored_max_rate(engine) == 0.08
+    persistence.init(default_conf, create_engine('sqlite://'))
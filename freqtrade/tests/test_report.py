@@ -0,0 +1,49 @@
+# pragma pylint: disable=missing-docstring
+import io
+
+from pandas import DataFrame, date_range
+
+from freqtrade.report import write_report
+
+
+def _prepdata():
+    df = DataFrame({'date': date_range('2017-11-14', periods=20, freq='5min'),
+                    'close': [float(i) for i in range(20)]})
+    df.loc[0, 'close'] = float('nan')
+    return {'BTC_ETH': df, 'BTC_LTC': df.head(3)}
+
+
+def test_report_summary():
+    out = io.StringIO()
+    write_report(_prepdata(), 'summary', out=out)
+    text = out.getvalue()
+    assert 'BTC_ETH' in text and 'BTC_LTC' in text
+    assert '2017-11-14 01:35:00' in text
+    assert '19.0' not in text
+
+
+def test_report_head():
+    out = io.StringIO()
+    write_report(_prepdata(), 'head', rows=2, out=out)
+    text = out.getvalue()
+    assert '=== BTC_ETH (20 rows)' in text
+    assert '...' in text
+    assert '19.0' in text and '10.0' not in text
+
+
+def test_report_full(tmpdir):
+    out = io.StringIO()
+    filename = str(tmpdir.join('data.csv'))
+    write_report(_prepdata(), 'full', filename=filename, out=out)
+    assert out.getvalue() == ''
+    with open(filename) as h:
+        lines = h.read().splitlines()
+    assert lines[0] == '# BTC_ETH'
+    assert lines[1] == 'date,close'
+    assert len(lines) == 2 * 2 + 20 + 3
+
+
+def test_report_none():
+    out = io.StringIO()
+    write_report(_prepdata(), 'none', out=out)
+    assert out.getvalue() == ''
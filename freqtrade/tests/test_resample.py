@@ -0,0 +1,51 @@
+# pragma pylint: disable=missing-docstring,W0621
+import json
+import os
+import shutil
+
+import pytest
+
+from freqtrade import candlestore, optimize
+from freqtrade.analyze import parse_ticker_dataframe
+from freqtrade.resample import resample
+
+
+def _candles(pair, interval):
+    with open('freqtrade/tests/testdata/{}-{}.json'.format(pair, interval)) as data_file:
+        return parse_ticker_dataframe(json.load(data_file))
+
+
+def test_resample_matches_exchange():
+    derived = resample(_candles('BTC_ETH', 1), 5)
+    native = _candles('BTC_ETH', 5)
+    merged = derived.merge(native, on='date', suffixes=('', '_native'))
+    # the first bucket only has some of its minutes in the 1 minute data
+    merged = merged.iloc[1:]
+    assert len(merged) == len(derived) - 1
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        assert merged[col].values == pytest.approx(merged[col + '_native'].values, rel=1e-9)
+
+
+def test_resample_twice():
+    one = _candles('BTC_UNITEST', 1)
+    direct = resample(one, 15)
+    twice = resample(resample(one, 5), 15)
+    assert direct['date'].equals(twice['date'])
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        # the volume is summed in another order
+        assert direct[col].values == pytest.approx(twice[col].values, rel=1e-12)
+    assert (direct['date'].dt.minute % 15 == 0).all()
+    assert resample(one.head(0), 15).empty
+
+
+def test_load_data_resampled(tmpdir, mocker):
+    datadir = str(tmpdir)
+    shutil.copy('freqtrade/tests/testdata/BTC_UNITEST-1.json', datadir)
+    spy = mocker.spy(candlestore, 'resample')
+    data = optimize.load_data(datadir, 60, ['BTC_UNITEST'], resample=True)
+    assert os.path.isdir(candlestore.resampled_path(datadir, 'BTC_UNITEST', 60))
+    assert spy.call_count == 1
+    again = optimize.load_data(datadir, 60, ['BTC_UNITEST'], True, True)
+    assert spy.call_count == 1  # cached
+    assert again['BTC_UNITEST'].equals(data['BTC_UNITEST'])
+    assert len(data['BTC_UNITEST']) < len(optimize.load_data(datadir, 1, ['BTC_UNITEST'])['BTC_UNITEST'])
@@ -8,14 +8,15 @@ from sqlalchemy import create_engine
 from telegram import Update, Message, Chat
 from telegram.error import NetworkError
 
-from freqtrade import __version__
+from freqtrade import __version__, perf
 from freqtrade.main import init, create_trade
 from freqtrade.misc import update_state, State, get_state
 from freqtrade.strategy import Strategy
 from freqtrade.persistence import Trade
 from freqtrade.rpc import telegram
 from freqtrade.rpc.telegram import authorized_only, is_enabled, send_msg, _status, _status_table, \
-    _profit, _forcesell, _performance, _daily, _count, _start, _stop, _balance, _version, _help
+    _profit, _forcesell, _performance, _daily, _count, _start, _stop, _balance, _version, _help, \
+    _perf
 
 def setup_strategy(config):
     return Strategy(config)
@@ -167,7 +168,8 @@ def test_profit_handle(default_conf, update, ticker, limit_buy_order, limit_sell
                           send_msg=msg_mock)
     mocker.patch.multiple('freqtrade.main.exchange',
                           validate_pairs=MagicMock(),
-                          get_ticker=ticker)
+                          get_ticker=ticker,
+                          get_tickers=lambda pairs: {pair: ticker() for pair in pairs})
     init(default_conf, create_engine('sqlite://'))
 
 
@@ -556,6 +558,32 @@ def test_version_handle(default_conf, update, mocker):
     assert '*Version:* `{}`'.format(__version__) in msg_mock.call_args_list[0][0][0]
 
 
+def test_perf_handle(default_conf, mocker):
+    update = MagicMock()
+    update.message.chat_id = 0
+    update.message.text = '/perf'
+    mocker.patch.dict('freqtrade.main._CONF', default_conf)
+    msg_mock = MagicMock()
+    mocker.patch.multiple('freqtrade.rpc.telegram',
+                          _CONF=default_conf,
+                          init=MagicMock(),
+                          send_msg=msg_mock)
+    perf.reset()
+    perf.record('exchange.get_ticker', 0.2)
+    perf.record('process', 1.5)
+
+    _perf(bot=MagicMock(), update=update)
+    assert msg_mock.call_count == 1
+    assert 'exchange.get_ticker' in msg_mock.call_args_list[0][0][0]
+    assert 'process' in msg_mock.call_args_list[0][0][0]
+
+    update.message.text = '/perf exchange'
+    _perf(bot=MagicMock(), update=update)
+    assert 'exchange.get_ticker' in msg_mock.call_args_list[1][0][0]
+    assert 'process' not in msg_mock.call_args_list[1][0][0]
+    perf.reset()
+
+
 def test_send_msg(default_conf, mocker):
     mocker.patch.dict('freqtrade.main._CONF', default_conf)
     mocker.patch.multiple('freqtrade.rpc.telegram',
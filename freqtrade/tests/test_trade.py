@@ -1,11 +1,13 @@
 from unittest.mock import MagicMock
+import numpy as np
 import pytest
 
 from sqlalchemy import create_engine
 
 from freqtrade.strategy import Strategy
 from freqtrade.tests.strattest import XStrategy
-from freqtrade.trade import handle_trade
+from freqtrade.trade import handle_trade, calc_profit, calc_profit_exact, profit_ratio, \
+    PROFIT_TOLERANCE
 from freqtrade.main import create_trade, init, execute_sell
 from freqtrade.persistence import Trade
 from freqtrade import exchange
@@ -133,3 +135,38 @@ def test_trade_buy_gone_sell(trade_conf, mocker):
         with pytest.raises(OperationalException, matches=r'No such pair to sell'):
           msg = execute_sell(trade, 0.01)
 
+
+
+def test_profit_ratio_tolerance():
+    rng = np.random.RandomState(1)
+    open_rates = rng.uniform(1e-8, 10, 1000)
+    rates = open_rates * rng.uniform(0.1, 3, 1000)
+    fees = rng.choice([0.0, 0.005, 0.0025], 1000)
+    profits = profit_ratio(open_rates, rates, fees)
+    assert profits.dtype == np.float64
+    for open_rate, rate, fee, profit in zip(open_rates, rates, fees, profits):
+        trade = Trade(open_rate=float(open_rate), fee=float(fee))
+        assert abs(profit - calc_profit_exact(trade, float(rate))) <= \
+            PROFIT_TOLERANCE * max(1.0, abs(profit))
+        assert calc_profit(trade, float(rate)) == profit
+
+
+def test_simtrade_matches_trade():
+    from freqtrade.simtrade import SimTrade
+    strategy = Strategy()
+    rates = [1.0, 1.02, 0.99, 1.05, 1.01, 0.97, 1.03]
+    orm = Trade(pair='BTC_ETH', fee=0.005, amount=0.01, open_rate=rates[0])
+    orm.stat_min_rate = orm.stat_max_rate = orm.stat_stoploss_glide_rate = rates[0]
+    sim = SimTrade(pair='BTC_ETH')
+    sim.open(rates[0], None, 0.005, 0.01)
+    for rate in rates:
+        for trade in (orm, sim):
+            strategy.step_frame(trade, rate, None)
+            trade.update_stats(rate)
+        assert sim.stat_stoploss_glide_rate == orm.stat_stoploss_glide_rate
+        assert sim.stat_min_rate == orm.stat_min_rate
+        assert sim.stat_max_rate == orm.stat_max_rate
+        assert calc_profit(sim, rate) == calc_profit(orm, rate)
+    # slots, no accidental fields
+    with pytest.raises(AttributeError):
+        sim.open_order_id = '123'
@@ -5,18 +5,48 @@ from datetime import datetime
 from decimal import Decimal, getcontext
 
 from freqtrade.strategy import Strategy
-from freqtrade import exchange
+from freqtrade.simtrade import TradeProtocol
+from freqtrade import exchange, perf
 from freqtrade.analyze import get_signal, SignalType
 
 logger = logging.getLogger('freqtrade')
 
-def calc_profit(trade, rate: Optional[float] = None) -> float:
+# Max difference of profit_ratio() to calc_profit_exact(), absolute
+# for profits within +-100%, relative above. The Decimal version
+# rounds each step to 8 significant digits, float64 keeps about 16.
+PROFIT_TOLERANCE = 1e-7
+
+
+def profit_ratio(open_rate, current_rate, fee):
+    """
+    Profit ratio including fee, the float64 kernel of calc_profit().
+    Takes scalars or numpy arrays, arrays are computed element-wise.
+    Within PROFIT_TOLERANCE of calc_profit_exact().
+    :param open_rate: buy rate(s)
+    :param current_rate: rate(s) to compare with
+    :param fee: fee ratio(s), for both buy and sell
+    :return: profit ratio(s), float or numpy array
+    """
+    return (current_rate - open_rate) / open_rate - fee
+
+
+def calc_profit(trade: TradeProtocol, rate: Optional[float] = None) -> float:
     """
     Calculates the profit in percentage (including fee).
     :param rate: rate to compare with (optional).
     If rate is not set trade.close_rate will be used
     :return: profit in percentage as float
     """
+    # KLUDGE/WARNING: a zero rate falls back to trade.close_rate,
+    #      see calc_profit_exact()
+    return float(profit_ratio(trade.open_rate, rate or trade.close_rate, trade.fee))
+
+
+def calc_profit_exact(trade, rate: Optional[float] = None) -> float:
+    """
+    calc_profit() in Decimal, rounded to 8 digits.
+    Used for the close_profit that is persisted with the trade.
+    """
     getcontext().prec = 8
     # KLUDGE/WARNING: Python is trying to accomodate everyone
     #      by treaing number zero (integer or float)
@@ -25,7 +55,7 @@ def calc_profit(trade, rate: Optional[float] = None) -> float:
     return float((Decimal(rate or trade.close_rate) - Decimal(trade.open_rate))
                  / Decimal(trade.open_rate) - Decimal(trade.fee))
 
-def min_roi_reached(strategy: Strategy, trade,
+def min_roi_reached(strategy: Strategy, trade: TradeProtocol,
                     current_rate: float,
                     current_time: datetime) -> bool:
     """
@@ -53,22 +83,24 @@ def min_roi_reached(strategy: Strategy, trade,
 # Make this a pure function, that only returns True/False,
 # Depending on wheter to exit this trade
 # Returns True if we should exit this trade
-def handle_trade(strategy: Strategy, trade) -> bool:
+@perf.timed('process.handle_trade')
+def handle_trade(strategy: Strategy, trade, current_rate: Optional[float] = None) -> bool:
     """
     Sells the current pair if the threshold is reached and updates the trade record.
+    :param current_rate: bid rate of the pair, fetched if not given
     :return: True if trade has been sold, False otherwise
     """
     if not trade.is_open:
         raise ValueError('attempt to handle closed trade: {}'.format(trade))
 
     logger.info('Handling %s ...', trade)
-    current_rate = exchange.get_ticker(trade.pair)['bid']
+    if current_rate is None:
+        current_rate = exchange.get_ticker(trade.pair)['bid']
 
     # Update statistic values for stoplosses, etc
     trade.update_stats(current_rate)
     strategy.step_frame(trade, current_rate, '')
-    # FIX: above, we arent persistence with the update of trade.stat_stoploss_glide_rate
-    # we need to call trade session flush here
+    # the stats (trade.stat_stoploss_glide_rate) are flushed by persistence.end_cycle()
 
     # Check if minimal roi has been reached
     if min_roi_reached(strategy, trade, current_rate, datetime.utcnow()):
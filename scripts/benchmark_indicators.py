@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import logging
+
+import talib.abstract as ta
+from tabulate import tabulate
+
+import freqtrade.optimize as optimize
+import freqtrade.misc as misc
+from freqtrade.analyze import parse_ticker_dataframe
+from freqtrade.indicator_plan import compile_plan, parse, CLASSES
+from freqtrade.strategy import Strategy
+
+# example:
+# python scripts/benchmark_indicators.py -dd freqtrade/tests/testdata -i 1 -x macd,bbands,stochf
+
+
+def benchmark_parse_args(args):
+    parser = misc.parse_args_common(args, 'Benchmark the indicators of a strategy')
+    parser.add_argument(
+        '-i', '--ticker-interval',
+        help='specify ticker interval in minutes (default: 5)',
+        dest='ticker_interval',
+        default=5,
+        type=int,
+    )
+    parser.add_argument(
+        '-x', '--extra',
+        help='comma-separated TA-Lib functions to add to the strategy indicators',
+        dest='extra',
+        default='',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        help='runs per measurement, the fastest is used (default: 5)',
+        dest='repeat',
+        default=5,
+        type=int,
+    )
+    return parser.parse_args(args)
+
+
+def abstract_indicators(strategy, inds, dataframe):
+    """
+    The indicators as computed before the compiled plans: a new
+    abstract Function per call, on the whole DataFrame
+    """
+    for ind in inds:
+        column, name, args = parse(ind)
+        if name in CLASSES:
+            dataframe[column] = CLASSES[name](strategy, args).run(dataframe)
+            continue
+        f = ta.Function(name)
+        if isinstance(args, dict):
+            result = f(dataframe, **args)
+        else:
+            result = f(dataframe, *(args or []))
+        if len(f.output_names) > 1:
+            for out in f.output_names:
+                dataframe[column + '_' + out] = result[out]
+        else:
+            dataframe[column] = result
+
+
+def compiled_indicators(strategy, inds, dataframe):
+    # compiled on each call, like plan_for() on a cache miss
+    compile_plan(inds).run(strategy, dataframe)
+
+
+def measure(func, strategy, inds, frame, repeat):
+    best = None
+    for _ in range(repeat):
+        dataframe = frame.copy()
+        start = time.perf_counter()
+        func(strategy, inds, dataframe)
+        spent = time.perf_counter() - start
+        best = spent if best is None else min(best, spent)
+    return best
+
+
+def benchmark(strategy, args) -> None:
+    """
+    Measures the per pair latency of the strategy indicators,
+    abstract API against the compiled plan
+    """
+    inds = strategy.select_indicators(None)
+    inds.extend([[name] for name in args.extra.split(',') if name])
+    pairs = strategy.backtest_pairs()
+    data = optimize.load_data(args.datadir, args.ticker_interval, pairs)
+
+    table = []
+    for pair in pairs:
+        frame = parse_ticker_dataframe(data[pair])
+        before = measure(abstract_indicators, strategy, inds, frame, args.repeat)
+        after = measure(compiled_indicators, strategy, inds, frame, args.repeat)
+        table.append([pair, len(frame), '{:.2f}'.format(before * 1000),
+                      '{:.2f}'.format(after * 1000), '{:.1f}x'.format(before / after)])
+    print('indicators: {}'.format([parse(ind)[0] for ind in inds]))
+    print(tabulate(table, headers=['pair', 'candles', 'abstract ms', 'compiled ms', 'speedup']))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    args = benchmark_parse_args(sys.argv[1:])
+    strategy = Strategy().load(args.strategy)
+    benchmark(strategy, args)
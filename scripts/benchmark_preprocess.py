@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import logging
+
+from tabulate import tabulate
+
+import freqtrade.optimize as optimize
+import freqtrade.misc as misc
+from freqtrade.strategy import Strategy
+
+# example:
+# python scripts/benchmark_preprocess.py -s strat-heikinashi -i 1 -w 1,2,4,8
+
+
+def benchmark_parse_args(args):
+    parser = misc.parse_args_common(args, 'Benchmark parallel preprocessing')
+    parser.add_argument(
+        '-i', '--ticker-interval',
+        help='specify ticker interval in minutes (default: 5)',
+        dest='ticker_interval',
+        default=5,
+        type=int,
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        help='comma-separated number of workers to measure (default: 1,2,4)',
+        dest='workers',
+        default='1,2,4',
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        help='runs per measurement, the fastest is used (default: 3)',
+        dest='repeat',
+        default=3,
+        type=int,
+    )
+    return parser.parse_args(args)
+
+
+def measure(strategy, data, workers, backend, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        optimize.preprocess(strategy, data, workers, backend)
+        spent = time.time() - start
+        best = spent if best is None else min(best, spent)
+    return best
+
+
+def benchmark(strategy, args) -> None:
+    """
+    Measures optimize.preprocess() for a growing number of the
+    strategy backtest pairs, serial and with each backend/workers
+    """
+    workers = [int(w) for w in args.workers.split(',')]
+    pairs = strategy.backtest_pairs()
+    alldata = optimize.load_data(args.datadir, args.ticker_interval, pairs)
+
+    headers = ['pairs', 'serial']
+    for backend in ['thread', 'process']:
+        headers.extend(['{}x{}'.format(backend, w) for w in workers])
+
+    table = []
+    npairs = 1
+    while True:
+        data = {pair: alldata[pair] for pair in pairs[:npairs]}
+        serial = measure(strategy, data, 0, 'thread', args.repeat)
+        row = [npairs, '{:.2f}s'.format(serial)]
+        for backend in ['thread', 'process']:
+            for w in workers:
+                spent = measure(strategy, data, w, backend, args.repeat)
+                row.append('{:.2f}s ({:.1f}x)'.format(spent, serial / spent))
+        table.append(row)
+        if npairs == len(pairs):
+            break
+        npairs = min(npairs * 2, len(pairs))
+
+    print(tabulate(table, headers=headers))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    args = benchmark_parse_args(sys.argv[1:])
+    strategy = Strategy().load(args.strategy)
+    benchmark(strategy, args)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import io
+import sys
+import time
+import logging
+from contextlib import redirect_stdout
+
+import hyperopt.pyll.stochastic
+import numpy as np
+from tabulate import tabulate
+
+import freqtrade.optimize as optimize
+import freqtrade.misc as misc
+from freqtrade.optimize.hyperopt import optimizer, Pruner
+from freqtrade.strategy import Strategy
+
+# example:
+# python scripts/benchmark_pruning.py -s strat-heikinashi -e 200 \
+#     -p BTC_ETH,BTC_LTC,BTC_DASH,BTC_ETC,BTC_ZEC,BTC_XMR,BTC_NXT,BTC_XLM,BTC_ADA,BTC_POWR
+
+
+def benchmark_parse_args(args):
+    parser = misc.parse_args_common(args, 'Benchmark hyperopt --prune')
+    parser.add_argument(
+        '-i', '--ticker-interval',
+        help='specify ticker interval in minutes (default: 5)',
+        dest='ticker_interval',
+        default=5,
+        type=int,
+    )
+    parser.add_argument(
+        '-e', '--epochs',
+        help='number of sampled params to evaluate (default: 100)',
+        dest='epochs',
+        default=100,
+        type=int,
+    )
+    parser.add_argument(
+        '-tt', '--target-trades',
+        help='target_trades of the loss (default: 100)',
+        dest='target_trades',
+        default=100,
+        type=int,
+    )
+    parser.add_argument(
+        '-p', '--pairs',
+        help='comma-separated pairs, instead of the backtest pairs of the strategy',
+        dest='pairs',
+        default=None,
+    )
+    parser.add_argument(
+        '--seed',
+        help='seed of the sampled params (default: 1)',
+        dest='seed',
+        default=1,
+        type=int,
+    )
+    return parser.parse_args(args)
+
+
+def run(strategy, dfs, samples, target_trades, pruner):
+    optargs = {'epochs': len(samples),
+               'target_trades': target_trades,
+               'current_tries': 0,
+               'strategy': strategy,
+               'dfs': dfs,
+               'timeperiod': None,
+               'pruner': pruner,
+              }
+    start = time.time()
+    with redirect_stdout(io.StringIO()):  # optimizer() prints every epoch
+        results = [optimizer(params, optargs) for params in samples]
+    return results, time.time() - start
+
+
+def best(results):
+    return min(((r['loss'], i) for i, r in enumerate(results) if r['status'] == 'ok'),
+               default=(None, None))
+
+
+def benchmark(strategy, args) -> None:
+    """
+    Evaluates the same sampled params with and without pruning,
+    and checks that the winner is the same
+    """
+    dfs = optimize.load_data(args.datadir, args.ticker_interval, strategy.backtest_pairs())
+    space = strategy.strategy_space()
+    rng = np.random.RandomState(args.seed)
+    samples = [hyperopt.pyll.stochastic.sample(space, rng=rng) for _ in range(args.epochs)]
+
+    # warm the indicator cache, so that both runs find the same in it
+    run(strategy, dfs, samples, args.target_trades, None)
+    plain, plain_time = run(strategy, dfs, samples, args.target_trades, None)
+    pruner = Pruner(args.target_trades)
+    pruned, pruned_time = run(strategy, dfs, samples, args.target_trades, pruner)
+
+    total = len(samples) * max(r['candles'] for r in plain)
+    table = [['plain', len(samples), 0, '{:.2f}s'.format(plain_time), '100%',
+              '{:.4f} (#{})'.format(*best(plain))],
+             ['--prune', len(samples), pruner.pruned_epochs, '{:.2f}s'.format(pruned_time),
+              '{:.0f}%'.format(100.0 * sum(r['candles'] for r in pruned) / total),
+              '{:.4f} (#{})'.format(*best(pruned))]]
+    print(tabulate(table, headers=['', 'epochs', 'pruned', 'time', 'candles', 'best loss']))
+    if best(pruned) != best(plain):
+        print('the winner changed')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    args = benchmark_parse_args(sys.argv[1:])
+    strategy = Strategy().load(args.strategy)
+    if args.pairs:
+        strategy.set_backtest_pairs(args.pairs.split(','))
+    benchmark(strategy, args)
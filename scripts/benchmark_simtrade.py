@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import logging
+
+from tabulate import tabulate
+
+import freqtrade.optimize as optimize
+import freqtrade.misc as misc
+from freqtrade.analyze import parse_ticker_dataframe
+from freqtrade.persistence import Trade
+from freqtrade.simtrade import SimTrade
+from freqtrade.strategy import Strategy
+from freqtrade.trade import min_roi_reached
+
+# example:
+# python scripts/benchmark_simtrade.py -p BTC_ETH,BTC_UNITEST
+
+
+def benchmark_parse_args(args):
+    parser = misc.parse_args_common(args, 'Benchmark the backtest trade record')
+    parser.add_argument(
+        '-p', '--pairs',
+        help='comma-separated pairs of the 1 minute testdata (default: BTC_ETH,BTC_UNITEST)',
+        dest='pairs',
+        default='BTC_ETH,BTC_UNITEST',
+    )
+    return parser.parse_args(args)
+
+
+def replay(strategy, trade, candles) -> float:
+    """
+    Holds one trade over all candles, doing the per-candle work of
+    backtesting.backtest(): step_frame, update_stats and min_roi_reached
+    :return: seconds spent
+    """
+    date, close = candles[0]
+    trade.open_rate = close
+    trade.open_date = date
+    trade.stat_min_rate = trade.stat_max_rate = trade.stat_stoploss_glide_rate = close
+    start = time.time()
+    for date, close in candles:
+        strategy.step_frame(trade, close, date)
+        trade.update_stats(close)
+        min_roi_reached(strategy, trade, close, date)
+    return time.time() - start
+
+
+def benchmark(strategy, args) -> None:
+    """
+    Measures the per-candle overhead of the ORM Trade and SimTrade
+    """
+    pairs = args.pairs.split(',')
+    data = optimize.load_data(args.datadir, 1, pairs)
+    # the backtest does not return before the stoploss hits,
+    # this keeps the trade open over all candles
+    strategy.stoploss = lambda *args: False
+
+    table = []
+    for pair in pairs:
+        frame = parse_ticker_dataframe(data[pair])
+        candles = list(zip(frame['date'], frame['close']))
+        orm = replay(strategy, Trade(pair=pair, fee=strategy.fee() * 2), candles)
+        sim = replay(strategy, SimTrade(pair=pair, fee=strategy.fee() * 2), candles)
+        table.append([pair, len(candles),
+                      '{:.2f}'.format(orm / len(candles) * 1e6),
+                      '{:.2f}'.format(sim / len(candles) * 1e6),
+                      '{:.1f}x'.format(orm / sim)])
+    print(tabulate(table, headers=['pair', 'candles', 'Trade us/candle',
+                                   'SimTrade us/candle', 'speedup']))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    args = benchmark_parse_args(sys.argv[1:])
+    strategy = Strategy().load(args.strategy)
+    benchmark(strategy, args)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+"""Converts json ticker data into the binary candle store"""
+import sys
+import glob
+import os
+import re
+
+from freqtrade import misc
+from freqtrade import candlestore
+
+# example:
+# python scripts/convert_candles.py -dd freqtrade/tests/testdata
+# python scripts/convert_candles.py -p BTC_ETH,BTC_LTC -i 1
+
+parser = misc.parse_args_common(sys.argv[1:], 'candle store conversion utility')
+parser.add_argument(
+        '-p', '--pair',
+        help='comma-separated pairs to convert (default: all json files in datadir)',
+        dest='pair',
+        default=None
+)
+parser.add_argument(
+        '-i', '--ticker-interval',
+        help='ticker interval to convert (default: all)',
+        dest='ticker_interval',
+        default=None,
+        type=int,
+)
+args = parser.parse_args(sys.argv[1:])
+
+for path in sorted(glob.glob(os.path.join(args.datadir, '*-*.json'))):
+    match = re.match(r'^(.+)-(\d+)\.json$', os.path.basename(path))
+    if not match:
+        continue
+    pair, tick_interval = match.group(1), int(match.group(2))
+    if args.pair and pair not in args.pair.split(','):
+        continue
+    if args.ticker_interval and tick_interval != args.ticker_interval:
+        continue
+    print('converting pair %s, interval %s' % (pair, tick_interval))
+    candlestore.convert(args.datadir, tick_interval, pair)
@@ -11,6 +11,7 @@ import freqtrade.misc as misc
 from freqtrade.strategy import Strategy
 import freqtrade.exchange as exchange
 import freqtrade.analyze  as analyze
+from freqtrade.dataframe import load_backtest_export
 
 
 def plot_parse_args(args):
@@ -23,6 +24,13 @@ def plot_parse_args(args):
         dest = 'pair',
         default = None
     )
+    parser.add_argument(
+        '--from-export',
+        help = 'read the analyzed pairs from a backtest-result.json/.ndjson '
+               'export (see --export=result) instead of analyzing the data again',
+        dest = 'from_export',
+        default = None
+    )
     parser.add_argument(
         '-i1', '--ind1',
         help = 'indicator 1 to plot.',
@@ -55,10 +63,16 @@ def plot_indicator(strategy, args) -> None:
         pairs = list(set(pairs) & set(filter_pairs))
         print('Filter, keep pairs %s' % pairs)
 
-    tickers = optimize.load_data(args.datadir, pairs=pairs,
-                                 ticker_interval=args.ticker_interval,
-                                 )
-    dataframes = optimize.preprocess(strategy, tickers)
+    if args.from_export:
+        _, dataframes, _ = load_backtest_export(args.from_export)
+        if filter_pairs:
+            dataframes = {pair: df for pair, df in dataframes.items() if pair in filter_pairs}
+        pairs = list(dataframes.keys())
+    else:
+        tickers = optimize.load_data(args.datadir, pairs=pairs,
+                                     ticker_interval=args.ticker_interval,
+                                     )
+        dataframes = optimize.preprocess(strategy, tickers)
 
     if not ind1 or not ind2:
         print('ERROR: Must supply indicators to plot')
@@ -9,21 +9,22 @@ classname = 'LinCombStrategy'
 
 class LinCombStrategy(Strategy):
 
-    def __init__(self):
+    def __init__(self, config=None):
         self.log = logging.getLogger(__name__)
         self.log.info('This is strategy: linear-combination:')
-        self.default_config()
+        self.default_config(config)
         
     def name(self):
         return 'linear-combination'
     
     # what indicators do we use
     def select_indicators(self, some_filter):
-      return [['rsi',   None], # A list of indicators used by
-              ['ema5',  None], # the linear-combination
-              ['fastk', None], # the linear-combination
+      return [['rsi',    'rsi',    {'price':'close', 'timeperiod':14}], # A list of indicators used by
+              ['ema5',   'ema',    [5]],  # the linear-combination
+              ['stochf', 'stochf', None], # the linear-combination (stochf_fastk)
               # finally a the linear-combination indicator itself,
-              ['lin',   {'input':['high','low','rsi','ema5','fastk'], # what signals to use
+              # train its weights with: freqtrade -s strat-lincomb train-lincomb
+              ['lin',    'lin',    {'input':['high','low','rsi','ema5','stochf_fastk'], # what signals to use
                          'scale':[10,10,0.01,10,0.01] # scale each signal by this amount
                         }]] # lin, it is here the result of linear-comb is stored
 